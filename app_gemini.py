@@ -9,6 +9,8 @@ import xmltodict
 from typing import Dict, List, Optional
 import os
 
+from patent_engine import FrozenFrame, fingerprint_cache
+
 # Streamlit 페이지 설정
 st.set_page_config(page_title="KIPRIS 특허 분석 시스템", layout="wide")
 
@@ -143,12 +145,12 @@ def analyze_patents_with_gemini(patents: List[Dict], api_key: str) -> str:
         st.error(f"Gemini API 분석 중 오류 발생: {str(e)}")
         return "분석 실패"
 
-@st.cache_data
+@fingerprint_cache()
 def create_trend_visualizations(df: pd.DataFrame) -> Dict:
-    """특허 데이터 시각화를 생성합니다."""
+    """특허 데이터 시각화를 생성합니다. (입력 프레임은 수정하지 않음)"""
     # 연도별 출원 동향
-    df['year'] = pd.to_datetime(df['applicationDate']).dt.year
-    yearly_patents = df.groupby('year').size().reset_index(name='count')
+    year = pd.to_datetime(df['applicationDate']).dt.year.rename('year')
+    yearly_patents = df.groupby(year).size().reset_index(name='count')
     
     fig_yearly = px.line(yearly_patents, x='year', y='count',
                         title='연도별 특허 출원 동향',
@@ -233,7 +235,7 @@ def main():
             analysis_result = analyze_patents_with_gemini(patents, GEMINI_API_KEY)
             
             # 시각화 생성
-            visualizations = create_trend_visualizations(df)
+            visualizations = create_trend_visualizations(FrozenFrame(df))
             
             # 분석 보고서 표시
             display_analysis_report(analysis_result, visualizations)
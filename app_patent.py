@@ -7,6 +7,8 @@ import xmltodict
 import google.generativeai as genai
 from typing import Dict, List
 
+from patent_engine import FrozenFrame, fingerprint_cache
+
 # 스타일 설정
 COLORS = {
     "primary": "#1E88E5",
@@ -133,12 +135,12 @@ def analyze_patents_with_gemini(patents: List[Dict], api_key: str) -> str:
         return "분석 실패"
 
 
-@st.cache_data
+@fingerprint_cache()
 def analyze_patent_trends(df: pd.DataFrame) -> dict:
-    """특허 데이터의 트렌드를 분석합니다."""
+    """특허 데이터의 트렌드를 분석합니다. (입력 프레임은 수정하지 않음)"""
     # 연도별 출원 동향
-    df["year"] = pd.to_datetime(df["applicationDate"]).dt.year
-    yearly_patents = df.groupby("year").size().reset_index(name="count")
+    year = pd.to_datetime(df["applicationDate"]).dt.year.rename("year")
+    yearly_patents = df.groupby(year).size().reset_index(name="count")
 
     # 출원인별 특허 수
     applicant_patents = df["applicantName"].value_counts().reset_index()
@@ -247,8 +249,8 @@ def main():
 
             df = pd.DataFrame(patents)
 
-            # 특허 분석 수행
-            analysis_data = analyze_patent_trends(df)
+            # 특허 분석 수행 (지문은 로드 시 한 번만 계산)
+            analysis_data = analyze_patent_trends(FrozenFrame(df))
             visuals = create_visualizations(analysis_data)
 
             # Gemini 분석 수행
@@ -0,0 +1,154 @@
+"""
+대시보드 다중 워커 실행기
+- patent_intelligence_dashboard.py 를 포트만 달리해 N개 프로세스로 띄우고, 죽은 워커는 재시작
+- 워커들은 같은 PATENT_CACHE_DIR(특허 원본) · PATENT_SHARED_DB(분류 결과)를 공유
+  → 수집 · 분류는 워커 전체에서 한 번, 백그라운드 워머도 잠금을 잡은 한 워커만 동작
+- 앞단 nginx 설정 생성 (세션 고정 ip_hash + Streamlit 웹소켓 업그레이드)
+
+사용 예:
+  python dashboard_cluster.py --workers 4 --base-port 8601 --nginx-conf nginx_patent.conf
+"""
+
+import argparse
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from patent_store import DEFAULT_CACHE_DIR, SHARED_DB_PATH
+
+APP_PATH       = os.path.join(os.path.dirname(os.path.abspath(__file__)), "patent_intelligence_dashboard.py")
+RESTART_DELAY  = 3.0        # 초 — 시작 직후 계속 죽는 워커가 CPU 를 태우지 않도록
+
+logger = logging.getLogger("dashboard_cluster")
+
+NGINX_TEMPLATE = """\
+# dashboard_cluster.py 가 생성 — Streamlit 워커 {n}개 앞단 프록시
+upstream patent_dashboard {{
+    ip_hash;                # Streamlit 세션 상태는 워커 메모리에 있으므로 클라이언트를 한 워커에 고정
+{servers}
+}}
+
+map $http_upgrade $connection_upgrade {{
+    default upgrade;
+    ''      close;
+}}
+
+server {{
+    listen {listen};
+
+    location / {{
+        proxy_pass http://patent_dashboard;
+        proxy_http_version 1.1;
+        proxy_set_header Host $host;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+    }}
+
+    location /_stcore/stream {{
+        proxy_pass http://patent_dashboard;
+        proxy_http_version 1.1;
+        proxy_set_header Upgrade $http_upgrade;
+        proxy_set_header Connection $connection_upgrade;
+        proxy_set_header Host $host;
+        proxy_read_timeout 86400;
+    }}
+}}
+"""
+
+
+def nginx_config(ports: List[int], listen: int = 80, host: str = "127.0.0.1") -> str:
+    servers = "\n".join(f"    server {host}:{p};" for p in ports)
+    return NGINX_TEMPLATE.format(n=len(ports), servers=servers, listen=listen)
+
+
+def worker_command(port: int, extra: Optional[List[str]] = None) -> List[str]:
+    return [
+        sys.executable, "-m", "streamlit", "run", APP_PATH,
+        "--server.port", str(port),
+        "--server.headless", "true",
+        *(extra or []),
+    ]
+
+
+def worker_env(prefetch: bool) -> Dict[str, str]:
+    """모든 워커가 같은 캐시 디렉터리 · 공유 DB 를 보도록 경로를 명시적으로 고정"""
+    env = dict(os.environ)
+    env["PATENT_CACHE_DIR"] = DEFAULT_CACHE_DIR
+    env["PATENT_SHARED_DB"] = SHARED_DB_PATH
+    if not prefetch:
+        env["PATENT_PREFETCH"] = "0"
+    return env
+
+
+def run_cluster(ports: List[int], prefetch: bool = True, extra: Optional[List[str]] = None) -> int:
+    """워커를 띄우고 감시 — 종료 코드와 무관하게 죽은 워커는 RESTART_DELAY 후 재시작"""
+    env      = worker_env(prefetch)
+    procs: Dict[int, subprocess.Popen] = {}
+    started: Dict[int, float] = {}
+    stopping = False
+
+    def _stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT,  _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    try:
+        while not stopping:
+            for port in ports:
+                proc = procs.get(port)
+                if proc is not None and proc.poll() is None:
+                    continue
+                if proc is not None:
+                    if time.time() - started[port] < RESTART_DELAY:
+                        continue
+                    logger.warning("워커 :%d 종료 (코드 %s) — 재시작", port, proc.returncode)
+                procs[port]   = subprocess.Popen(worker_command(port, extra), env=env)
+                started[port] = time.time()
+                logger.info("워커 :%d 시작 (pid %d)", port, procs[port].pid)
+            time.sleep(1.0)
+    finally:
+        for proc in procs.values():
+            if proc.poll() is None:
+                proc.terminate()
+        for proc in procs.values():
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="특허 대시보드 다중 워커 실행기")
+    parser.add_argument("--workers",     type=int, default=os.cpu_count() or 2, help="워커 프로세스 수")
+    parser.add_argument("--base-port",   type=int, default=8601, help="첫 워커 포트 (이후 +1씩)")
+    parser.add_argument("--listen",      type=int, default=80,   help="nginx 수신 포트")
+    parser.add_argument("--nginx-conf",  type=str, default=None, help="nginx 설정 파일 저장 경로")
+    parser.add_argument("--no-prefetch", action="store_true",    help="백그라운드 선수집 끄기")
+    parser.add_argument("--config-only", action="store_true",    help="nginx 설정만 출력하고 종료")
+    args, extra = parser.parse_known_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    ports = [args.base_port + i for i in range(max(args.workers, 1))]
+    conf  = nginx_config(ports, args.listen)
+
+    if args.nginx_conf:
+        with open(args.nginx_conf, "w", encoding="utf-8") as f:
+            f.write(conf)
+        logger.info("nginx 설정 저장: %s", args.nginx_conf)
+    if args.config_only:
+        print(conf)
+        return 0
+
+    os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+    logger.info("워커 %d개 (포트 %d–%d) · 캐시 %s", len(ports), ports[0], ports[-1], DEFAULT_CACHE_DIR)
+    return run_cluster(ports, prefetch=not args.no_prefetch, extra=extra)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""
+분석 작업 풀 (streamlit 비의존 — poll_job 만 streamlit 을 지연 import)
+- CPU 작업은 프로세스 풀, I/O 작업(Gemini · KIPRIS 호출 등)은 스레드 풀에서 실행
+- UI 스크립트 스레드는 제출 후 즉시 반환, 상태 · 진행률만 폴링 → 무거운 계산 중에도 다른 위젯이 반응
+- 입력이 바뀌면 이전 작업을 취소 (대기 중이면 실행 자체를 건너뛰고, 실행 중이면 결과를 버림)
+- 스레드 작업은 JobContext 로 진행률을 보고하고 취소 여부를 확인할 수 있다
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CPU_WORKERS = int(os.getenv("PATENT_CPU_WORKERS", str(max((os.cpu_count() or 2) - 1, 1))))
+IO_WORKERS  = int(os.getenv("PATENT_IO_WORKERS", "8"))
+POLL_EVERY  = 0.5           # 초 — 진행 표시 갱신 주기
+
+PENDING   = "대기"
+RUNNING   = "실행 중"
+DONE      = "완료"
+FAILED    = "실패"
+CANCELLED = "취소"
+
+
+class JobCancelled(Exception):
+    """JobContext.check() 가 취소된 작업에서 던지는 예외"""
+
+
+class JobContext:
+    """스레드 작업에 넘겨지는 진행률 보고 · 취소 확인 창구"""
+
+    def __init__(self, job: "Job"):
+        self._job = job
+
+    def progress(self, fraction: float, message: str = ""):
+        self._job.progress = min(max(float(fraction), 0.0), 1.0)
+        if message:
+            self._job.message = message
+        self.check()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._job.cancel_event.is_set()
+
+    def check(self):
+        if self.cancelled:
+            raise JobCancelled(self._job.label)
+
+
+class Job:
+    """
+    제출된 작업 하나. inputs 는 이 작업을 만든 입력값(비교용) — UI 가 입력 변경을 감지해 취소한다.
+    프로세스 작업은 진행률을 보고할 수 없으므로 대기/실행/완료 단계만 표시된다.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, label: str, kind: str, inputs: Any = None):
+        self.id           = next(Job._ids)
+        self.label        = label
+        self.kind         = kind
+        self.inputs       = inputs
+        self.future: Optional[Future] = None
+        self.cancel_event = threading.Event()
+        self.progress     = 0.0
+        self.message      = ""
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        f = self.future
+        if self.cancel_event.is_set() or (f is not None and f.cancelled()):
+            return CANCELLED
+        if f is None or not f.done():
+            return RUNNING if self.started_at or (f is not None and f.running()) else PENDING
+        return FAILED if f.exception() is not None else DONE
+
+    @property
+    def done(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def elapsed(self) -> float:
+        start = self.started_at or self.submitted_at
+        return (self.finished_at or time.time()) - start
+
+    def result(self) -> Any:
+        """완료된 작업의 결과 (실패면 예외 전파). 취소된 작업은 JobCancelled"""
+        if self.status == CANCELLED:
+            raise JobCancelled(self.label)
+        return self.future.result()
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        f = self.future
+        if f is None or not f.done() or f.cancelled():
+            return None
+        return f.exception()
+
+    def cancel(self):
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class JobPool:
+    """
+    프로세스 풀(kind="cpu") + 스레드 풀(kind="io"). 풀은 처음 쓸 때 만든다.
+    프로세스 작업의 함수 · 인자는 pickle 가능해야 하고, 함수는 streamlit 앱이 아닌
+    일반 모듈(network_engine · spike_engine 등)에 있어야 워커가 import 할 수 있다.
+    """
+
+    def __init__(self, cpu_workers: int = CPU_WORKERS, io_workers: int = IO_WORKERS):
+        self.cpu_workers = cpu_workers
+        self.io_workers  = io_workers
+        self._cpu: Optional[ProcessPoolExecutor] = None
+        self._io:  Optional[ThreadPoolExecutor]  = None
+        self._lock = threading.Lock()
+        self.jobs: Dict[int, Job] = {}
+
+    def _executor(self, kind: str):
+        with self._lock:
+            if kind == "cpu":
+                if self._cpu is None:
+                    # 스레드가 떠 있는 서버 프로세스를 fork 하지 않도록 forkserver(없으면 spawn) 사용
+                    methods = multiprocessing.get_all_start_methods()
+                    ctx     = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                    self._cpu = ProcessPoolExecutor(max_workers=self.cpu_workers, mp_context=ctx)
+                return self._cpu
+            if self._io is None:
+                self._io = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="job")
+            return self._io
+
+    def submit(
+        self,
+        label: str,
+        fn: Callable,
+        *args,
+        kind: str = "cpu",
+        inputs: Any = None,
+        with_context: bool = False,
+        **kwargs,
+    ) -> Job:
+        """
+        작업 제출 후 즉시 Job 반환.
+        with_context=True 인 스레드 작업은 fn(ctx, *args, **kwargs) 로 호출되어 진행률 · 취소를 다룬다.
+        """
+        if kind not in ("cpu", "io"):
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+        if with_context and kind != "io":
+            raise ValueError("진행률 보고(with_context)는 스레드 작업에서만 지원합니다.")
+        job = Job(label, kind, inputs)
+
+        def _finished(_):
+            job.finished_at = time.time()
+            job.progress    = 1.0 if job.status == DONE else job.progress
+
+        if kind == "io":
+            def _run():
+                job.started_at = time.time()
+                if job.cancel_event.is_set():
+                    raise JobCancelled(label)
+                if with_context:
+                    return fn(JobContext(job), *args, **kwargs)
+                return fn(*args, **kwargs)
+            job.future = self._executor("io").submit(_run)
+        else:
+            job.future = self._executor("cpu").submit(fn, *args, **kwargs)
+        job.future.add_done_callback(_finished)
+
+        with self._lock:
+            self.jobs = {i: j for i, j in self.jobs.items() if not j.done}
+            self.jobs[job.id] = job
+        return job
+
+    def active(self) -> Dict[int, Job]:
+        with self._lock:
+            return {i: j for i, j in self.jobs.items() if not j.done}
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            for job in self.jobs.values():
+                job.cancel()
+            for ex in (self._cpu, self._io):
+                if ex is not None:
+                    ex.shutdown(wait=wait, cancel_futures=True)
+            self._cpu = self._io = None
+
+
+_SHARED: Optional[JobPool] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_pool() -> JobPool:
+    """프로세스 공용 JobPool — 모든 세션이 같은 워커를 나눠 쓴다"""
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = JobPool()
+        return _SHARED
+
+
+# ─────────────────────────────────────────────
+# Streamlit 연동
+# ─────────────────────────────────────────────
+def ensure_job(
+    slot: str,
+    inputs: Any,
+    label: str,
+    fn: Callable,
+    *args,
+    kind: str = "cpu",
+    pool: Optional[JobPool] = None,
+    with_context: bool = False,
+    **kwargs,
+) -> Job:
+    """
+    세션의 slot 자리에 inputs 에 해당하는 작업이 있으면 그대로, 입력이 바뀌었으면 이전 작업을 취소하고 새로 제출.
+    """
+    import streamlit as st
+
+    job = st.session_state.get(slot)
+    if job is not None and job.inputs == inputs and job.status != CANCELLED:
+        return job
+    if job is not None:
+        job.cancel()
+    job = (pool or shared_pool()).submit(
+        label, fn, *args, kind=kind, inputs=inputs, with_context=with_context, **kwargs
+    )
+    st.session_state[slot] = job
+    return job
+
+
+def cancel_job(slot: str):
+    import streamlit as st
+
+    job = st.session_state.pop(slot, None)
+    if job is not None:
+        job.cancel()
+
+
+def poll_job(job: Job, key: str) -> Optional[Any]:
+    """
+    완료된 작업이면 결과를 반환, 아니면 진행 표시 + 취소 버튼을 그리고 None.
+    진행 표시는 fragment 로 POLL_EVERY 초마다 자기만 다시 그리고, 작업이 끝나면 앱 전체를 재실행한다.
+    실패한 작업은 예외를 전파하므로 호출부에서 st.error 등으로 처리.
+    """
+    import streamlit as st
+
+    if job.status == DONE:
+        return job.result()
+    if job.status == FAILED:
+        raise job.error
+    if job.status == CANCELLED:
+        st.caption(f"⏹ {job.label} — 취소됨")
+        return None
+
+    @st.fragment(run_every=POLL_EVERY)
+    def _progress():
+        if job.done:
+            st.rerun()
+        text = f"⏳ {job.label} — {job.status} · {job.elapsed:.1f}s"
+        if job.message:
+            text += f" · {job.message}"
+        c1, c2 = st.columns([5, 1])
+        if job.kind == "io":
+            c1.progress(job.progress, text=text)
+        else:
+            c1.caption(text)
+        if c2.button("취소", key=f"{key}_cancel_{job.id}"):
+            job.cancel()
+            st.rerun()
+
+    _progress()
+    return None
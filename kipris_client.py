@@ -0,0 +1,268 @@
+"""
+KIPRIS Open API 클라이언트 (streamlit 비의존)
+- 대시보드 · 백그라운드 캐시 워머 · CLI 가 같은 클라이언트를 공유
+- 경고는 warn 콜백으로 전달 (대시보드: st.warning, 백그라운드: logging)
+- shared_client(): 프로세스 공용 클라이언트 — 커넥션 풀(keep-alive)을 스레드 · 세션 · 재실행이 재사용
+- stream_word_search(): 대량 검색 — 첫 페이지의 전체 건수로 페이지 수를 정하고 나머지를 동시에 요청
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+import xmltodict
+from requests.adapters import HTTPAdapter
+
+KIPRIS_API_KEY  = os.getenv("KIPRIS_API_KEY", "qIq7ZsqpirwelaLXJZmwe=yjRgV0AbM=Oapp9CI=f6g=")
+KIPRIS_BASE_URL = "http://plus.kipris.or.kr/kipo-api/kipi"
+POOL_MAXSIZE    = 16        # 병렬 수집 스레드 수(기본 8) + 백그라운드 워머 여유분
+PAGE_ROWS       = 100       # getWordSearch 한 페이지 최대 건수
+STREAM_WORKERS  = 4         # 대량 검색 동시 페이지 요청 수 (API 부하를 고려해 풀 크기보다 작게)
+
+logger = logging.getLogger(__name__)
+
+
+class KiprisClient:
+    def __init__(self, api_key: str = KIPRIS_API_KEY, warn: Optional[Callable[[str], None]] = None):
+        self.api_key = api_key
+        self.base_url = KIPRIS_BASE_URL
+        self.session = requests.Session()
+        self.session.mount("http://",  HTTPAdapter(pool_maxsize=POOL_MAXSIZE))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=POOL_MAXSIZE))
+        self.warn = warn or logger.warning
+
+    def search_by_applicant(
+        self,
+        company_query: str,
+        start_date: Optional[str] = None,   # YYYYMMDD — Python 측 필터용 (None: 필터 없음)
+        end_date: Optional[str] = None,     # YYYYMMDD — Python 측 필터용 (None: 필터 없음)
+        max_pages: int = 5,
+        warn: Optional[Callable[[str], None]] = None,
+    ) -> List[Dict]:
+        """
+        KIPRIS getWordSearch로 키워드 검색 후 Python에서 공개일 필터링.
+        openStartDate/openEndDate는 API가 지원하지 않아 제거.
+        warn 을 주면 이 호출의 경고만 그쪽으로 보낸다 (공용 클라이언트를 여러 스레드가 쓸 때).
+        """
+        warn     = warn or self.warn
+        endpoint = "/patUtiModInfoSearchSevice/getWordSearch"
+        all_patents: List[Dict] = []
+
+        for page in range(1, max_pages + 1):
+            params = {
+                "word":       company_query,
+                "ServiceKey": self.api_key,
+                "numOfRows":  "100",
+                "pageNo":     str(page),
+                "patent":     "true",
+                "utility":    "true",
+                "year":       "10",       # 최근 10년치 데이터 대상
+            }
+            try:
+                resp = self.session.get(
+                    self.base_url + endpoint, params=params, timeout=20
+                )
+                if resp.status_code != 200:
+                    warn(f"API 오류 {resp.status_code}: {company_query}")
+                    break
+                items = self._parse_xml(resp.content, start_date, end_date, warn)
+                all_patents.extend(items["patents"])
+                if items["page_count"] < 100:
+                    break          # 마지막 페이지
+                time.sleep(0.3)
+            except Exception as e:
+                warn(f"{company_query} 검색 오류 (페이지 {page}): {e}")
+                break
+
+        return all_patents
+
+    def word_search_page(
+        self,
+        word: str,
+        page: int,
+        rows: int = PAGE_ROWS,
+        years: int = 10,
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """
+        getWordSearch 한 페이지 → (원본 item 목록, 전체 건수). 필드 가공은 호출부 몫.
+        HTTP 오류는 예외로 전파, 전체 건수가 응답에 없으면 None.
+        """
+        params = {
+            "word":       word,
+            "ServiceKey": self.api_key,
+            "numOfRows":  str(rows),
+            "pageNo":     str(page),
+            "patent":     "true",
+            "utility":    "true",
+            "year":       str(years),
+        }
+        resp = self.session.get(self.base_url + "/patUtiModInfoSearchSevice/getWordSearch", params=params, timeout=20)
+        if resp.status_code != 200:
+            raise RuntimeError(f"API 오류 {resp.status_code} (페이지 {page})")
+        d     = xmltodict.parse(resp.content).get("response", {}) or {}
+        body  = d.get("body", {}) or {}
+        items = (body.get("items") or {}).get("item") or []
+        if isinstance(items, dict):
+            items = [items]
+        total = (d.get("count") or {}).get("totalCount") or body.get("totalCount")
+        return items, int(total) if total not in (None, "") else None
+
+    def stream_word_search(
+        self,
+        word: str,
+        max_results: int,
+        rows: int = PAGE_ROWS,
+        workers: int = STREAM_WORKERS,
+        warn: Optional[Callable[[str], None]] = None,
+    ) -> Iterator[Tuple[int, List[Dict], int]]:
+        """
+        대량 키워드 검색 — (페이지 번호, 원본 item 목록, 수집 목표 건수) 를 페이지 순서대로 내보낸다.
+        첫 페이지의 totalCount 로 필요한 페이지 수를 정하고, 나머지는 workers 개씩 겹쳐 요청(공용 커넥션 풀 재사용).
+        실패한 페이지는 경고 후 건너뛴다. 전체 건수를 모르면 짧은 페이지가 나올 때까지 한 장씩.
+        """
+        warn = warn or self.warn
+        items, total = self.word_search_page(word, 1, rows)
+        target = min(total, max_results) if total is not None else max_results
+        yield 1, items, target
+        if not items or len(items) < rows:
+            return
+        n_pages = -(-target // rows)
+
+        if total is None:
+            for page in range(2, n_pages + 1):
+                items, _ = self.word_search_page(word, page, rows)
+                yield page, items, target
+                if len(items) < rows:
+                    return
+            return
+
+        pool    = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="kipris-page")
+        pending = {}
+        next_page = 2
+        try:
+            for page in range(2, n_pages + 1):
+                while next_page <= n_pages and len(pending) < workers:
+                    pending[next_page] = pool.submit(self.word_search_page, word, next_page, rows)
+                    next_page += 1
+                try:
+                    items, _ = pending.pop(page).result()
+                except Exception as e:
+                    warn(f"{word} 검색 오류 (페이지 {page}): {e}")
+                    continue
+                yield page, items, target
+        finally:
+            # 소비자가 중간에 멈추면(generator close) 아직 시작 안 한 페이지 요청은 버린다
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _parse_xml(
+        self,
+        content: bytes,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        warn: Optional[Callable[[str], None]] = None,
+    ) -> Dict:
+        """
+        XML 파싱 + 공개일(openDate) 기준 Python 필터링.
+        필드명: response.body.items.item  (patentUtilityInfo 아님)
+        초록:   astrtCont  (abstractContent 아님)
+        """
+        result = {"patents": [], "page_count": 0}
+        try:
+            d    = xmltodict.parse(content)
+            body = d.get("response", {}).get("body", {})
+            raw  = body.get("items", {})
+            if not raw:
+                return result
+            items = raw.get("item", [])
+            if not items:
+                return result
+            if isinstance(items, dict):
+                items = [items]
+
+            result["page_count"] = len(items)
+            start_dt = datetime.strptime(start_date, "%Y%m%d") if start_date else None
+            end_dt   = datetime.strptime(end_date,   "%Y%m%d") if end_date else None
+
+            for item in items:
+                # 공개일 또는 출원일로 날짜 확정 (공개일 우선)
+                open_date = (item.get("openDate") or "").strip()
+                app_date  = (item.get("applicationDate") or "").strip()
+                date_str  = open_date if open_date else app_date
+
+                # 날짜 필터 (Python 측)
+                if date_str and (start_dt or end_dt):
+                    try:
+                        dt = datetime.strptime(date_str[:8], "%Y%m%d")
+                        if (start_dt and dt < start_dt) or (end_dt and dt > end_dt):
+                            continue
+                    except Exception:
+                        pass
+
+                result["patents"].append({
+                    "applicationNumber": item.get("applicationNumber", ""),
+                    "inventionTitle":    item.get("inventionTitle", ""),
+                    "applicantName":     item.get("applicantName", ""),
+                    "openDate":          open_date or app_date,
+                    "applicationDate":   app_date,
+                    "registerDate":      (item.get("registerDate") or "").strip(),
+                    "ipcNumber":         (item.get("ipcNumber") or "").strip(),
+                    "registerStatus":    item.get("registerStatus", ""),
+                    "abstract":          (item.get("astrtCont") or "").strip(),
+                })
+        except Exception as e:
+            (warn or self.warn)(f"XML 파싱 오류: {e}")
+        return result
+
+    def pool_info(self) -> Dict[str, int]:
+        """커넥션 풀 현황 (호스트별 풀 수 · 유휴 커넥션 수)"""
+        pools = idle = 0
+        for adapter in self.session.adapters.values():
+            manager = getattr(adapter, "poolmanager", None)
+            if manager is None:
+                continue
+            for key in list(manager.pools.keys()):
+                pool = manager.pools.get(key)
+                if pool is not None:
+                    pools += 1
+                    idle  += pool.pool.qsize() if pool.pool is not None else 0
+        return {"pools": pools, "idle_connections": idle}
+
+
+_SHARED: Dict[str, KiprisClient] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_client(api_key: Optional[str] = None) -> KiprisClient:
+    """프로세스 공용 KiprisClient (API 키별 최초 호출 시 생성)"""
+    api_key = api_key or KIPRIS_API_KEY
+    with _SHARED_LOCK:
+        client = _SHARED.get(api_key)
+        if client is None:
+            client = _SHARED[api_key] = KiprisClient(api_key)
+        return client
+
+
+def filter_by_open_date(patents: List[Dict], start_date: str, end_date: str) -> List[Dict]:
+    """
+    캐시된 원본(날짜 필터 없음)에서 공개일 기간만 추출 — _parse_xml 과 같은 규칙.
+    날짜가 없거나 형식이 깨진 특허는 API 측 필터와 마찬가지로 통과시킨다.
+    """
+    start_dt = datetime.strptime(start_date, "%Y%m%d")
+    end_dt   = datetime.strptime(end_date,   "%Y%m%d")
+    out: List[Dict] = []
+    for p in patents:
+        date_str = str(p.get("openDate") or p.get("applicationDate") or "")
+        if date_str:
+            try:
+                dt = datetime.strptime(date_str[:8], "%Y%m%d")
+                if dt < start_dt or dt > end_dt:
+                    continue
+            except Exception:
+                pass
+        out.append(p)
+    return out
@@ -0,0 +1,366 @@
+"""
+협업 네트워크 계산 (streamlit 비의존 — 작업 풀의 프로세스 워커에서 실행 가능)
+- KIPRIS 다수 출원인 · 발명자 필드('A|B|C')를 분리해 특허 × 이름 희소 행렬로 인코딩
+- 공동 출원 가중치 = 희소 행렬 곱(Bᵀ·B)의 상삼각 — 파이썬 쌍 루프 없음
+- 노드 배치(spring layout)와 Plotly 선분 좌표를 배열 연산 한 번으로 생성
+- 배치 캐시: 그래프 지문별 좌표 보관, 노드가 늘어나면 이전 좌표에서 이어서 계산(warm start)
+- 큰 그래프: 희소 스펙트럴 초기 배치 + 격자 근사(단층 Barnes-Hut) Fruchterman-Reingold
+- 연결 강도(가중 차수) 상위 노드만 남기는 가지치기
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import eigsh
+
+NAME_SEP = "|"
+
+SPRING_MAX_NODES = 500      # 이하: networkx spring_layout (정확), 초과: 격자 근사 FR
+FR_GRID          = 32       # 격자 근사 반발력 계산 격자 크기 (FR_GRID × FR_GRID 칸)
+FR_ITERATIONS    = 50       # 처음부터 배치할 때 반복 수
+WARM_ITERATIONS  = 15       # 이전 좌표에서 이어서 배치할 때 반복 수
+
+
+def split_names(values: pd.Series, sep: str = NAME_SEP) -> pd.Series:
+    """'A|B|C' 필드를 이름 하나당 한 행으로 펼침 (인덱스 = 원래 행, 공백 · 빈 이름 제거)"""
+    names = values.fillna("").astype(str).str.split(sep, regex=False).explode().str.strip()
+    return names[names != ""]
+
+
+class CollaborationNetwork:
+    """
+    공동 출원 네트워크. 노드는 협업 관계가 하나 이상 있는 이름만 포함한다.
+    names[i]  : 노드 i 의 이름
+    counts[i] : 노드 i 가 등장한 특허 수
+    src / dst / weight : 엣지 배열 (src < dst, weight = 함께 등장한 특허 수)
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        counts: np.ndarray,
+        src: np.ndarray,
+        dst: np.ndarray,
+        weight: np.ndarray,
+    ):
+        self.names  = names
+        self.counts = counts
+        self.src    = src
+        self.dst    = dst
+        self.weight = weight
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.src)
+
+    @property
+    def degree(self) -> np.ndarray:
+        return np.bincount(np.concatenate([self.src, self.dst]), minlength=len(self.names))
+
+    @property
+    def strength(self) -> np.ndarray:
+        """가중 차수 (연결된 엣지 가중치 합)"""
+        w = np.concatenate([self.weight, self.weight])
+        return np.bincount(np.concatenate([self.src, self.dst]), weights=w, minlength=len(self.names))
+
+    @property
+    def fingerprint(self) -> str:
+        """노드 이름 · 엣지 · 가중치 지문 — 배치 캐시 키"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update("\x1f".join(self.names).encode("utf-8"))
+        for a in (self.src, self.dst, self.weight):
+            h.update(np.ascontiguousarray(a, dtype=np.int64).tobytes())
+        return h.hexdigest()
+
+    def prune(self, max_nodes: Optional[int] = None, min_weight: int = 1) -> "CollaborationNetwork":
+        """
+        가중치 min_weight 미만 엣지를 버리고, 가중 차수 상위 max_nodes 노드 사이의 엣지만 남김.
+        엣지가 모두 사라진 노드는 제외 (번호는 다시 매김).
+        """
+        keep_edge = self.weight >= min_weight
+        if max_nodes is not None and len(self.names) > max_nodes:
+            top = np.zeros(len(self.names), dtype=bool)
+            top[np.argsort(-self.strength, kind="stable")[:max_nodes]] = True
+            keep_edge &= top[self.src] & top[self.dst]
+        if keep_edge.all():
+            return self
+        src, dst = self.src[keep_edge], self.dst[keep_edge]
+        used  = np.unique(np.concatenate([src, dst]))
+        remap = np.full(len(self.names), -1, dtype=np.int64)
+        remap[used] = np.arange(len(used))
+        return CollaborationNetwork(
+            [self.names[i] for i in used], self.counts[used],
+            remap[src], remap[dst], self.weight[keep_edge],
+        )
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        column: str,
+        key: str = "applicationNumber",
+        sep: str = NAME_SEP,
+        min_weight: int = 1,
+    ) -> "CollaborationNetwork":
+        """
+        df[column] 의 다수 당사자 필드를 분리해 특허(key 기준) × 이름 0/1 행렬 B 를 만들고,
+        C = Bᵀ·B 의 비대각 원소를 엣지 가중치로 쓴다. 같은 특허가 여러 행이어도 한 번만 센다.
+        """
+        names = split_names(df[column].reset_index(drop=True), sep)      # 인덱스 = 행 위치
+        if names.empty:
+            return cls.empty()
+        patent_codes, _ = pd.factorize(df[key])
+        missing = patent_codes < 0                      # 출원번호 없는 행은 각자 별개 특허
+        patent_codes[missing] = patent_codes.max() + 1 + np.arange(missing.sum())
+        rows            = patent_codes[names.index.to_numpy()]
+        cols, labels    = pd.factorize(names.to_numpy())
+        B = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(int(patent_codes.max()) + 1, len(labels)),
+        )
+        B.data[:] = 1                                   # 중복 (특허, 이름) 쌍은 1로
+        counts = np.asarray(B.sum(axis=0)).ravel()
+
+        C = sparse.triu(B.T @ B, k=1).tocoo()
+        keep = C.data >= min_weight
+        src, dst, w = C.row[keep], C.col[keep], C.data[keep]
+        if not len(src):
+            return cls.empty()
+
+        # 엣지가 있는 노드만 남기고 번호를 다시 매김
+        used  = np.unique(np.concatenate([src, dst]))
+        remap = np.full(len(labels), -1, dtype=np.int64)
+        remap[used] = np.arange(len(used))
+        return cls(
+            [str(labels[i]) for i in used],
+            counts[used].astype(np.int64),
+            remap[src], remap[dst], w.astype(np.int64),
+        )
+
+    @classmethod
+    def empty(cls) -> "CollaborationNetwork":
+        z = np.zeros(0, dtype=np.int64)
+        return cls([], z, z, z, z)
+
+    def edge_segments(self, pos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Plotly 선분용 좌표 (x, y) — 엣지마다 [시작, 끝, NaN] 3칸, 한 번에 생성.
+        pos: (노드 수, 2) 배열
+        """
+        seg = np.full((self.n_edges, 3, 2), np.nan)
+        seg[:, 0] = pos[self.src]
+        seg[:, 1] = pos[self.dst]
+        seg = seg.reshape(-1, 2)
+        return seg[:, 0], seg[:, 1]
+
+
+# ─────────────────────────────────────────────
+# 노드 배치
+# ─────────────────────────────────────────────
+def _rescale(pos: np.ndarray) -> np.ndarray:
+    """중심 0, 최대 절댓값 1 로 (networkx rescale_layout 과 같은 규칙)"""
+    pos = pos - pos.mean(axis=0)
+    lim = np.abs(pos).max()
+    return pos / lim if lim > 0 else pos
+
+
+def _fr_grid(
+    pos: np.ndarray,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weight: np.ndarray,
+    iterations: int,
+    temperature: float,
+    grid: int = FR_GRID,
+    chunk: int = 2048,
+) -> np.ndarray:
+    """
+    Fruchterman-Reingold — 반발력은 격자 칸의 질량 중심으로 근사(단층 Barnes-Hut)해
+    반복당 O(노드 수 × 격자 칸 수), 인력은 엣지 배열 위 벡터 연산.
+    자기 칸은 자기 자신을 뺀 질량 중심을 써서 자기 반발을 피한다.
+    """
+    n   = len(pos)
+    pos = pos.astype(float).copy()
+    k   = np.sqrt(1.0 / n)
+    w   = weight.astype(float) / max(float(weight.max()), 1.0)
+    dt  = temperature / max(iterations, 1)
+    t   = temperature
+    for _ in range(iterations):
+        lo, hi = pos.min(axis=0), pos.max(axis=0)
+        cell   = np.minimum(((pos - lo) / np.maximum(hi - lo, 1e-9) * grid).astype(np.int64), grid - 1)
+        flat   = cell[:, 0] * grid + cell[:, 1]
+        mass   = np.bincount(flat, minlength=grid * grid).astype(float)
+        sums   = np.stack([np.bincount(flat, weights=pos[:, d], minlength=grid * grid) for d in (0, 1)], axis=1)
+        occ    = np.flatnonzero(mass)
+        center = sums[occ] / mass[occ, None]
+        m      = mass[occ]
+        own    = np.searchsorted(occ, flat)          # 각 노드의 칸 → occ 위치
+
+        disp = np.zeros_like(pos)
+        for s in range(0, n, chunk):                 # (노드 묶음 × 칸) 메모리 상한
+            e     = min(s + chunk, n)
+            delta = pos[s:e, None, :] - center[None, :, :]
+            mm    = np.broadcast_to(m, (e - s, len(occ))).copy()
+            rows  = np.arange(e - s)
+            # 자기 칸: 자신을 뺀 나머지의 질량 중심
+            rest  = mm[rows, own[s:e]] - 1.0
+            with np.errstate(invalid="ignore", divide="ignore"):
+                c_ex = np.where(rest[:, None] > 0,
+                                (sums[occ][own[s:e]] - pos[s:e]) / np.maximum(rest, 1.0)[:, None], pos[s:e])
+            delta[rows, own[s:e]] = pos[s:e] - c_ex
+            mm[rows, own[s:e]]    = rest
+            d2 = np.maximum((delta ** 2).sum(axis=2), 1e-6)
+            disp[s:e] = (delta * (k * k * mm / d2)[:, :, None]).sum(axis=1)
+
+        delta = pos[src] - pos[dst]
+        dist  = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 1e-6)
+        pull  = delta * (dist * w / k)[:, None]
+        np.add.at(disp, src, -pull)
+        np.add.at(disp, dst, pull)
+
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 1e-9)
+        pos   += disp / length[:, None] * np.minimum(length, t)[:, None]
+        t      = max(t - dt, 1e-3)
+    return pos
+
+
+def spring_positions(
+    n_nodes: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weight: Optional[np.ndarray] = None,
+    init: Optional[np.ndarray] = None,
+    seed: int = 42,
+) -> np.ndarray:
+    """
+    엣지 배열 → 노드 좌표 (노드 수, 2), 범위 [-1, 1]. seed 고정으로 같은 입력이면 같은 배치.
+    init: 이전 좌표 (모르는 노드는 NaN 행) — 주면 거기서 적은 반복으로 이어서 계산(warm start).
+    노드가 SPRING_MAX_NODES 이하면 networkx spring_layout, 초과면 스펙트럴 초기 배치 + 격자 근사 FR.
+    """
+    if n_nodes == 0:
+        return np.zeros((0, 2))
+    rng  = np.random.default_rng(seed)
+    w    = weight if weight is not None else np.ones(len(src), dtype=np.int64)
+    warm = init is not None and not np.isnan(init).all()
+    if warm:
+        init = _fill_new_nodes(init, src, dst, rng)
+
+    if n_nodes <= SPRING_MAX_NODES:
+        G = nx.Graph()
+        G.add_nodes_from(range(n_nodes))
+        G.add_weighted_edges_from(zip(src.tolist(), dst.tolist(), w.tolist()))
+        start = {i: init[i] for i in range(n_nodes)} if warm else None
+        pos = nx.spring_layout(
+            G, pos=start, seed=seed, iterations=WARM_ITERATIONS if warm else FR_ITERATIONS,
+        )
+        return np.array([pos[i] for i in range(n_nodes)], dtype=float)
+
+    if warm:
+        start, iterations, temperature = _rescale(init), WARM_ITERATIONS, 0.02
+    else:
+        start = _rescale(_spectral_init(n_nodes, src, dst, w) + rng.normal(scale=0.01, size=(n_nodes, 2)))
+        iterations, temperature = FR_ITERATIONS, 0.1
+    return _rescale(_fr_grid(start, src, dst, w, iterations, temperature))
+
+
+def _spectral_init(n: int, src: np.ndarray, dst: np.ndarray, weight: np.ndarray) -> np.ndarray:
+    """
+    정규화 인접행렬 D^-1/2·A·D^-1/2 의 2·3번째 큰 고유벡터 (희소 eigsh, 시작 벡터 · 부호 고정 → 재현 가능).
+    고립 노드 없는 가지치기 후 그래프 기준. 계산이 수렴하지 않으면 무작위 배치로 후퇴.
+    """
+    A = sparse.coo_matrix((weight.astype(float), (src, dst)), shape=(n, n)).tocsr()
+    A = A + A.T
+    d = np.asarray(A.sum(axis=1)).ravel()
+    inv = 1.0 / np.sqrt(np.maximum(d, 1e-12))
+    M = sparse.diags(inv) @ A @ sparse.diags(inv)
+    try:
+        vals, vecs = eigsh(M, k=3, which="LA", v0=np.sqrt(np.maximum(d, 1e-12)), tol=1e-4, maxiter=n * 10)
+    except Exception:
+        return np.random.default_rng(0).uniform(-1, 1, size=(n, 2))
+    vecs = vecs[:, np.argsort(-vals)][:, 1:3] * inv[:, None]
+    flip = np.sign(vecs[np.abs(vecs).argmax(axis=0), [0, 1]])
+    return vecs * np.where(flip == 0, 1.0, flip)
+
+
+def _fill_new_nodes(init: np.ndarray, src: np.ndarray, dst: np.ndarray, rng) -> np.ndarray:
+    """이전 좌표가 없는 노드는 좌표가 있는 이웃들의 평균 근처, 이웃도 없으면 무작위 위치"""
+    pos   = init.astype(float).copy()
+    known = ~np.isnan(pos).any(axis=1)
+    if known.all():
+        return pos
+    a, b = np.concatenate([src, dst]), np.concatenate([dst, src])
+    ok   = known[b] & ~known[a]
+    cnt  = np.bincount(a[ok], minlength=len(pos))
+    sx   = np.bincount(a[ok], weights=pos[b[ok], 0], minlength=len(pos))
+    sy   = np.bincount(a[ok], weights=pos[b[ok], 1], minlength=len(pos))
+    new  = ~known
+    near = new & (cnt > 0)
+    pos[near] = np.stack([sx[near], sy[near]], axis=1) / cnt[near, None]
+    pos[near] += rng.normal(scale=0.02, size=(int(near.sum()), 2))
+    far = new & (cnt == 0)
+    pos[far] = rng.uniform(-1, 1, size=(int(far.sum()), 2))
+    return pos
+
+
+class LayoutCache:
+    """
+    그래프 지문 → (노드 이름, 좌표) 프로세스 공용 LRU.
+    같은 그래프는 다시 계산하지 않고, 새 그래프는 최근 배치에 있던 이름의 좌표를 초기값으로 받는다.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, Tuple[List[str], np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str) -> Optional[np.ndarray]:
+        with self._lock:
+            item = self._items.get(fingerprint)
+            if item is None:
+                return None
+            self._items.move_to_end(fingerprint)
+            return item[1]
+
+    def put(self, fingerprint: str, names: List[str], pos: np.ndarray):
+        with self._lock:
+            self._items[fingerprint] = (list(names), pos)
+            self._items.move_to_end(fingerprint)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def seed_positions(self, names: List[str]) -> Optional[np.ndarray]:
+        """이름별 가장 최근 좌표 (없는 이름은 NaN 행). 아는 이름이 하나도 없으면 None"""
+        known: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for old_names, pos in reversed(self._items.values()):
+                for name, xy in zip(old_names, pos):
+                    known.setdefault(name, xy)
+        if not known:
+            return None
+        init = np.full((len(names), 2), np.nan)
+        for i, name in enumerate(names):
+            if name in known:
+                init[i] = known[name]
+        return None if np.isnan(init).all() else init
+
+
+_LAYOUTS: Optional[LayoutCache] = None
+_LAYOUTS_LOCK = threading.Lock()
+
+
+def shared_layout_cache() -> LayoutCache:
+    """프로세스 공용 LayoutCache (세션 · 재실행 간 배치 공유)"""
+    global _LAYOUTS
+    with _LAYOUTS_LOCK:
+        if _LAYOUTS is None:
+            _LAYOUTS = LayoutCache()
+        return _LAYOUTS
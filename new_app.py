@@ -2,14 +2,26 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px  # 추가
+from plotly.subplots import make_subplots
 from datetime import datetime
 import requests
 import xmltodict
 import google.generativeai as genai
-from typing import Dict, List
-import networkx as nx  # 추가
-from collections import Counter
-import re
+from typing import Dict, List, Optional
+import numpy as np
+
+from job_pool import cancel_job, ensure_job, poll_job
+from network_engine import CollaborationNetwork, shared_layout_cache, spring_positions
+from kipris_client import shared_client
+from patent_engine import (
+    OTHER_LABEL, FilterIndex, FrameBuilder, FrozenFrame, export_table, fingerprint_cache, table_page,
+)
+from patent_stats import (
+    DAYS_PER_MONTH, RegistrationLag, explode_ipc, ipc_distribution, ipc_section_label, logistic,
+    registration_lags, s_curve_table,
+)
+from patent_taxonomy import default_taxonomy
+from text_engine import DocumentTermMatrix, tokenize
 
 # 스타일 설정
 COLORS = {
@@ -29,6 +41,19 @@ ipc_descriptions = {
     'G': '물리학',
     'H': '전기',
 }
+NETWORK_LABEL_TOP     = 30   # 협업 네트워크에서 이름을 표시할 상위 노드 수
+NETWORK_DEFAULT_NODES = 300  # 협업 네트워크 기본 표시 노드 수 (가중 차수 상위)
+NETWORK_MAX_NODE_SIZE = 60   # 노드 마커 최대 크기 (px)
+LARGE_MAX_RESULTS     = 10000  # 대량 검색 모드 최대 수집 건수
+LARGE_DEFAULT_RESULTS = 2000
+GEMINI_SAMPLE         = 50     # Gemini 에 원문을 넘기는 특허 수 (나머지는 집계 요약으로)
+TABLE_PAGE_ROWS       = 1000   # 데이터 탭 한 번에 표시할 행 수
+PATENT_COLUMNS = (
+    "applicationNumber", "applicantName", "inventionTitle", "astrtCont", "openDate", "openNumber",
+    "publicationDate", "publicationNumber", "registerDate", "registerNumber", "registerStatus",
+    "applicationDate", "inventorName", "ipcNumber",
+)
+
 # Streamlit 페이지 설정
 st.set_page_config(page_title="KIPRIS & Gemini 특허 분석 시스템", layout="wide")
 
@@ -83,6 +108,31 @@ class KiprisAPI:
 
         return results[:min_results] if len(results) > min_results else results
 
+    def search_patents_large(self, search_type: str, search_query: str, max_results: int,
+                             on_page=None) -> pd.DataFrame:
+        """
+        대량 검색 — 공용 KIPRIS 클라이언트가 페이지를 동시에 요청하고, 도착한 페이지는 조각 단위로 DataFrame 에 쌓습니다.
+        on_page(수집 건수, 목표 건수) 로 진행 상황을 알립니다. (UI 호출은 이 스크립트 스레드에서만)
+        """
+        if search_type != "키워드":
+            st.warning("현재 API는 발명자 검색을 지원하지 않습니다. 키워드 검색으로 대체합니다.")
+        builder = FrameBuilder(PATENT_COLUMNS)
+        try:
+            for _, items, target in shared_client(self.api_key).stream_word_search(
+                search_query, max_results, warn=st.warning
+            ):
+                builder.add(self._records(items))
+                if on_page is not None:
+                    on_page(min(len(builder), target), target)
+        except Exception as e:
+            st.error(f"검색 중 오류 발생: {str(e)}")
+        return builder.frame(limit=max_results)
+
+    @staticmethod
+    def _records(items: List[Dict]) -> List[Dict]:
+        """API item → 분석용 레코드 (PATENT_COLUMNS)"""
+        return [{col: item.get(col, "") for col in PATENT_COLUMNS} for item in items]
+
     def _make_request(self, endpoint: str, params: Dict) -> requests.Response:
         """API 요청을 수행합니다."""
         url = f"{self.base_url}{endpoint}"
@@ -105,31 +155,17 @@ class KiprisAPI:
                 return []
             if isinstance(items, dict):
                 items = [items]
-            return [
-                {
-                    "applicationNumber": item.get("applicationNumber", ""),
-                    "applicantName": item.get("applicantName", ""),
-                    "inventionTitle": item.get("inventionTitle", ""),
-                    "astrtCont": item.get("astrtCont", ""),
-                    "openDate": item.get("openDate", ""),
-                    "openNumber": item.get("openNumber", ""),
-                    "publicationDate": item.get("publicationDate", ""),
-                    "publicationNumber": item.get("publicationNumber", ""),
-                    "registerDate": item.get("registerDate", ""),
-                    "registerNumber": item.get("registerNumber", ""),
-                    "registerStatus": item.get("registerStatus", ""),
-                    "applicationDate": item.get("applicationDate", ""),
-                    "inventorName": item.get("inventorName", ""),  # API에서 제공되지 않을 수 있음
-                    "ipcNumber": item.get("ipcNumber", "")          # IPC 코드 추가
-                }
-                for item in items
-            ]
+            return self._records(items)
         except Exception as e:
             st.error(f"응답 파싱 중 오류 발생: {str(e)}")
             return []
-@st.cache_data
-def analyze_patents_with_gemini(patents: List[Dict], api_key: str) -> str:
-    """Gemini API를 사용하여 특허 데이터를 분석합니다."""
+
+
+def gemini_report(patents: List[Dict], api_key: str, overview: str = "") -> str:
+    """
+    Gemini 분석 본체 — st 호출 없이 결과만 반환 (작업 풀 스레드에서 실행, 오류는 예외로 전파)
+    overview: 대량 검색 시 전체 결과 집계 요약 (patents 는 그중 대표 표본)
+    """
     genai.configure(api_key=api_key)
     model = genai.GenerativeModel("gemini-pro")
 
@@ -150,8 +186,19 @@ def analyze_patents_with_gemini(patents: List[Dict], api_key: str) -> str:
         ]
     )
 
+    if overview:
+        intro = f"""다음은 특허 검색 결과 전체의 집계 요약과, 출원 시기별로 고르게 뽑은 대표 특허 {len(patents)}개입니다.
+    집계 요약을 기준으로 전체 경향을 판단하고 대표 특허로 기술 내용을 보완해 분석해주세요:
+
+    [전체 집계]
+    {overview}
+
+    [대표 특허]"""
+    else:
+        intro = f"다음 {len(patents)}개의 특허 데이터를 종합적으로 분석하여 주요 트렌드와 인사이트를 도출해주세요:"
+
     prompt = f"""
-    다음 {len(patents)}개의 특허 데이터를 종합적으로 분석하여 주요 트렌드와 인사이트를 도출해주세요:
+    {intro}
     
     {patent_summaries}
     
@@ -165,42 +212,111 @@ def analyze_patents_with_gemini(patents: List[Dict], api_key: str) -> str:
     7. 기술 분야별 특허 집중도
     """
 
-    try:
-        response = model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        st.error(f"Gemini API 분석 중 오류 발생: {str(e)}")
-        return "분석 실패"
-def analyze_yearly_keywords(df: pd.DataFrame) -> dict:
-    """연도별 주요 키워드를 추출하고 분석합니다."""
-    from collections import Counter
-    import re
-    
-    # 불용어 정의
-    stopwords = set(['및', '이를', '있는', '위한', '하는', '또는', '되는', '통한', '있다', '한다', 
-                    '본', '발명', '기술', '장치', '있을', '수행', '형성', '구성'])
-    
+    response = model.generate_content(prompt)
+    return response.text
+
+def gemini_sample(df: pd.DataFrame, n: int = GEMINI_SAMPLE) -> List[Dict]:
+    """Gemini 에 원문을 넘길 대표 특허 — n건 이하면 전부, 많으면 출원일 순으로 고르게 n건"""
+    if len(df) <= n:
+        return df.to_dict('records')
+    order = np.argsort(df['applicationDate'].astype(str).to_numpy(), kind='stable')
+    return df.iloc[order[np.linspace(0, len(df) - 1, n).astype(int)]].to_dict('records')
+
+@fingerprint_cache()
+def portfolio_overview(df: pd.DataFrame, top_n: int = 10) -> str:
+    """Gemini 프롬프트용 전체 결과 집계 요약 (연도별 출원 · 상위 출원인 · 등록상태 · 상위 IPC · 기술 분야)"""
+    def _counts(series: pd.Series) -> str:
+        counts = series[series.astype(str) != ''].value_counts().head(top_n)
+        return ", ".join(f"{k} {v:,}건" for k, v in counts.items())
+
+    years = df['year'].value_counts().sort_index()
+    ipc = ipc_distribution(df, levels=("subclass",))["subclass"].head(top_n)
+    lines = [
+        f"총 특허 수: {len(df):,}건",
+        "연도별 출원: " + ", ".join(f"{int(y)}년 {c:,}건" for y, c in years.items() if pd.notna(y)),
+        "상위 출원인: " + _counts(df['applicantName']),
+        "등록상태: " + _counts(df['registerStatus']),
+        "상위 IPC 서브클래스: " + ", ".join(f"{c} {n:,}건" for c, n in zip(ipc['subclass'], ipc['count'])),
+    ]
+    if 'tech' in df.columns:
+        lines.append("기술 분야: " + _counts(df['tech']))
+    return "\n    ".join(lines)
+
+def patent_text_matrix(df: pd.DataFrame, search_id: int) -> DocumentTermMatrix:
+    """제목 + 요약 문서-단어 행렬 — 검색마다 한 번만 토큰화하고 세션에 보관"""
+    cached = st.session_state.get("text_matrix")
+    if cached is not None and cached[0] == search_id and len(cached[1]) == len(df):
+        return cached[1]
+    dtm = DocumentTermMatrix.from_frame(df, ("inventionTitle", "astrtCont"))
+    st.session_state["text_matrix"] = (search_id, dtm)
+    return dtm
+
+def patent_frame(patents, search_id: int) -> FrozenFrame:
+    """
+    검색 결과 프레임 (출원연도 · 기술 카테고리 포함) — 검색마다 한 번만 만들고 지문을 매겨 세션에 보관.
+    분석 함수는 이 지문으로 캐시되므로 재실행마다 프레임을 다시 해시하지 않습니다.
+    """
+    cached = st.session_state.get("patent_frame")
+    if cached is not None and cached[0] == search_id:
+        return cached[1]
+    df = patents.copy(deep=False) if isinstance(patents, pd.DataFrame) else pd.DataFrame(patents)
+    df['year'] = pd.to_datetime(df['applicationDate'], errors='coerce').dt.year
+    df['tech'] = [
+        default_taxonomy().classify_tech(title or '', abstract or '')
+        for title, abstract in zip(df['inventionTitle'], df['astrtCont'])
+    ]
+    frame = FrozenFrame(df)
+    st.session_state["patent_frame"] = (search_id, frame)
+    return frame
+
+FILTER_COLUMNS = ('registerStatus', 'applicantName', 'year', 'tech')
+
+def patent_filter_index(df: pd.DataFrame, search_id: int) -> FilterIndex:
+    """데이터 탭 필터 인덱스 (등록상태 · 출원인 · 연도 · 기술 + IPC 서브클래스) — 검색마다 한 번 생성"""
+    cached = st.session_state.get("filter_index")
+    if cached is not None and cached[0] == search_id and cached[1].n_rows == len(df):
+        return cached[1]
+    index = FilterIndex.from_frame(df, [c for c in FILTER_COLUMNS if c in df.columns])
+    ipc = explode_ipc(df)
+    index.add_multi('ipc', ipc['row'].to_numpy(), ipc['subclass'])
+    st.session_state["filter_index"] = (search_id, index)
+    return index
+
+def patent_network(df: pd.DataFrame, column: str, search_id: int, max_nodes: int, min_weight: int) -> CollaborationNetwork:
+    """출원인 · 발명자 협업 네트워크 (가지치기 포함) — 검색 · 가지치기 조건마다 한 번 생성해 세션에 보관"""
+    sig = (search_id, max_nodes, min_weight)
+    cached = st.session_state.get(f"network_{column}")
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    net = CollaborationNetwork.from_frame(df, column).prune(max_nodes, min_weight)
+    st.session_state[f"network_{column}"] = (sig, net)
+    return net
+
+def analyze_yearly_keywords(df: pd.DataFrame, dtm: Optional[DocumentTermMatrix] = None) -> dict:
+    """연도별 주요 키워드를 추출하고 분석합니다. (연도 지시행렬 × 문서-단어 행렬)"""
+    dtm = dtm if dtm is not None else DocumentTermMatrix.from_frame(df)
+    codes, years = pd.factorize(df['year'], sort=True)
+    year_counts = dtm.group_counts(codes, len(years))
+
     yearly_keywords = {}
-    for year in sorted(df['year'].unique()):
-        year_df = df[df['year'] == year]
-        
-        # 제목과 요약에서 키워드 추출
-        text = ' '.join(year_df['inventionTitle'].fillna('') + ' ' + year_df['astrtCont'].fillna(''))
-        
-        # 단어 추출 (2글자 이상)
-        words = [word for word in re.findall(r'\w+', text) 
-                if len(word) >= 2 and word not in stopwords]
-        
-        # 빈도수 계산
-        word_counts = Counter(words)
-        
+    for i, year in enumerate(years):
         # 상위 10개 키워드 저장
+        top = dtm.top_terms(year_counts[i], 10)
         yearly_keywords[year] = {
-            'keywords': [word for word, _ in word_counts.most_common(10)],
-            'counts': [count for _, count in word_counts.most_common(10)]
+            'keywords': [word for word, _ in top],
+            'counts': [count for _, count in top]
         }
     
     return yearly_keywords
+
+def keyword_year_counts(df: pd.DataFrame, dtm: DocumentTermMatrix, keywords) -> dict:
+    """키워드별 전체 연도 출현 빈도 {키워드: [연도 오름차순 빈도]} — 상위 10위 밖인 해도 실제 빈도"""
+    codes, years = pd.factorize(df['year'], sort=True)
+    keywords = [k for k in keywords if k in dtm.vocab.index]
+    ids = dtm.vocab.lookup(keywords)
+    counts = dtm.group_counts(codes, len(years))[:, ids].toarray()
+    return {k: counts[:, j].tolist() for j, k in enumerate(keywords)}
+
 def create_keyword_trend_visualization(yearly_keywords: dict) -> go.Figure:
     """연도별 키워드 트렌드를 시각화합니다."""
     fig = go.Figure()
@@ -255,8 +371,8 @@ def create_keyword_trend_visualization(yearly_keywords: dict) -> go.Figure:
     )
     
     return fig
-def create_keyword_trend_visualization(yearly_keywords: dict) -> go.Figure:
-    """연도별 키워드 트렌드를 시각화합니다."""
+def create_keyword_trend_visualization(yearly_keywords: dict, trend_counts: Optional[dict] = None) -> go.Figure:
+    """연도별 키워드 트렌드를 시각화합니다. (trend_counts: keyword_year_counts 결과 — 있으면 실제 연도별 빈도 사용)"""
     fig = go.Figure()
     
     colors = px.colors.qualitative.Set3
@@ -268,18 +384,20 @@ def create_keyword_trend_visualization(yearly_keywords: dict) -> go.Figure:
     
     # 각 키워드별 연도별 빈도 추적
     for idx, keyword in enumerate(all_keywords):
-        years = []
-        counts = []
-        for year in sorted(yearly_keywords.keys()):
-            year_data = yearly_keywords[year]
-            try:
-                idx_in_year = year_data['keywords'].index(keyword)
-                count = year_data['counts'][idx_in_year]
-            except ValueError:
-                count = 0
-            years.append(year)
-            counts.append(count)
-            
+        years = sorted(yearly_keywords.keys())
+        if trend_counts is not None and keyword in trend_counts:
+            counts = trend_counts[keyword]
+        else:
+            counts = []
+            for year in years:
+                year_data = yearly_keywords[year]
+                try:
+                    idx_in_year = year_data['keywords'].index(keyword)
+                    count = year_data['counts'][idx_in_year]
+                except ValueError:
+                    count = 0
+                counts.append(count)
+
         fig.add_trace(go.Scatter(
             x=years,
             y=counts,
@@ -308,56 +426,34 @@ def create_keyword_trend_visualization(yearly_keywords: dict) -> go.Figure:
     
     return fig
 
+@fingerprint_cache()
 def analyze_ipc_codes(df: pd.DataFrame) -> pd.DataFrame:
-    """IPC 코드를 분석하여 기술 분야별 분포를 파악합니다."""
-    import re
-    
-    # IPC 코드 분리 및 정규화
-    ipc_sections = []
-    for ipc in df['ipcNumber'].fillna('').str.split('|'):
-        sections = [code.strip()[:4] for code in ipc if code.strip()]
-        ipc_sections.extend(sections)
-    
-    ipc_counts = pd.Series(ipc_sections).value_counts()
-    
-    # IPC 코드 설명 매핑
-    ipc_descriptions = {
-        'A': '생활필수품',
-        'B': '처리조작/운수',
-        'C': '화학/야금',
-        'D': '섬유/지류',
-        'E': '고정구조물',
-        'F': '기계공학',
-        'G': '물리학',
-        'H': '전기',
-    }
-    
+    """IPC 코드를 분석하여 기술 분야별 분포를 파악합니다. (patent_stats.ipc_distribution 서브클래스 분포)"""
+    dist = ipc_distribution(df, levels=("subclass",))["subclass"]
+    codes = dist['subclass'].astype(str)
+
     return pd.DataFrame({
-        'ipc': ipc_counts.index,
-        'count': ipc_counts.values,
-        'description': [f"{code[0]}: {ipc_descriptions.get(code[0], '기타')}" for code in ipc_counts.index],
-        'section': [code[0] for code in ipc_counts.index]
+        'ipc': codes,
+        'count': dist['count'].to_numpy(),
+        'description': ipc_section_label(codes),
+        'section': codes.str[0]
     })
 def calculate_avg_registration_period(df: pd.DataFrame) -> float:
-    """출원일자와 등록일자 간의 평균 기간(개월 단위)을 계산합니다."""
-    # 날짜 형식이 올바르지 않을 수 있으므로 안전하게 변환
-    df['applicationDate'] = pd.to_datetime(df['applicationDate'], errors='coerce')
-    df['registerDate'] = pd.to_datetime(df['registerDate'], errors='coerce')
-    
-    # 등록일자가 있는 데이터만 필터링
-    valid_df = df.dropna(subset=['applicationDate', 'registerDate'])
-    
-    if valid_df.empty:
+    """출원일자와 등록일자 간의 평균 기간(개월 단위)을 계산합니다. (입력 프레임은 수정하지 않음)"""
+    days, registered = registration_lags(df['applicationDate'], df['registerDate'])
+    if not registered.any():
         return 0.0  # 유효한 데이터가 없으면 0 반환
-    
-    # 기간 계산 (일 단위)
-    days_diff = (valid_df['registerDate'] - valid_df['applicationDate']).dt.days  # 수정: dt(days) -> dt.days
-    
-    # 평균 계산 후 월 단위로 변환 (1개월 ≈ 30.44일)
-    avg_days = days_diff.mean()
-    avg_months = avg_days / 30.44
-    
-    return avg_months
+    return float(days[registered].mean() / DAYS_PER_MONTH)
+
+@fingerprint_cache()
+def analyze_registration_lag(df: pd.DataFrame, as_of) -> RegistrationLag:
+    """
+    출원인 · IPC 메인그룹별 출원 → 등록 소요 기간 (중앙값 · P90 · Kaplan–Meier 중앙값)
+    as_of(기준 날짜)가 캐시 키에 들어가므로 날짜가 바뀌면 심사 중 특허의 경과 기간을 다시 계산합니다.
+    """
+    return RegistrationLag.from_table(
+        df, by=('applicantName',), as_of=datetime.combine(as_of, datetime.min.time()), min_patents=3
+    )
 def create_ipc_visualization(ipc_analysis: pd.DataFrame) -> go.Figure:
     """IPC 분석 결과를 시각화합니다."""
     fig = go.Figure()
@@ -391,61 +487,90 @@ def create_ipc_visualization(ipc_analysis: pd.DataFrame) -> go.Figure:
     
     return fig
 
-def analyze_technology_maturity(df: pd.DataFrame) -> dict:
-    """기술 성숙도를 분석합니다."""
+@fingerprint_cache()
+def analyze_technology_maturity(df: pd.DataFrame, as_of) -> dict:
+    """
+    기술 성숙도를 분석합니다.
+    IPC 메인그룹 · 기술 카테고리별 누적 출원에 로지스틱 S-커브를 일괄 적합해
+    포화 수준 · 변곡 연도 · 성숙 단계(현재 누적 / 포화 수준)를 구합니다.
+    S-커브는 as_of 의 전년도(마지막 완결 연도)까지만 적합합니다.
+    """
     # 연도별 특허 출원 증가율
     yearly_counts = df.groupby('year').size()
     growth_rates = yearly_counts.pct_change()
-    
-    maturity_scores = {
-        year: {
-            'growth_rate': rate,
-            'patent_count': count,
-            'maturity_stage': 'emerging' if rate > 0.2 else 'mature' if rate > 0 else 'declining'
-        }
-        for year, rate, count in zip(growth_rates.index, growth_rates.values, yearly_counts.values)
+
+    # IPC 메인그룹 (한 특허의 같은 그룹은 1건) · 기술 카테고리
+    ipc = explode_ipc(df).drop_duplicates(['row', 'group'])
+    tech = df['tech'].reset_index(drop=True) if 'tech' in df.columns else pd.Series([
+        default_taxonomy().classify_tech(title or '', abstract or '')
+        for title, abstract in zip(df['inventionTitle'], df['astrtCont'])
+    ])
+    curves, years, cumulative = s_curve_table({
+        'IPC 메인그룹': (ipc['group'], pd.Series(df['year'].to_numpy()[ipc['row'].to_numpy()])),
+        '기술 카테고리': (tech.where(tech != OTHER_LABEL), pd.Series(df['year'].to_numpy())),
+    }, last_year=as_of.year - 1)
+
+    return {
+        'yearly': {
+            year: {'growth_rate': rate, 'patent_count': count}
+            for year, rate, count in zip(growth_rates.index, growth_rates.values, yearly_counts.values)
+        },
+        'curves': curves,
+        'years': years,
+        'cumulative': cumulative,
     }
-    
-    return maturity_scores
-
-def create_maturity_visualization(maturity_data: dict) -> go.Figure:
-    """기술 성숙도 분석 결과를 시각화합니다."""
-    years = list(maturity_data.keys())
-    growth_rates = [data['growth_rate'] for data in maturity_data.values()]
-    counts = [data['patent_count'] for data in maturity_data.values()]
-    stages = [data['maturity_stage'] for data in maturity_data.values()]
-    
+
+def create_maturity_visualization(maturity_data: dict, top_n: int = 6) -> go.Figure:
+    """기술 성숙도 분석 결과를 시각화합니다. (좌: 상위 계열 S-커브, 우: 변곡 연도 × 성숙도 지도)"""
+    curves = maturity_data['curves']
+    years = maturity_data['years']
+    cumulative = maturity_data['cumulative']
+
     # 성숙도 단계별 색상 매핑
     stage_colors = {
         'emerging': '#4CAF50',
+        'growth': '#2196F3',
         'mature': '#FFC107',
-        'declining': '#F44336'
+        'saturated': '#F44336'
     }
-    
-    fig = go.Figure()
-    
-    # 특허 수 선 그래프
-    fig.add_trace(go.Scatter(
-        x=years,
-        y=counts,
-        name='특허 수',
-        yaxis='y1',
-        line=dict(color='#2196F3', width=2)
-    ))
-    
-    # 성장률 막대 그래프
-    fig.add_trace(go.Bar(
-        x=years,
-        y=growth_rates,
-        name='성장률',
-        yaxis='y2',
-        marker_color=[stage_colors[stage] for stage in stages]
-    ))
-    
+
+    fig = make_subplots(rows=1, cols=2, column_widths=[0.55, 0.45],
+                        subplot_titles=("누적 출원 S-커브 (상위 계열)", "성숙도 지도"))
+
+    # 특허 수 상위 계열: 관측 누적(점) + 적합 곡선(선)
+    top = curves.sort_values('patents', ascending=False).head(top_n)
+    t = np.linspace(years[0], years[-1] + 5, 100) if len(years) else np.array([])
+    for idx, (i, row) in enumerate(top.iterrows()):
+        color = COLORS["graph"][idx % len(COLORS["graph"])]
+        fig.add_trace(go.Scatter(
+            x=years, y=cumulative[i], mode='markers', name=row['series'],
+            legendgroup=row['series'], marker=dict(color=color, size=6)
+        ), row=1, col=1)
+        fig.add_trace(go.Scatter(
+            x=t, y=logistic(t, row['saturation'], row['rate'], row['inflection']), mode='lines',
+            legendgroup=row['series'], showlegend=False, line=dict(color=color, dash='dot')
+        ), row=1, col=1)
+
+    # 전 계열: x=변곡 연도, y=현재 누적 / 포화 수준, 크기=특허 수
+    for stage, color in stage_colors.items():
+        part = curves[curves['stage'] == stage]
+        if part.empty:
+            continue
+        fig.add_trace(go.Scatter(
+            x=part['inflection'], y=part['fraction'], mode='markers', name=stage,
+            marker=dict(color=color, size=np.clip(np.sqrt(part['patents']) * 3, 6, 40), opacity=0.7),
+            text=part['level'] + ': ' + part['series'],
+            customdata=np.column_stack([part['patents'], part['saturation'].round(0)]),
+            hovertemplate='%{text}<br>변곡 연도: %{x:.1f}<br>성숙도: %{y:.0%}<br>'
+                          '누적: %{customdata[0]} / 포화: %{customdata[1]}<extra></extra>'
+        ), row=1, col=2)
+
+    fig.update_xaxes(title_text='연도', row=1, col=1)
+    fig.update_yaxes(title_text='누적 특허 수', row=1, col=1)
+    fig.update_xaxes(title_text='변곡 연도', row=1, col=2)
+    fig.update_yaxes(title_text='현재 누적 / 포화 수준', tickformat='.0%', range=[0, 1.05], row=1, col=2)
     fig.update_layout(
-        title='기술 성숙도 분석',
-        yaxis=dict(title='특허 수'),
-        yaxis2=dict(title='성장률', overlaying='y', side='right'),
+        title='기술 성숙도 분석 (로지스틱 S-커브)',
         showlegend=True,
         paper_bgcolor=COLORS["background"],
         plot_bgcolor=COLORS["background"],
@@ -454,71 +579,67 @@ def create_maturity_visualization(maturity_data: dict) -> go.Figure:
     
     return fig
 
-def analyze_collaboration_network(df: pd.DataFrame, column: str) -> go.Figure:
-    """출원인 또는 발명자의 협업 네트워크를 분석합니다."""
-    from itertools import combinations
-    import networkx as nx
-    
-    # 협업 관계 추출
-    collaborations = {}
-    for _, group in df.groupby('applicationNumber'):
-        names = group[column].unique()
-        if len(names) > 1:
-            for name1, name2 in combinations(names, 2):
-                key = tuple(sorted([name1, name2]))
-                collaborations[key] = collaborations.get(key, 0) + 1
-    
-    # 네트워크 그래프 생성
-    G = nx.Graph()
-    for (name1, name2), weight in collaborations.items():
-        G.add_edge(name1, name2, weight=weight)
-    
+def network_layout(net: CollaborationNetwork, slot: str, label: str, key: str) -> Optional[np.ndarray]:
+    """
+    배치 캐시(그래프 지문) 조회 → 없으면 작업 풀에서 계산. 최근 배치에 있던 노드 좌표로 이어서
+    계산하므로 재검색 · 가지치기 조정 때 노드가 제자리 근처에 머문다. 계산 중이면 None.
+    """
+    cache = shared_layout_cache()
+    fp    = net.fingerprint
+    pos   = cache.get(fp)
+    if pos is not None:
+        cancel_job(slot)
+        return pos
+    job = ensure_job(
+        slot, fp, label,
+        spring_positions, len(net), net.src, net.dst, net.weight, cache.seed_positions(net.names),
+        kind="cpu",
+    )
+    pos = poll_job(job, key=key)
+    if pos is not None:
+        cache.put(fp, net.names, pos)
+    return pos
+
+
+def create_collaboration_figure(net: CollaborationNetwork, column: str, pos: np.ndarray) -> go.Figure:
+    """협업 네트워크 + 미리 계산한 노드 배치(작업 풀 결과)로 Figure 를 만듭니다."""
     # 협업 관계가 없으면 빈 Figure 반환
-    if not G.nodes():
+    if not len(net):
         st.warning(f"{column}에 대한 협업 관계가 없습니다.")
         return go.Figure()
-    
-    # 노드 크기 계산 (특허 수 기반)
-    node_sizes = {name: len(df[df[column] == name]) for name in G.nodes()}
-    
-    # 노드 위치 계산
-    pos = nx.spring_layout(G)
-    
-    # 시각화 생성
-    edge_trace = go.Scatter(
-        x=[], y=[],
+
+    # 선분 · 노드 좌표는 배열로 한 번에 (노드가 수천 개여도 trace 2개)
+    edge_x, edge_y = net.edge_segments(pos)
+    counts = net.counts
+    labels = np.array(net.names, dtype=object)
+    # 이름 표시는 특허 수 상위 노드만 — 나머지는 마우스를 올리면 표시
+    shown  = np.zeros(len(net), dtype=bool)
+    shown[np.argsort(-counts, kind="stable")[:NETWORK_LABEL_TOP]] = True
+    hover  = [f"{n}<br>특허 수: {c}" for n, c in zip(net.names, counts)]
+
+    edge_trace = go.Scattergl(
+        x=edge_x, y=edge_y,
         line=dict(width=0.5, color='#888'),
         hoverinfo='none',
         mode='lines'
     )
 
-    node_trace = go.Scatter(
-        x=[], y=[],
+    node_trace = go.Scattergl(
+        x=pos[:, 0], y=pos[:, 1],
         mode='markers+text',
         hoverinfo='text',
+        hovertext=hover,
         marker=dict(
             showscale=True,
             colorscale='YlOrRd',
-            size=[node_sizes[node] * 2 for node in G.nodes()],
-            color=[len(G[node]) for node in G.nodes()],
+            size=np.clip(counts * 2, 4, NETWORK_MAX_NODE_SIZE),
+            color=net.degree,
             line=dict(width=2)
         ),
-        text=[f"{node}\n(특허 수: {node_sizes[node]})" for node in G.nodes()],
+        text=np.where(shown, labels, ""),
         textposition='top center'
     )
 
-    # 엣지와 노드 데이터 추가
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_trace['x'] += (x0, x1, None)
-        edge_trace['y'] += (y0, y1, None)
-
-    for node in G.nodes():
-        x, y = pos[node]
-        node_trace['x'] += (x,)
-        node_trace['y'] += (y,)
-
     # 최종 시각화
     fig = go.Figure(
         data=[edge_trace, node_trace],
@@ -536,12 +657,12 @@ def analyze_collaboration_network(df: pd.DataFrame, column: str) -> go.Figure:
     )
     
     return fig  # 명시적 반환 추가
-@st.cache_data
+@fingerprint_cache()
 def analyze_patent_trends(df: pd.DataFrame) -> dict:
-    """특허 데이터의 트렌드를 분석합니다."""
+    """특허 데이터의 트렌드를 분석합니다. (입력 프레임은 수정하지 않음)"""
     # 연도별 출원 동향
-    df["year"] = pd.to_datetime(df["applicationDate"]).dt.year
-    yearly_patents = df.groupby("year").size().reset_index(name="count")
+    year = pd.to_datetime(df["applicationDate"], errors="coerce").dt.year.rename("year")
+    yearly_patents = df.groupby(year).size().reset_index(name="count")
 
     # 출원인별 특허 수
     applicant_patents = df["applicantName"].value_counts().reset_index()
@@ -561,25 +682,28 @@ def analyze_patent_trends(df: pd.DataFrame) -> dict:
         "inventor_trend": inventor_patents,
         "status_counts": status_counts
     }
-def filter_patents(df, status_filter, year_range, applicant_filter):
-    """특허 데이터를 필터링합니다."""
-    filtered_df = df.copy()
-    
-    # 등록상태 필터
-    if status_filter:
-        filtered_df = filtered_df[filtered_df['registerStatus'].isin(status_filter)]
-    
-    # 연도 범위 필터
-    filtered_df = filtered_df[
-        (filtered_df['year'] >= year_range[0]) & 
-        (filtered_df['year'] <= year_range[1])
-    ]
-    
-    # 출원인 필터
-    if applicant_filter:
-        filtered_df = filtered_df[filtered_df['applicantName'].isin(applicant_filter)]
-    
-    return filtered_df
+def filter_patents(df, status_filter, year_range, applicant_filter, keyword_mask=None,
+                   index: Optional[FilterIndex] = None, tech_filter=None, ipc_filter=None):
+    """
+    특허 데이터를 필터링합니다. (keyword_mask: 문서-단어 행렬에서 얻은 행 마스크)
+    조건은 필터 인덱스의 비트맵 AND 로 결합 — 걸러지는 조건이 없으면 df 를 복사 없이 그대로 반환합니다.
+    """
+    index = index if index is not None else FilterIndex.from_frame(
+        df, [c for c in FILTER_COLUMNS if c in df.columns]
+    )
+    filters = {
+        'registerStatus': status_filter or None,
+        'applicantName': applicant_filter or None,
+        'tech': tech_filter or None,
+        'ipc': ipc_filter or None,
+    }
+    rows = index.select(
+        {name: selected for name, selected in filters.items() if name in index.columns},
+        {'year': tuple(year_range)},
+        keyword_mask,
+    )
+    return df if rows is None else df.iloc[rows]
+
 def create_visualizations(analysis_data: dict) -> dict:
     """분석 데이터를 시각화합니다."""
     # 연도별 트렌드 그래프
@@ -672,141 +796,253 @@ def main():
         st.header("검색 설정")
         search_type = st.selectbox("검색 유형", ["키워드", "대표발명자"])
         search_query = st.text_input(f"{search_type}를 입력하세요")
-        min_results = st.number_input("검색할 특허 수", min_value=25, max_value=50, value=50)
+        large_mode = st.checkbox("대량 검색 모드", value=False,
+                                 help="수천 건을 동시 페이지 요청으로 수집 — 차트는 집계로, Gemini 는 집계 요약 + 대표 표본으로 분석")
+        if large_mode:
+            min_results = st.number_input("최대 수집 특허 수", min_value=100, max_value=LARGE_MAX_RESULTS,
+                                          value=LARGE_DEFAULT_RESULTS, step=500)
+        else:
+            min_results = st.number_input("검색할 특허 수", min_value=25, max_value=50, value=50)
         advanced_analysis = st.checkbox("심층 분석 활성화", value=True)
+        network_nodes = st.slider("협업 네트워크 최대 노드 수", 50, 3000, NETWORK_DEFAULT_NODES, 50,
+                                  help="연결 강도 상위 노드만 표시 — 밀집 네트워크의 배치 시간 · 렌더링 부담 감소")
+        network_min_weight = st.number_input("협업 최소 공동 출원 수", min_value=1, max_value=50, value=1)
 
     if st.sidebar.button("검색 및 분석") and search_query:
         client = KiprisAPI(KIPRIS_API_KEY)
 
-        with st.spinner(f"특허 검색 및 분석 중... (최소 {min_results}개 결과)"):
-            patents = client.search_patents(search_type, search_query, min_results)
-
-            if not patents:
-                st.warning("검색 결과가 없습니다.")
-                return  # 검색 결과가 없으면 종료
-            elif len(patents) < min_results:
-                st.warning(f"요청하신 {min_results}개보다 적은 {len(patents)}개의 결과만 찾았습니다.")
-
-            df = pd.DataFrame(patents)  # df 정의
-
-            # 기본 분석 및 시각화
-            analysis_data = analyze_patent_trends(df)
-            visuals = create_visualizations(analysis_data)
-
-            # 심층 분석
-            if advanced_analysis:
-                df['year'] = pd.to_datetime(df['applicationDate']).dt.year
-                yearly_keywords = analyze_yearly_keywords(df)
-                keyword_trend_fig = create_keyword_trend_visualization(yearly_keywords)
-                ipc_analysis = analyze_ipc_codes(df)
-                ipc_fig = create_ipc_visualization(ipc_analysis)
-                maturity_analysis = analyze_technology_maturity(df)
-                maturity_fig = create_maturity_visualization(maturity_analysis)
-
-            ai_analysis = analyze_patents_with_gemini(patents, GEMINI_API_KEY)
-
-            # 결과 표시
-            st.header("특허 분석 결과")
-            st.write(f"총 {len(patents)}개의 특허를 분석했습니다.")
-
-            tab1, tab2, tab3, tab4 = st.tabs(["기본 통계", "심층 분석", "AI 분석 리포트", "데이터 테이블"])
-
-            with tab1:
-                st.subheader("기본 특허 통계")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.plotly_chart(visuals["yearly_trend"], use_container_width=True)
-                    st.plotly_chart(visuals["applicant_trend"], use_container_width=True)
-                with col2:
-                    st.plotly_chart(visuals["inventor_trend"], use_container_width=True)
-                    st.plotly_chart(visuals["status_trend"], use_container_width=True)
-
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("총 출원인 수", len(df['applicantName'].unique()))
-                with col2:
-                    st.metric("총 발명자 수", len(df['inventorName'].unique()))
-                with col3:
-                    st.metric("등록 특허 비율", f"{(df['registerStatus'] == '등록').mean():.1%}")
-                with col4:
-                    st.metric("평균 출원-등록 기간", f"{calculate_avg_registration_period(df):.1f}개월")
-
-            with tab2:
-                if advanced_analysis:
-                    st.subheader("연도별 키워드 트렌드")
-                    st.plotly_chart(keyword_trend_fig, use_container_width=True, key='keyword_trend')
-                    st.subheader("기술 분야 (IPC) 분석")
-                    st.plotly_chart(ipc_fig, use_container_width=True, key='ipc_analysis')
-                    st.subheader("기술 성숙도 분석")
-                    st.plotly_chart(maturity_fig, use_container_width=True, key='maturity_analysis')
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.subheader("출원인 협업 네트워크")
-                        collaboration_network = analyze_collaboration_network(df, 'applicantName')
-                        st.plotly_chart(collaboration_network, use_container_width=True, key='applicant_network')
-                    with col2:
-                        st.subheader("발명자 협업 네트워크")
-                        inventor_network = analyze_collaboration_network(df, 'inventorName')
-                        st.plotly_chart(inventor_network, use_container_width=True, key='inventor_network')
-
-            with tab3:
-                st.subheader("AI 분석 리포트")
+        if large_mode:
+            progress = st.progress(0.0, text="대량 검색 중...")
+            patents = client.search_patents_large(
+                search_type, search_query, min_results,
+                on_page=lambda n, total: progress.progress(
+                    min(n / max(total, 1), 1.0), text=f"대량 검색 중... {n:,} / {total:,}건"
+                ),
+            )
+            progress.empty()
+        else:
+            with st.spinner(f"특허 검색 중... (최소 {min_results}개 결과)"):
+                patents = client.search_patents(search_type, search_query, min_results)
+
+        if len(patents) == 0:
+            st.warning("검색 결과가 없습니다.")
+            return  # 검색 결과가 없으면 종료
+        elif len(patents) < min_results:
+            st.warning(f"요청하신 {min_results}개보다 적은 {len(patents)}개의 결과만 찾았습니다.")
+
+        # 검색 결과는 세션에 보관 — 작업 풀 결과 · 필터 조작으로 재실행돼도 화면 유지
+        # (대량 검색은 조각 단위로 만든 DataFrame, 일반 검색은 레코드 목록)
+        st.session_state["patents"]      = patents
+        st.session_state["search_query"] = search_query
+        st.session_state["search_id"]    = st.session_state.get("search_id", 0) + 1
+
+    patents = st.session_state.get("patents")
+    if patents is None or len(patents) == 0:
+        return
+    search_query = st.session_state["search_query"]
+    search_id    = st.session_state["search_id"]
+
+    frame = patent_frame(patents, search_id)
+    df = frame.df  # df 정의
+
+    # 기본 분석 및 시각화
+    analysis_data = analyze_patent_trends(frame)
+    visuals = create_visualizations(analysis_data)
+    text_matrix = patent_text_matrix(df, search_id)
+    filter_index = patent_filter_index(df, search_id)
+
+    # 심층 분석
+    if advanced_analysis:
+        yearly_keywords = analyze_yearly_keywords(df, text_matrix)
+        trend_keywords = {k for year_data in yearly_keywords.values() for k in year_data['keywords'][:5]}
+        keyword_trend_fig = create_keyword_trend_visualization(
+            yearly_keywords, keyword_year_counts(df, text_matrix, trend_keywords)
+        )
+        ipc_analysis = analyze_ipc_codes(frame)
+        ipc_fig = create_ipc_visualization(ipc_analysis)
+        maturity_analysis = analyze_technology_maturity(frame, datetime.now().date())
+        maturity_fig = create_maturity_visualization(maturity_analysis)
+    else:
+        for column in ("applicantName", "inventorName"):
+            cancel_job(f"layout_{column}")
+
+    # 무거운 작업은 작업 풀로 — 새 검색이면 이전 작업은 취소되고 다시 제출
+    # 결과가 많으면 원문은 대표 표본만, 전체 경향은 집계 요약으로 전달
+    overview = portfolio_overview(frame) if len(df) > GEMINI_SAMPLE else ""
+    ai_job = ensure_job(
+        "gemini_job", search_id, "Gemini 분석",
+        gemini_report, gemini_sample(df), GEMINI_API_KEY, overview, kind="io",
+    )
+
+    # 결과 표시
+    st.header("특허 분석 결과")
+    st.write(f"총 {len(patents)}개의 특허를 분석했습니다.")
+
+    tab1, tab2, tab3, tab4 = st.tabs(["기본 통계", "심층 분석", "AI 분석 리포트", "데이터 테이블"])
+
+    with tab1:
+        st.subheader("기본 특허 통계")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(visuals["yearly_trend"], use_container_width=True)
+            st.plotly_chart(visuals["applicant_trend"], use_container_width=True)
+        with col2:
+            st.plotly_chart(visuals["inventor_trend"], use_container_width=True)
+            st.plotly_chart(visuals["status_trend"], use_container_width=True)
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("총 출원인 수", len(df['applicantName'].unique()))
+        with col2:
+            st.metric("총 발명자 수", len(df['inventorName'].unique()))
+        with col3:
+            st.metric("등록 특허 비율", f"{(df['registerStatus'] == '등록').mean():.1%}")
+        with col4:
+            st.metric("평균 출원-등록 기간", f"{calculate_avg_registration_period(df):.1f}개월")
+
+        with st.expander("출원인 · IPC 별 출원 → 등록 소요 기간"):
+            lag = analyze_registration_lag(frame, datetime.now().date())
+            lag_columns = {
+                "patents": "특허 수", "registered": "등록", "pending": "심사 중",
+                "median_months": "중앙값(개월)", "p90_months": "P90(개월)", "km_median_months": "KM 중앙값(개월)",
+            }
+            st.caption(f"기준일 {lag.as_of} · KM 중앙값은 심사 중 특허를 중도 절단으로 반영한 Kaplan–Meier 추정")
+            st.dataframe(lag.summaries['applicantName'].rename(columns={'applicantName': '출원인', **lag_columns}).round(1),
+                         hide_index=True)
+            st.dataframe(lag.summaries['ipc'].rename(columns={'ipc': 'IPC 메인그룹', **lag_columns}).round(1),
+                         hide_index=True)
+
+    with tab2:
+        if advanced_analysis:
+            st.subheader("연도별 키워드 트렌드")
+            st.plotly_chart(keyword_trend_fig, use_container_width=True, key='keyword_trend')
+            st.subheader("기술 분야 (IPC) 분석")
+            st.plotly_chart(ipc_fig, use_container_width=True, key='ipc_analysis')
+            st.subheader("기술 성숙도 분석")
+            st.plotly_chart(maturity_fig, use_container_width=True, key='maturity_analysis')
+            st.dataframe(
+                maturity_analysis['curves'].sort_values('patents', ascending=False).round(
+                    {'saturation': 0, 'inflection': 1, 'rate': 2, 'r2': 3, 'fraction': 2}),
+                column_config={
+                    "level": "구분", "series": "계열", "patents": "누적 특허", "saturation": "포화 수준",
+                    "inflection": "변곡 연도", "rate": "성장률(r)", "r2": "R²", "capped": "포화 상한",
+                    "fraction": "성숙도", "stage": "단계"
+                },
+                hide_index=True, use_container_width=True
+            )
+            col1, col2 = st.columns(2)
+            for col, column, title, key in (
+                (col1, 'applicantName', "출원인", 'applicant_network'),
+                (col2, 'inventorName',  "발명자", 'inventor_network'),
+            ):
+                with col:
+                    st.subheader(f"{title} 협업 네트워크")
+                    net = patent_network(df, column, search_id, network_nodes, network_min_weight)
+                    pos = network_layout(net, f"layout_{column}", f"{title} 네트워크 배치", key)
+                    if pos is not None:
+                        fig = create_collaboration_figure(net, column, pos)
+                        st.plotly_chart(fig, use_container_width=True, key=key)
+
+    with tab3:
+        st.subheader("AI 분석 리포트")
+        try:
+            ai_analysis = poll_job(ai_job, key="gemini")
+        except Exception as e:
+            st.error(f"Gemini API 분석 중 오류 발생: {str(e)}")
+        else:
+            if ai_analysis is not None:
                 st.write(ai_analysis)
 
-            with tab4:
-                st.subheader("특허 데이터")
-                # 데이터 필터링 옵션
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    status_filter = st.multiselect(
-                        "등록상태 필터",
-                        options=df['registerStatus'].unique()
-                    )
-                with col2:
-                    year_range = st.slider(
-                        "출원연도 범위",
-                        min_value=int(df['year'].min()),
-                        max_value=int(df['year'].max()),
-                        value=(int(df['year'].min()), int(df['year'].max()))
-                    )
-                with col3:
-                    applicant_filter = st.multiselect(
-                        "출원인 필터",
-                        options=df['applicantName'].unique()
-                    )
-
-                # 필터 적용
-                filtered_df = filter_patents(df, status_filter, year_range, applicant_filter)
-                
-                # 데이터프레임 표시
-                st.dataframe(
-                    filtered_df,
-                    column_config={
-                        "applicationNumber": "출원번호",
-                        "inventionTitle": "발명의 명칭",
-                        "applicationDate": "출원일자",
-                        "applicantName": "출원인",
-                        "inventorName": "발명자",
-                        "astrtCont": "요약",
-                        "openDate": "공개일자",
-                        "openNumber": "공개번호",
-                        "publicationDate": "공고일자",
-                        "publicationNumber": "공고번호",
-                        "registerDate": "등록일자",
-                        "registerNumber": "등록번호",
-                        "registerStatus": "등록상태"
-                    },
-                    hide_index=True
-                )
-
-                # CSV 다운로드
-                csv = filtered_df.to_csv(index=False).encode('utf-8-sig')
-                st.download_button(
-                    label="CSV 다운로드",
-                    data=csv,
-                    file_name=f"patent_analysis_{search_query}.csv",
-                    mime="text/csv"
-                )
+    with tab4:
+        st.subheader("특허 데이터")
+        # 데이터 필터링 옵션
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            status_filter = st.multiselect(
+                "등록상태 필터",
+                options=filter_index.values('registerStatus')
+            )
+        with col2:
+            year_range = st.slider(
+                "출원연도 범위",
+                min_value=int(df['year'].min()),
+                max_value=int(df['year'].max()),
+                value=(int(df['year'].min()), int(df['year'].max()))
+            )
+        with col3:
+            applicant_filter = st.multiselect(
+                "출원인 필터",
+                options=filter_index.values('applicantName')
+            )
+        col4, col5 = st.columns(2)
+        with col4:
+            tech_counts = filter_index.counts('tech')
+            tech_filter = st.multiselect(
+                "기술 분야 필터",
+                options=list(tech_counts),
+                format_func=lambda v: f"{v} ({tech_counts[v]:,})"
+            )
+        with col5:
+            ipc_counts = filter_index.counts('ipc')
+            ipc_filter = st.multiselect(
+                "IPC 서브클래스 필터",
+                options=list(ipc_counts),
+                format_func=lambda v: f"{v} ({ipc_counts[v]:,})"
+            )
+
+        keyword_filter = st.text_input("키워드 필터 (제목 · 요약, 공백으로 구분 — 하나라도 포함)")
+        keyword_mask = text_matrix.contains_any(tokenize(keyword_filter)) if keyword_filter.strip() else None
+
+        # 필터 적용
+        filtered_df = filter_patents(
+            df, status_filter, year_range, applicant_filter, keyword_mask,
+            index=filter_index, tech_filter=tech_filter, ipc_filter=ipc_filter
+        )
+        
+        # 데이터프레임 표시 (결과가 많으면 페이지 단위로)
+        shown_df = filtered_df
+        if len(filtered_df) > TABLE_PAGE_ROWS:
+            n_pages = (len(filtered_df) - 1) // TABLE_PAGE_ROWS + 1
+            page = st.number_input(f"페이지 (총 {len(filtered_df):,}건 · {n_pages}페이지)",
+                                   min_value=1, max_value=n_pages, value=1)
+            shown_df = table_page(filtered_df, page, TABLE_PAGE_ROWS)
+        st.dataframe(
+            shown_df,
+            column_config={
+                "applicationNumber": "출원번호",
+                "inventionTitle": "발명의 명칭",
+                "applicationDate": "출원일자",
+                "applicantName": "출원인",
+                "inventorName": "발명자",
+                "astrtCont": "요약",
+                "openDate": "공개일자",
+                "openNumber": "공개번호",
+                "publicationDate": "공고일자",
+                "publicationNumber": "공고번호",
+                "registerDate": "등록일자",
+                "registerNumber": "등록번호",
+                "registerStatus": "등록상태",
+                "tech": "기술 분야"
+            },
+            hide_index=True
+        )
+
+        # CSV 다운로드 — 대량 결과를 재실행마다 인코딩하지 않도록 버튼을 누를 때만 만들고,
+        # 같은 검색 · 필터 조건이면 준비된 파일을 재사용
+        sig = (search_id, tuple(status_filter), year_range, tuple(applicant_filter),
+               tuple(tech_filter), tuple(ipc_filter), keyword_filter.strip())
+        prepared = st.session_state.get("csv_export")
+        if prepared is None or prepared[0] != sig:
+            if st.button(f"CSV 내보내기 준비 ({len(filtered_df):,}건)"):
+                with st.spinner("파일 생성 중..."):
+                    st.session_state["csv_export"] = prepared = (sig, export_table(filtered_df, "csv"))
+        if prepared is not None and prepared[0] == sig:
+            st.download_button(
+                label="CSV 다운로드",
+                data=prepared[1],
+                file_name=f"patent_analysis_{search_query}.csv",
+                mime="text/csv"
+            )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,1063 @@
+"""
+특허 분석 엔진 (Streamlit 비의존)
+- 기업 × 기술 × IPC 인덱스로 인코딩한 코퍼스 (numpy 배열)
+- 카운트 큐브: 기업 × 기술 × IPC L1/L2/L3 × 공개월 × 기간구간 희소 집계
+- 벡터화 Spike 매트릭스: 큐브 롤업 한 번으로 전 기업 × 전 기술 계산
+- 단기 모니터링: 일/주 단위 링버퍼 카운터 + 공개일 정렬 인덱스 ("최근 48시간" 질의)
+- 컬럼형 특허 테이블 (범주형 컬럼) · 데이터 지문 — 프로세스 공용 캐시 키 / 메모리 집계용 nbytes
+- 대량 수집 결과는 FrameBuilder 로 조각 단위 DataFrame 조립
+- 필터 인덱스: 범주형 컬럼 값별 비트맵(packbits) · 행 목록 → 위젯 필터를 비트 AND 로 결합
+- 지문 캐시: 로드 시 한 번 지문을 매긴 읽기 전용 프레임(FrozenFrame) — DataFrame 입력 분석을 지문 키로 캐시
+- to_bytes / from_bytes: npz(라벨은 JSON) 직렬화 — 워커 공유 캐시 · 부팅 스냅샷용, pickle 미사용
+"""
+
+import functools
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# pandas 3 은 copy-on-write 가 기본 — 얕은 복사본이 원본과 분리된다 (2.x 는 FrozenFrame 이 깊은 복사본을 준다)
+PANDAS_COW = int(pd.__version__.split(".")[0]) >= 3
+
+OTHER_LABEL = "기타"
+
+# 신호 단계 코드 (SpikeMatrix.level 값)
+LEVEL_NORMAL   = 0
+LEVEL_EMERGING = 1
+LEVEL_SPIKE    = 2
+
+SIGNAL_LABELS = {
+    LEVEL_SPIKE:    "Strategic Spike",
+    LEVEL_EMERGING: "Emerging Signal",
+    LEVEL_NORMAL:   "Normal",
+}
+SIGNAL_COLORS = {
+    LEVEL_SPIKE:    "#00FF00",
+    LEVEL_EMERGING: "#FFA500",
+    LEVEL_NORMAL:   "#AAAAAA",
+}
+
+# 공개일 기간 구간 (최근 → 과거). 마지막 두 칸은 12개월 초과 / 날짜 없음
+PERIOD_BANDS = [1, 3, 6, 12]
+BAND_LABELS  = ["1개월", "3개월", "6개월", "12개월", "12개월+", "날짜없음"]
+
+CUBE_DIMS = ("company", "tech", "l1", "l2", "l3", "month", "band")
+
+_NAT_DAY = np.datetime64("NaT", "D")
+
+
+def _months_ago(n: int, now: Optional[datetime] = None) -> datetime:
+    """n개월 전 datetime 반환 (1개월 ≈ 30.44일)"""
+    return (now or datetime.now()) - timedelta(days=int(n * 30.44))
+
+
+def _parse_open_day(value) -> np.datetime64:
+    """openDate(YYYYMMDD…) → datetime64[D], 파싱 실패 시 NaT"""
+    try:
+        return np.datetime64(datetime.strptime(str(value)[:8], "%Y%m%d").date(), "D")
+    except Exception:
+        return _NAT_DAY
+
+
+def pack_npz(meta: Dict, **arrays: np.ndarray) -> bytes:
+    """배열 + JSON 메타 → npz 바이트 (allow_pickle 없이 읽을 수 있는 형식만)"""
+    buf = io.BytesIO()
+    np.savez(buf, meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+             **arrays)
+    return buf.getvalue()
+
+
+def unpack_npz(data: bytes) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """pack_npz 역변환 → (메타, 배열 dict)"""
+    with np.load(io.BytesIO(data), allow_pickle=False) as z:
+        arrays = {k: z[k] for k in z.files}
+    return json.loads(arrays.pop("meta").tobytes().decode("utf-8")), arrays
+
+
+def keyword_classifier(tech_keywords: Dict[str, List[str]]) -> Callable[[str, str], str]:
+    """
+    TECH_KEYWORDS 형식 dict → (title, abstract) 분류 함수.
+    키워드 소문자화를 미리 해 두고, dict 순서상 첫 매칭 카테고리(없으면 '기타')를 반환.
+    """
+    table = [(cat, [kw.lower() for kw in kws]) for cat, kws in tech_keywords.items()]
+
+    def classify(title: str, abstract: str) -> str:
+        text = (title + " " + abstract).lower()
+        for cat, kws in table:
+            for kw in kws:
+                if kw in text:
+                    return cat
+        return OTHER_LABEL
+
+    return classify
+
+
+# ─────────────────────────────────────────────
+# 인코딩 코퍼스
+# ─────────────────────────────────────────────
+class PatentCorpus:
+    """
+    기업별 특허 리스트를 정수 인덱스 배열로 인코딩한 코퍼스.
+    특허 1건 = 배열 1행 (company_idx, tech_idx, l1/l2/l3_idx, open_day).
+    labels[dim] 이 각 인덱스의 라벨 목록.
+    """
+
+    def __init__(
+        self,
+        companies: List[str],
+        techs: List[str],
+        company_idx: np.ndarray,
+        tech_idx: np.ndarray,
+        open_day: np.ndarray,
+        ipc_labels: Optional[Dict[str, List[str]]] = None,
+        ipc_idx: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        self.companies   = companies
+        self.techs       = techs
+        self.company_idx = company_idx
+        self.tech_idx    = tech_idx
+        self.open_day    = open_day
+
+        n = len(company_idx)
+        self.ipc_labels = ipc_labels or {k: [OTHER_LABEL] for k in ("l1", "l2", "l3")}
+        self.ipc_idx    = ipc_idx or {
+            k: np.zeros(n, dtype=np.int32) for k in ("l1", "l2", "l3")
+        }
+
+    def __len__(self) -> int:
+        return len(self.company_idx)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.company_idx, self.tech_idx, self.open_day, *self.ipc_idx.values()]
+        return int(sum(a.nbytes for a in arrays))
+
+    def to_bytes(self) -> bytes:
+        """npz 직렬화 (라벨은 JSON) — 프로세스 간 공유 캐시 저장용, pickle 미사용"""
+        return pack_npz(
+            {"companies": self.companies, "techs": self.techs, "ipc_labels": self.ipc_labels},
+            company_idx=self.company_idx,
+            tech_idx=self.tech_idx,
+            open_day=self.open_day,
+            **{f"ipc_{k}": v for k, v in self.ipc_idx.items()},
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PatentCorpus":
+        meta, z = unpack_npz(data)
+        return cls(
+            meta["companies"], meta["techs"],
+            z["company_idx"], z["tech_idx"], z["open_day"],
+            meta["ipc_labels"],
+            {k: z[f"ipc_{k}"] for k in ("l1", "l2", "l3")},
+        )
+
+    @classmethod
+    def from_patents(
+        cls,
+        all_patents: Dict[str, List[Dict]],
+        classify_tech: Callable[[str, str], str],
+        tech_categories: List[str],
+        classify_ipc: Optional[Callable[[str], Tuple[str, str, str]]] = None,
+    ) -> "PatentCorpus":
+        """
+        all_patents     : 기업명 → 특허 리스트
+        classify_tech   : (title, abstract) → 기술 카테고리
+        tech_categories : 카테고리 순서 (분류 결과가 목록에 없으면 '기타')
+        classify_ipc    : ipcNumber → (level1, level2, level3), 생략 시 전부 '기타'
+        """
+        companies = list(all_patents.keys())
+        techs     = list(tech_categories)
+        if OTHER_LABEL not in techs:
+            techs.append(OTHER_LABEL)
+        tech_pos  = {t: i for i, t in enumerate(techs)}
+        other_idx = tech_pos[OTHER_LABEL]
+
+        n = sum(len(v) for v in all_patents.values())
+        company_idx = np.empty(n, dtype=np.int32)
+        tech_idx    = np.empty(n, dtype=np.int32)
+        open_day    = np.empty(n, dtype="datetime64[D]")
+        ipc_vocab: Dict[str, Dict[str, int]] = {"l1": {}, "l2": {}, "l3": {}}
+        ipc_idx = {k: np.zeros(n, dtype=np.int32) for k in ipc_vocab}
+
+        row = 0
+        for ci, patents in enumerate(all_patents.values()):
+            for p in patents:
+                cat = classify_tech(p.get("inventionTitle") or "", p.get("abstract") or "")
+                company_idx[row] = ci
+                tech_idx[row]    = tech_pos.get(cat, other_idx)
+                open_day[row]    = _parse_open_day(p.get("openDate"))
+                if classify_ipc is not None:
+                    for key, label in zip(("l1", "l2", "l3"), classify_ipc(p.get("ipcNumber") or "")):
+                        vocab = ipc_vocab[key]
+                        ipc_idx[key][row] = vocab.setdefault(label, len(vocab))
+                row += 1
+
+        ipc_labels = {k: list(v) or [OTHER_LABEL] for k, v in ipc_vocab.items()}
+        return cls(companies, techs, company_idx, tech_idx, open_day, ipc_labels, ipc_idx)
+
+
+# ─────────────────────────────────────────────
+# 카운트 큐브
+# ─────────────────────────────────────────────
+class CountCube:
+    """
+    기업 × 기술 × IPC L1 × L2 × L3 × 공개월 × 기간구간 희소(COO) 카운트 큐브.
+    0이 아닌 셀만 coords(nnz × 7) / counts(nnz) 로 저장하므로
+    모든 롤업은 nnz 크기 배열 위의 bincount 한 번이다.
+    first_day: 가장 이른 공개일 — 첫 공개월이 1일부터 담겼는지(부분 수집 여부) 판단용 (모르면 None).
+    """
+
+    def __init__(
+        self,
+        labels: Dict[str, List[str]],
+        coords: np.ndarray,
+        counts: np.ndarray,
+        now: datetime,
+        first_day: Optional[np.datetime64] = None,
+    ):
+        self.labels    = labels
+        self.coords    = coords
+        self.counts    = counts
+        self.now       = now
+        self.first_day = first_day
+        self.shape  = tuple(len(labels[d]) for d in CUBE_DIMS)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.coords.nbytes + self.counts.nbytes)
+
+    def to_bytes(self) -> bytes:
+        return pack_npz(
+            {"labels": self.labels, "now": self.now.isoformat(),
+             "first_day": None if self.first_day is None else str(self.first_day)},
+            coords=self.coords, counts=self.counts,
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CountCube":
+        meta, z = unpack_npz(data)
+        first = meta.get("first_day")
+        return cls(meta["labels"], z["coords"], z["counts"], datetime.fromisoformat(meta["now"]),
+                   None if first is None else np.datetime64(first, "D"))
+
+    @classmethod
+    def from_corpus(cls, corpus: PatentCorpus, now: Optional[datetime] = None) -> "CountCube":
+        now   = now or datetime.now()
+        valid = ~np.isnat(corpus.open_day)
+
+        # 공개월 축: 최소 ~ 최대 공개월 연속 구간 + 마지막 칸 '날짜없음'
+        month_num = np.zeros(len(corpus), dtype=np.int64)
+        month_labels: List[str] = []
+        first_day = corpus.open_day[valid].min() if valid.any() else None
+        if valid.any():
+            months = corpus.open_day[valid].astype("datetime64[M]")
+            first, last = months.min(), months.max()
+            month_labels = [str(m) for m in np.arange(first, last + 1)]
+            month_num[valid] = (months - first).astype(np.int64)
+        month_num[~valid] = len(month_labels)
+        month_labels.append("")
+
+        # 기간구간 축: 1/3/6/12개월 컷오프 기준 (기존 _months_ago 규칙과 동일)
+        od   = corpus.open_day.astype("datetime64[s]")
+        band = np.full(len(corpus), len(PERIOD_BANDS), dtype=np.int64)
+        for i in reversed(range(len(PERIOD_BANDS))):
+            band[valid & (od >= np.datetime64(_months_ago(PERIOD_BANDS[i], now), "s"))] = i
+        band[~valid] = len(PERIOD_BANDS) + 1
+
+        labels = {
+            "company": list(corpus.companies),
+            "tech":    list(corpus.techs),
+            "l1":      list(corpus.ipc_labels["l1"]),
+            "l2":      list(corpus.ipc_labels["l2"]),
+            "l3":      list(corpus.ipc_labels["l3"]),
+            "month":   month_labels,
+            "band":    list(BAND_LABELS),
+        }
+        shape = tuple(len(labels[d]) for d in CUBE_DIMS)
+        cols  = [
+            corpus.company_idx, corpus.tech_idx,
+            corpus.ipc_idx["l1"], corpus.ipc_idx["l2"], corpus.ipc_idx["l3"],
+            month_num, band,
+        ]
+        if len(corpus):
+            flat = np.ravel_multi_index([c.astype(np.int64) for c in cols], shape)
+            keys, counts = np.unique(flat, return_counts=True)
+            coords = np.stack(np.unravel_index(keys, shape), axis=1).astype(np.int32)
+        else:
+            counts = np.zeros(0, dtype=np.int64)
+            coords = np.zeros((0, len(CUBE_DIMS)), dtype=np.int32)
+        return cls(labels, coords, counts.astype(np.int64), now, first_day)
+
+    def _mask(self, where: Optional[Dict[str, object]]) -> Optional[np.ndarray]:
+        """where = {dim: 라벨 또는 라벨 목록} → nnz 불리언 마스크"""
+        if not where:
+            return None
+        mask = np.ones(len(self.counts), dtype=bool)
+        for dim, value in where.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            idx    = [self.labels[dim].index(v) for v in values if v in self.labels[dim]]
+            mask  &= np.isin(self.coords[:, CUBE_DIMS.index(dim)], idx)
+        return mask
+
+    def rollup(self, *dims: str, where: Optional[Dict[str, object]] = None) -> np.ndarray:
+        """dims 외 축을 모두 합산한 dense 배열 (모양: dims 순서대로의 라벨 수)"""
+        axes   = [CUBE_DIMS.index(d) for d in dims]
+        shape  = tuple(self.shape[a] for a in axes)
+        coords = self.coords
+        counts = self.counts
+        mask   = self._mask(where)
+        if mask is not None:
+            coords, counts = coords[mask], counts[mask]
+        if not axes:
+            return np.array(counts.sum())
+        flat = np.ravel_multi_index([coords[:, a] for a in axes], shape)
+        size = int(np.prod(shape))
+        return np.bincount(flat, weights=counts, minlength=size).astype(np.int64).reshape(shape)
+
+    def frame(
+        self,
+        *dims: str,
+        where: Optional[Dict[str, object]] = None,
+        name: str = "count",
+    ) -> pd.DataFrame:
+        """롤업 결과를 라벨이 붙은 long-format DataFrame 으로 (0인 셀 제외)"""
+        arr = self.rollup(*dims, where=where)
+        nz  = np.nonzero(arr)
+        data = {d: np.asarray(self.labels[d], dtype=object)[ix] for d, ix in zip(dims, nz)}
+        data[name] = arr[nz]
+        return pd.DataFrame(data, columns=list(dims) + [name])
+
+    def period_counts(self, where: Optional[Dict[str, object]] = None) -> Dict[str, int]:
+        """공개일 기준 1/3/6/12개월 누적 건수 (기존 bucket_by_period 건수와 동일)"""
+        bands = self.rollup("band", where=where)[: len(PERIOD_BANDS)].cumsum()
+        return {f"{m}개월": int(c) for m, c in zip(PERIOD_BANDS, bands)}
+
+    def monthly_frame(self, where: Optional[Dict[str, object]] = None) -> pd.DataFrame:
+        """기업별 월별 공개 건수 (year_month, count, company) — 날짜 없는 특허 제외"""
+        df = self.frame("company", "month", where=where)
+        df = df[df["month"] != ""].rename(columns={"month": "year_month"})
+        return df[["year_month", "count", "company"]].reset_index(drop=True)
+
+    def ipc_tree(self, where: Optional[Dict[str, object]] = None) -> Dict:
+        """level1 → level2 → level3 → 건수 중첩 dict"""
+        tree: Dict = {}
+        for l1, l2, l3, cnt in self.frame("l1", "l2", "l3", where=where).itertuples(index=False):
+            tree.setdefault(l1, {}).setdefault(l2, {})[l3] = int(cnt)
+        return tree
+
+
+# ─────────────────────────────────────────────
+# 계층 top-k 접기 (트리맵 · 막대 차트 노드 수 상한)
+# ─────────────────────────────────────────────
+def fold_label(n: int) -> str:
+    """접힌 형제 노드 n개를 대신하는 라벨"""
+    return f"{OTHER_LABEL} ({n}개)"
+
+
+def fold_top_k(
+    df: pd.DataFrame,
+    path: Sequence[str],
+    k,
+    value: str = "count",
+) -> pd.DataFrame:
+    """
+    path 계층 long-format 집계(df)에서 부모마다 값 상위 k개 자식만 남기고 나머지는
+    '기타 (n개)' 노드 하나로 합친다. 접힌 노드는 잎(leaf)이 되며 하위 열은 None.
+    k: 정수(모든 레벨 공통) 또는 레벨별 시퀀스. 결과 노드 수 ≤ Σ Π(k_i + 1) 로 상한이 정해진다.
+    """
+    path = list(path)
+    ks   = list(k) if isinstance(k, (list, tuple)) else [k] * len(path)
+    out  = df[path + [value]].copy()
+    for c in path:
+        out[c] = out[c].astype(object)
+
+    for level, col in enumerate(path):
+        parents = path[:level]
+        live    = out[col].notna()
+        if not live.any():
+            break
+        sub = out.loc[live, parents + [col, value]]
+        tot = sub.groupby(parents + [col], sort=False, dropna=False)[value].sum().reset_index()
+        grp = tot.groupby(parents, sort=False, dropna=False)[value] if parents else tot[value]
+        tot["_rank"] = grp.rank(method="first", ascending=False)
+        tot["_fold"] = tot["_rank"] > ks[level]
+        if not tot["_fold"].any():
+            continue
+
+        # 부모별 접힌 자식 수 → 라벨
+        if parents:
+            n_fold = tot.groupby(parents, sort=False, dropna=False)["_fold"].transform("sum")
+        else:
+            n_fold = pd.Series(int(tot["_fold"].sum()), index=tot.index)
+        tot["_label"] = np.where(tot["_fold"], n_fold.map(lambda n: fold_label(int(n))), tot[col])
+
+        keyed = out.loc[live, parents + [col]].merge(
+            tot[parents + [col, "_label", "_fold"]], on=parents + [col], how="left"
+        )
+        keyed.index = out.index[live]
+        out.loc[live, col] = keyed["_label"]
+        folded = keyed.index[keyed["_fold"].to_numpy(dtype=bool)]
+        for deeper in path[level + 1:]:
+            out.loc[folded, deeper] = None
+
+    res = (
+        out.groupby(path, sort=False, dropna=False)[value].sum().reset_index()
+        .sort_values(value, ascending=False, kind="stable", ignore_index=True)
+    )
+    for c in path:                               # groupby 가 만든 NaN → None (plotly 경로 규칙)
+        res[c] = res[c].astype(object).where(res[c].notna(), None)
+    return res
+
+
+# ─────────────────────────────────────────────
+# 벡터화 Spike 매트릭스
+# ─────────────────────────────────────────────
+class SpikeMatrix:
+    """
+    기업 × 기술 Spike 지표 배열.
+    count_1m / avg_11m / ratio / level 은 모두 (기업 수, 기술 수) 모양.
+    score 가 주어지면(통계 탐지기) level 은 호출측 판정을 그대로 쓰고 정렬도 score 기준.
+    """
+
+    def __init__(
+        self,
+        companies: List[str],
+        techs: List[str],
+        count_1m: np.ndarray,
+        avg_11m: np.ndarray,
+        ratio: np.ndarray,
+        threshold_pct: float,
+        emerging_pct: float,
+        score: Optional[np.ndarray] = None,
+        level: Optional[np.ndarray] = None,
+    ):
+        self.companies     = companies
+        self.techs         = techs
+        self.count_1m      = count_1m
+        self.avg_11m       = avg_11m
+        self.ratio         = ratio
+        self.threshold_pct = threshold_pct
+        self.emerging_pct  = emerging_pct
+        self.score         = score
+
+        if level is not None:
+            self.level = level
+        else:
+            self.level = np.full(ratio.shape, LEVEL_NORMAL, dtype=np.int8)
+            self.level[ratio >= emerging_pct]  = LEVEL_EMERGING
+            self.level[ratio >= threshold_pct] = LEVEL_SPIKE
+
+    def to_bytes(self) -> bytes:
+        arrays = {"count_1m": self.count_1m, "avg_11m": self.avg_11m, "ratio": self.ratio, "level": self.level}
+        if self.score is not None:
+            arrays["score"] = self.score
+        return pack_npz(
+            {"companies": self.companies, "techs": self.techs,
+             "threshold_pct": self.threshold_pct, "emerging_pct": self.emerging_pct},
+            **arrays,
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SpikeMatrix":
+        meta, z = unpack_npz(data)
+        return cls(
+            meta["companies"], meta["techs"], z["count_1m"], z["avg_11m"], z["ratio"],
+            meta["threshold_pct"], meta["emerging_pct"], z.get("score"), z["level"],
+        )
+
+    @property
+    def active(self) -> np.ndarray:
+        """최근 1개월 공개가 1건 이상인 셀 (기존 detect_spikes 출력 대상)"""
+        return self.count_1m > 0
+
+    def spike_count(self, company: Optional[str] = None) -> int:
+        """Strategic Spike 셀 수 (company 지정 시 해당 기업만)"""
+        mask = self.active & (self.level == LEVEL_SPIKE)
+        if company is not None:
+            mask = mask[self.companies.index(company)]
+        return int(mask.sum())
+
+    def alerts(self, company: str) -> List[Dict]:
+        """
+        한 기업의 Spike 결과를 급증률 내림차순 리스트로 반환.
+        키 구성은 skills/patent_search 의 detect_spikes() 출력과 동일.
+        """
+        ci  = self.companies.index(company)
+        out = []
+        for ti in np.flatnonzero(self.active[ci]):
+            lv = int(self.level[ci, ti])
+            alert = {
+                "tech_category":   self.techs[ti],
+                "count_1m":        int(self.count_1m[ci, ti]),
+                "avg_11m":         round(float(self.avg_11m[ci, ti]), 1),
+                "spike_ratio_pct": round(float(self.ratio[ci, ti]), 1),
+                "level":           lv,
+                "signal":          SIGNAL_LABELS[lv],
+                "signal_color":    SIGNAL_COLORS[lv],
+                "blink":           lv == LEVEL_SPIKE,
+            }
+            if self.score is not None:
+                alert["score"] = round(float(self.score[ci, ti]), 2)
+            out.append(alert)
+        sort_key = "spike_ratio_pct" if self.score is None else "score"
+        out.sort(key=lambda x: x[sort_key], reverse=True)
+        return out
+
+    def heatmap_frame(self) -> pd.DataFrame:
+        """히트맵용 DataFrame (행: 기업, 열: 기술, 값: 급증률%) — 활성 셀이 있는 행/열만"""
+        act  = self.active
+        rows = np.flatnonzero(act.any(axis=1))
+        cols = np.flatnonzero(act.any(axis=0))
+        vals = np.where(act, np.round(self.ratio, 1), 0.0)[np.ix_(rows, cols)]
+        return pd.DataFrame(
+            vals,
+            index=[self.companies[i] for i in rows],
+            columns=[self.techs[j] for j in cols],
+        )
+
+
+def compute_spike_matrix(
+    cube: CountCube,
+    threshold_pct: float = 200.0,
+    emerging_pct: float = 150.0,
+) -> SpikeMatrix:
+    """
+    최근 1개월 공개 건수 vs 이전 11개월 월평균을 전 기업 × 전 기술에 대해 한 번에 계산.
+    큐브의 (기업, 기술, 기간구간) 롤업 한 번에서 1개월 구간과 1~12개월 구간을 잘라낸다.
+    '기타' 카테고리는 Spike 대상에서 제외.
+    """
+    techs = [t for t in cube.labels["tech"] if t != OTHER_LABEL]
+    keep  = [cube.labels["tech"].index(t) for t in techs]
+
+    by_band  = cube.rollup("company", "tech", "band")[:, keep, :]
+    count_1m = by_band[:, :, 0]
+    avg_11m  = by_band[:, :, 1:len(PERIOD_BANDS)].sum(axis=2) / 11.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(avg_11m > 0, count_1m / avg_11m * 100.0, 0.0)
+
+    return SpikeMatrix(
+        list(cube.labels["company"]), techs, count_1m, avg_11m, ratio,
+        threshold_pct, emerging_pct,
+    )
+
+
+# ─────────────────────────────────────────────
+# 단기 모니터링 (일/주 링버퍼 + 공개일 정렬 인덱스)
+# ─────────────────────────────────────────────
+def _epoch_day(d) -> int:
+    """date/datetime/datetime64 → 1970-01-01 기준 일수"""
+    return int(np.datetime64(d, "D").astype(np.int64))
+
+
+def _epoch_week(day: np.ndarray) -> np.ndarray:
+    """일수 → 월요일 시작 주 번호 (1970-01-01 은 목요일)"""
+    return (day + 3) // 7
+
+
+class RecentActivityIndex:
+    """
+    기업 × 기술 일/주 단위 링버퍼 카운터와 공개일 정렬 인덱스.
+    - daily[c, t, day % n_days], weekly[c, t, week % n_weeks] 에 누적
+    - 새 날짜가 들어오면 지나간 칸만 0으로 비우고 head 를 전진 (전체 재집계 없음)
+    - sorted_rows / sorted_days 로 기간 내 특허 행을 searchsorted 두 번에 반환
+    KIPRIS 공개일은 일 단위이므로 "최근 48시간" = 오늘과 어제 (days=2).
+    프로세스 공용으로 세션들이 함께 쓰므로 전진 · 누적 · 조회는 인스턴스 잠금 안에서.
+    """
+
+    def __init__(
+        self,
+        companies: List[str],
+        techs: List[str],
+        today,
+        n_days: int = 120,
+        n_weeks: int = 104,
+    ):
+        self.companies = list(companies)
+        self.techs     = list(techs)
+        self.n_days    = n_days
+        self.n_weeks   = n_weeks
+        self.head_day  = _epoch_day(today)
+        self.head_week = int(_epoch_week(np.int64(self.head_day)))
+        self.daily     = np.zeros((len(companies), len(techs), n_days), dtype=np.int32)
+        self.weekly    = np.zeros((len(companies), len(techs), n_weeks), dtype=np.int32)
+        self.sorted_days = np.zeros(0, dtype=np.int64)
+        self.sorted_rows = np.zeros(0, dtype=np.int64)
+        self._lock       = threading.RLock()
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.daily, self.weekly, self.sorted_days, self.sorted_rows]
+        return int(sum(a.nbytes for a in arrays))
+
+    @classmethod
+    def from_corpus(
+        cls,
+        corpus: PatentCorpus,
+        today=None,
+        n_days: int = 120,
+        n_weeks: int = 104,
+    ) -> "RecentActivityIndex":
+        today = today or datetime.now().date()
+        idx   = cls(corpus.companies, corpus.techs, today, n_days, n_weeks)
+        valid = ~np.isnat(corpus.open_day)
+        rows  = np.flatnonzero(valid)
+        days  = corpus.open_day[valid].astype(np.int64)
+        idx.add(corpus.company_idx[valid], corpus.tech_idx[valid], days, rows)
+        return idx
+
+    def advance(self, today) -> None:
+        """head 를 today 로 전진시키며 창 밖으로 밀려난 링버퍼 칸을 비운다"""
+        with self._lock:
+            day = _epoch_day(today)
+            if day > self.head_day:
+                gone = np.arange(self.head_day + 1, min(day, self.head_day + self.n_days) + 1)
+                self.daily[:, :, gone % self.n_days] = 0
+                self.head_day = day
+            week = int(_epoch_week(np.int64(day)))
+            if week > self.head_week:
+                gone = np.arange(self.head_week + 1, min(week, self.head_week + self.n_weeks) + 1)
+                self.weekly[:, :, gone % self.n_weeks] = 0
+                self.head_week = week
+
+    def add(
+        self,
+        company_idx: np.ndarray,
+        tech_idx: np.ndarray,
+        days: np.ndarray,
+        rows: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        새 특허(공개일 일수 배열)를 누적. rows 를 주면 정렬 인덱스에도 병합.
+        head 보다 미래 날짜가 있으면 먼저 advance 한다.
+        """
+        with self._lock:
+            days = np.asarray(days, dtype=np.int64)
+            if len(days) == 0:
+                return
+            latest = int(days.max())
+            if latest > self.head_day:
+                self.advance(np.datetime64(latest, "D"))
+
+            in_day = (days > self.head_day - self.n_days) & (days <= self.head_day)
+            np.add.at(
+                self.daily,
+                (company_idx[in_day], tech_idx[in_day], days[in_day] % self.n_days),
+                1,
+            )
+            weeks   = _epoch_week(days)
+            in_week = (weeks > self.head_week - self.n_weeks) & (weeks <= self.head_week)
+            np.add.at(
+                self.weekly,
+                (company_idx[in_week], tech_idx[in_week], weeks[in_week] % self.n_weeks),
+                1,
+            )
+
+            if rows is not None:
+                all_days = np.concatenate([self.sorted_days, days])
+                all_rows = np.concatenate([self.sorted_rows, np.asarray(rows, dtype=np.int64)])
+                order = np.argsort(all_days, kind="stable")
+                self.sorted_days = all_days[order]
+                self.sorted_rows = all_rows[order]
+
+    def _slots(self, n: int, head: int, size: int) -> np.ndarray:
+        if n > size:
+            raise ValueError(f"링버퍼 보관 범위({size})를 넘는 구간입니다: {n}")
+        return np.arange(head - n + 1, head + 1) % size
+
+    def daily_counts(self, days: int) -> np.ndarray:
+        """최근 days일(오늘 포함) 기업 × 기술 건수"""
+        with self._lock:
+            return self.daily[:, :, self._slots(days, self.head_day, self.n_days)].sum(axis=2)
+
+    def weekly_counts(self, weeks: int) -> np.ndarray:
+        """최근 weeks주(이번 주 포함) 기업 × 기술 건수"""
+        with self._lock:
+            return self.weekly[:, :, self._slots(weeks, self.head_week, self.n_weeks)].sum(axis=2)
+
+    def count(self, company: str, tech: Optional[str] = None, days: int = 2) -> int:
+        """단일 기업(·기술)의 최근 days일 건수"""
+        with self._lock:
+            ci   = self.companies.index(company)
+            cell = self.daily[ci, :, self._slots(days, self.head_day, self.n_days)]
+            if tech is not None:
+                return int(cell[:, self.techs.index(tech)].sum())
+            return int(cell.sum())
+
+    def rows_since(self, days: int) -> np.ndarray:
+        """최근 days일 공개 특허의 코퍼스 행 번호 (공개일 오름차순)"""
+        with self._lock:
+            lo = np.searchsorted(self.sorted_days, self.head_day - days + 1, side="left")
+            hi = np.searchsorted(self.sorted_days, self.head_day, side="right")
+            return self.sorted_rows[lo:hi]
+
+    def rows_between(self, start, end) -> np.ndarray:
+        """start ~ end(포함) 공개 특허의 코퍼스 행 번호"""
+        with self._lock:
+            lo = np.searchsorted(self.sorted_days, _epoch_day(start), side="left")
+            hi = np.searchsorted(self.sorted_days, _epoch_day(end), side="right")
+            return self.sorted_rows[lo:hi]
+
+    def frame(self, days: Optional[int] = None, weeks: Optional[int] = None) -> pd.DataFrame:
+        """최근 구간 기업 × 기술 건수 DataFrame (행: 기업, 열: 기술)"""
+        arr = self.daily_counts(days) if days is not None else self.weekly_counts(weeks or 1)
+        return pd.DataFrame(arr, index=self.companies, columns=self.techs)
+
+
+# ─────────────────────────────────────────────
+# 컬럼형 특허 테이블 · 데이터 지문
+# ─────────────────────────────────────────────
+TABLE_TEXT_COLUMNS = (
+    "applicationNumber", "inventionTitle", "applicantName",
+    "openDate", "applicationDate", "registerDate", "ipcNumber", "registerStatus",
+)
+EXPORT_CHUNK_ROWS = 5000
+
+
+def patent_table(corpus: PatentCorpus, all_patents: Dict[str, List[Dict]]) -> pd.DataFrame:
+    """
+    코퍼스 행 순서 그대로의 컬럼형 특허 테이블.
+    기업 · 기술 · IPC 라벨은 코퍼스 인덱스로 만든 범주형(Categorical) 컬럼이라 재분류가 없고,
+    문자열 컬럼도 한 번만 만들어 두면 표 · 필터 · 내보내기가 모두 이 프레임 위에서 동작한다.
+    """
+    flat = [p for patents in all_patents.values() for p in patents]
+    df   = pd.DataFrame({c: [p.get(c) or "" for p in flat] for c in TABLE_TEXT_COLUMNS})
+    df.insert(0, "company", pd.Categorical.from_codes(corpus.company_idx, corpus.companies))
+    df["tech"] = pd.Categorical.from_codes(corpus.tech_idx, corpus.techs)
+    for k in ("l1", "l2", "l3"):
+        df[k] = pd.Categorical.from_codes(corpus.ipc_idx[k], corpus.ipc_labels[k])
+    df["open_day"] = corpus.open_day
+    return df
+
+
+def query_table(
+    table: pd.DataFrame,
+    where: Optional[Dict[str, object]] = None,
+    search: str = "",
+    search_columns: Sequence[str] = ("inventionTitle",),
+    sort_by: Optional[str] = None,
+    ascending: bool = True,
+) -> pd.DataFrame:
+    """
+    컬럼형 테이블 서버측 질의: where={컬럼: 값 또는 값 목록} 동등 필터 → 부분 문자열 검색(대소문자 무시) → 정렬.
+    필터로 줄인 뒤에만 문자열 검색 · 정렬을 하므로 비용은 결과 행 수에 비례한다.
+    """
+    view = table
+    for col, value in (where or {}).items():
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        view   = view[view[col].isin(values)]
+    search = (search or "").strip()
+    if search:
+        hit = np.zeros(len(view), dtype=bool)
+        for col in search_columns:
+            hit |= view[col].str.contains(search, case=False, regex=False, na=False).to_numpy()
+        view = view[hit]
+    if sort_by:
+        view = view.sort_values(sort_by, ascending=ascending, kind="stable")
+    return view
+
+
+BITMAP_MAX_VALUES = 64      # 값 종류가 이 이하인 컬럼만 값별 비트맵을 미리 만든다 (행 수 / 8 바이트 × 값 수)
+
+
+class FilterIndex:
+    """
+    범주형 컬럼 필터 인덱스. 컬럼마다 값 → 행 목록(값 순 정렬 + 오프셋)을 두고,
+    값 종류가 적은 컬럼(등록상태 · 연도 · 기술 등)은 값별 비트맵(np.packbits)까지 미리 만든다.
+    select 는 조건마다 선택 값 비트맵의 OR, 조건 간 AND 로 결합 — 비용은 행 수 / 8 바이트 연산.
+    한 행이 여러 값을 갖는 컬럼(IPC 코드 등)은 add_multi 로 (행, 값) 쌍을 넣는다.
+    """
+
+    def __init__(self, n_rows: int):
+        self.n_rows  = n_rows
+        self.columns: Dict[str, Dict] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Sequence[str]) -> "FilterIndex":
+        index = cls(len(df))
+        for col in columns:
+            index.add_column(col, df[col])
+        return index
+
+    def add_column(self, name: str, values) -> "FilterIndex":
+        """행마다 값 하나인 컬럼 (결측은 어떤 값에도 속하지 않음)"""
+        codes, labels = pd.factorize(pd.Series(values, copy=False), sort=True)
+        return self._add(name, np.arange(len(codes)), codes, labels)
+
+    def add_multi(self, name: str, rows: np.ndarray, values) -> "FilterIndex":
+        """행마다 값 여러 개인 컬럼 — rows[i] 행이 values[i] 값을 가짐"""
+        codes, labels = pd.factorize(pd.Series(values, copy=False), sort=True)
+        return self._add(name, np.asarray(rows), codes, labels)
+
+    def _add(self, name: str, rows: np.ndarray, codes: np.ndarray, labels) -> "FilterIndex":
+        keep    = codes >= 0
+        rows, codes = rows[keep], codes[keep]
+        covered = np.zeros(self.n_rows, dtype=bool)
+        covered[rows] = True
+        small   = codes.astype(np.uint16) if len(labels) <= np.iinfo(np.uint16).max else codes
+        order   = np.argsort(small, kind="stable")       # 16비트 이하 정수는 기수 정렬
+        offsets = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+        entry = {
+            "labels":  labels,
+            "pos":     {v: i for i, v in enumerate(labels)},
+            "rows":    rows[order].astype(np.int64),
+            "offsets": offsets,
+            "covered": bool(covered.all()),                      # 모든 행이 값을 하나 이상 가짐
+            "bitmaps": None,
+        }
+        if len(labels) <= BITMAP_MAX_VALUES:
+            entry["bitmaps"] = np.stack([self._pack(entry, [i]) for i in range(len(labels))]) \
+                if len(labels) else np.zeros((0, (self.n_rows + 7) // 8), dtype=np.uint8)
+        self.columns[name] = entry
+        return self
+
+    def _pack(self, entry: Dict, ids: Sequence[int]) -> np.ndarray:
+        """값 번호 목록의 행 목록 합집합 → packbits 비트맵"""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        off  = entry["offsets"]
+        for i in ids:
+            mask[entry["rows"][off[i]:off[i + 1]]] = True
+        return np.packbits(mask)
+
+    def values(self, name: str) -> list:
+        return list(self.columns[name]["labels"])
+
+    def counts(self, name: str) -> Dict:
+        """값 → 행 수 (필터 위젯 옵션 표시용)"""
+        entry = self.columns[name]
+        return dict(zip(entry["labels"], np.diff(entry["offsets"]).tolist()))
+
+    def _ids(self, name: str, selected: Iterable) -> List[int]:
+        pos = self.columns[name]["pos"]
+        return [pos[v] for v in selected if v in pos]
+
+    def _range_ids(self, name: str, lo, hi) -> List[int]:
+        labels = np.asarray(self.columns[name]["labels"])
+        return np.flatnonzero((labels >= lo) & (labels <= hi)).tolist()
+
+    def select(
+        self,
+        filters: Optional[Dict[str, Optional[Iterable]]] = None,
+        ranges: Optional[Dict[str, Tuple]] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        filters: 컬럼 → 허용 값 목록 (None 이면 조건 없음), ranges: 컬럼 → (최소, 최대) 양끝 포함,
+        mask: 추가 행 불리언 마스크 (키워드 검색 등). 모든 조건의 AND 를 만족하는 행 위치(오름차순).
+        걸러지는 조건이 하나도 없으면 None — 호출부는 원본을 그대로 쓰면 된다.
+        """
+        terms = []
+        for name, selected in (filters or {}).items():
+            if selected is not None:
+                terms.append((name, self._ids(name, selected)))
+        for name, (lo, hi) in (ranges or {}).items():
+            ids   = self._range_ids(name, lo, hi)
+            entry = self.columns[name]
+            if len(ids) < len(entry["labels"]) or not entry["covered"]:
+                terms.append((name, ids))
+
+        packed = None if mask is None else np.packbits(np.asarray(mask, dtype=bool))
+        for name, ids in terms:
+            entry = self.columns[name]
+            if entry["bitmaps"] is not None:
+                bits = np.bitwise_or.reduce(entry["bitmaps"][ids], axis=0) if ids \
+                    else np.zeros(entry["bitmaps"].shape[1], dtype=np.uint8)
+            else:
+                bits = self._pack(entry, ids)
+            packed = bits if packed is None else np.bitwise_and(packed, bits, out=packed if packed is not bits else None)
+        if packed is None:
+            return None
+        return np.flatnonzero(np.unpackbits(packed, count=self.n_rows))
+
+    @property
+    def nbytes(self) -> int:
+        total = 0
+        for entry in self.columns.values():
+            total += entry["rows"].nbytes + entry["offsets"].nbytes
+            if entry["bitmaps"] is not None:
+                total += entry["bitmaps"].nbytes
+        return int(total)
+
+
+def table_page(view: pd.DataFrame, page: int, page_size: int) -> pd.DataFrame:
+    """1부터 시작하는 page 번호의 행 구간 (범위를 벗어나면 마지막 페이지)"""
+    n_pages = max((len(view) - 1) // page_size + 1, 1)
+    page    = min(max(int(page), 1), n_pages)
+    return view.iloc[(page - 1) * page_size: page * page_size]
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """CSV 를 chunk_rows 행씩 인코딩해 내보냄 (첫 조각에만 BOM + 헤더 — 엑셀 한글 호환)"""
+    if df.empty:
+        yield df.to_csv(index=False).encode("utf-8-sig")
+        return
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start: start + chunk_rows]
+        first = start == 0
+        yield chunk.to_csv(index=False, header=first).encode("utf-8-sig" if first else "utf-8")
+
+
+def export_table(df: pd.DataFrame, fmt: str = "csv", chunk_rows: int = EXPORT_CHUNK_ROWS) -> bytes:
+    """
+    내보내기 파일 생성 (다운로드 요청 시에만 호출).
+    csv: 조각별 인코딩을 이어 붙임, parquet: chunk_rows 행 단위 row group 으로 기록 (pyarrow 필요).
+    """
+    buf = io.BytesIO()
+    if fmt == "csv":
+        for part in iter_csv_chunks(df, chunk_rows):
+            buf.write(part)
+        return buf.getvalue()
+    if fmt != "parquet":
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet 내보내기에는 pyarrow 가 필요합니다 (pip install pyarrow)") from e
+    df     = df.astype({c: str for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(buf, schema) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            writer.write_table(
+                pa.Table.from_pandas(df.iloc[start: start + chunk_rows], schema=schema, preserve_index=False)
+            )
+    return buf.getvalue()
+
+
+class FrameBuilder:
+    """
+    레코드(dict) 묶음을 도착하는 대로 모았다가 chunk_rows 행마다 컬럼형 DataFrame 조각으로 바꿔 두고,
+    frame() 에서 조각을 한 번에 이어 붙인다. 대량 수집 중에도 dict 는 한 조각 분량만 들고 있다.
+    """
+
+    def __init__(self, columns: Sequence[str], chunk_rows: int = EXPORT_CHUNK_ROWS):
+        self.columns    = list(columns)
+        self.chunk_rows = chunk_rows
+        self._pending: List[Dict] = []
+        self._chunks: List[pd.DataFrame] = []
+        self._rows = 0
+
+    def __len__(self) -> int:
+        return self._rows + len(self._pending)
+
+    def add(self, records: Iterable[Dict]) -> "FrameBuilder":
+        self._pending.extend(records)
+        while len(self._pending) >= self.chunk_rows:
+            self._flush(self.chunk_rows)
+        return self
+
+    def _flush(self, n: int):
+        batch, self._pending = self._pending[:n], self._pending[n:]
+        self._chunks.append(pd.DataFrame.from_records(batch, columns=self.columns))
+        self._rows += len(batch)
+
+    def frame(self, limit: Optional[int] = None) -> pd.DataFrame:
+        """지금까지의 전체 프레임 (limit: 앞쪽 행 수 상한)"""
+        if self._pending:
+            self._flush(len(self._pending))
+        if not self._chunks:
+            return pd.DataFrame(columns=self.columns)
+        df = pd.concat(self._chunks, ignore_index=True) if len(self._chunks) > 1 else self._chunks[0]
+        self._chunks = [df]
+        return df if limit is None else df.iloc[:limit]
+
+
+def patents_fingerprint(all_patents: Dict[str, List[Dict]]) -> str:
+    """
+    기업별 특허 목록의 내용 지문 (기업명 · 출원번호 · 공개일 · 제목).
+    같은 데이터를 불러온 세션 · 재실행은 같은 지문을 가지므로 분석 상태를 공유할 수 있다.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for company, patents in all_patents.items():
+        h.update(f"\x1e{company}\x1f{len(patents)}".encode("utf-8"))
+        for p in patents:
+            h.update(
+                f"{p.get('applicationNumber', '')}\x1f{p.get('openDate', '')}\x1f"
+                f"{p.get('inventionTitle', '')}\x1f".encode("utf-8")
+            )
+    return h.hexdigest()
+
+
+FINGERPRINT_CACHE_SIZE = 32
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    DataFrame 내용 지문 (컬럼명 · dtype · 값). 값은 pandas 벡터 해시로 컬럼마다 한 번에 계산 —
+    해시할 수 없는 값(리스트 등)이 든 컬럼만 문자열로 바꿔 해시한다.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()], ensure_ascii=False).encode("utf-8"))
+    h.update(str(len(df)).encode("ascii"))
+    for col in range(df.shape[1]):
+        values = df.iloc[:, col]
+        try:
+            hashed = pd.util.hash_pandas_object(values, index=False)
+        except TypeError:
+            hashed = pd.util.hash_pandas_object(values.astype(str), index=False)
+        h.update(hashed.to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class FrozenFrame:
+    """
+    로드 시 한 번 지문을 매긴 읽기 전용 DataFrame.
+    .df 는 복사본 — 받는 쪽이 컬럼을 추가 · 수정해도 원본과 지문은 그대로다.
+    pandas 3 은 copy-on-write 얕은 복사, 2.x 는 값이 공유되지 않도록 깊은 복사.
+    """
+
+    __slots__ = ("_df", "fingerprint")
+
+    def __init__(self, df: pd.DataFrame, fingerprint: Optional[str] = None):
+        self._df         = df.copy(deep=not PANDAS_COW)
+        self.fingerprint = fingerprint or frame_fingerprint(self._df)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._df.copy(deep=not PANDAS_COW)
+
+    def __len__(self) -> int:
+        return len(self._df)
+
+
+def fingerprint_cache(maxsize: int = FINGERPRINT_CACHE_SIZE):
+    """
+    첫 인자가 FrozenFrame 인 분석 함수의 결과를 (지문, 나머지 인자) 키로 캐시 (프로세스 공용 LRU).
+    st.cache_data 와 달리 호출마다 프레임 전체를 해시하거나 결과를 복사하지 않으므로 받는 쪽에서 결과를 수정하지 말 것.
+    함수 본체에는 FrozenFrame.df (복사본)를 넘긴다. 나머지 인자는 해시 가능해야 한다.
+    """
+    def decorator(fn: Callable) -> Callable:
+        memo: "OrderedDict[Tuple, Any]" = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(frame: FrozenFrame, *args, **kwargs):
+            if not isinstance(frame, FrozenFrame):
+                raise TypeError(f"{fn.__name__}: FrozenFrame 이 필요합니다 (받은 타입: {type(frame).__name__})")
+            key = (frame.fingerprint, args, tuple(sorted(kwargs.items())))
+            with lock:
+                if key in memo:
+                    memo.move_to_end(key)
+                    return memo[key]
+            value = fn(frame.df, *args, **kwargs)
+            with lock:
+                memo[key] = value
+                while len(memo) > maxsize:
+                    memo.popitem(last=False)
+            return value
+
+        wrapper.cache_clear = memo.clear
+        return wrapper
+
+    return decorator
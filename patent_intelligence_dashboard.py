@@ -5,15 +5,16 @@
 - Strategic Spike 감지 (공개 급증 신호)
 - 이메일 알림 서비스
 - Antigravity 프롬프트 생성
+- 신규 기술 토픽 탐색 (NMF)
+- 출원 → 등록 소요 기간 비교 (기업 · IPC 그룹별 분위수 · 생존 곡선)
 """
 
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import requests
-import xmltodict
 import smtplib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from datetime import datetime, timedelta
@@ -21,10 +22,50 @@ from datetime import datetime, timedelta
 def _months_ago(n: int) -> datetime:
     """n개월 전 datetime 반환 (내장 timedelta 사용, dateutil 불필요)"""
     return datetime.now() - timedelta(days=int(n * 30.44))
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import json
+import logging
+import os
 import time
-import re
+
+from patent_engine import (
+    LEVEL_EMERGING,
+    LEVEL_NORMAL,
+    LEVEL_SPIKE,
+    CountCube,
+    PatentCorpus,
+    RecentActivityIndex,
+    SpikeMatrix,
+    export_table,
+    fold_top_k,
+    patent_table,
+    patents_fingerprint,
+    query_table,
+    table_page,
+)
+from patent_stats import RegistrationLag, ipc_distribution
+from patent_taxonomy import default_taxonomy
+from spike_engine import DETECTORS, backtest, detect_matrix
+from topic_engine import N_TOPICS, topic_report
+from kipris_client import filter_by_open_date, shared_client
+from job_pool import ensure_job, poll_job, shared_pool
+from patent_store import (
+    DEFAULT_MAX_AGE,
+    CacheWarmer,
+    DataHandle,
+    SHARED_DB_PATH,
+    PatentStore,
+    ResourceCache,
+    SharedArtifactCache,
+    freeze_patents,
+    get_or_fetch,
+    load_snapshot,
+    save_snapshot,
+    snapshot_meta,
+)
+
+logger = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────
 # 페이지 설정
@@ -39,9 +80,6 @@ st.set_page_config(
 # ─────────────────────────────────────────────
 # 상수 정의
 # ─────────────────────────────────────────────
-KIPRIS_API_KEY = "qIq7ZsqpirwelaLXJZmwe=yjRgV0AbM=Oapp9CI=f6g="
-KIPRIS_BASE_URL = "http://plus.kipris.or.kr/kipo-api/kipi"
-
 COMPANIES = {
     "삼성전자":         {"name_en": "Samsung Electronics", "query": "삼성전자"},
     "SK하이닉스":       {"name_en": "SK Hynix",            "query": "SK하이닉스"},
@@ -55,162 +93,32 @@ COMPANIES = {
     "ASML":             {"name_en": "ASML",                "query": "ASML"},
 }
 
-# IPC 섹션 → 기술 분류 매핑
-IPC_LEVEL1 = {
-    "H01L": "반도체 소자/공정",
-    "G03F": "포토리소그래피",
-    "G09G": "디스플레이 구동",
-    "G02F": "LCD/광학 소자",
-    "H04N": "이미지센서",
-    "H01M": "에너지저장/배터리",
-    "H02M": "전력변환",
-    "G06N": "AI/뉴로모픽",
-}
-
-IPC_LEVEL2 = {
-    "H01L21": "반도체 제조공정 (전공정)",
-    "H01L25": "패키징/어셈블리 (후공정)",
-    "H01L27": "집적회로 설계",
-    "H01L29": "트랜지스터/소자 구조",
-    "H01L33": "LED/마이크로LED",
-    "H01L51": "OLED 소자",
-}
-
-IPC_LEVEL3 = {
-    "H01L21/02":   "기판/웨이퍼 처리",
-    "H01L21/027":  "노광/포토리소그래피",
-    "H01L21/306":  "식각(Etch)",
-    "H01L21/3105": "CMP(화학기계연마)",
-    "H01L21/44":   "금속배선/연결",
-    "H01L21/768":  "다층배선",
-    "H01L25/065":  "3D 스택/HBM",
-    "H01L25/18":   "Hybrid Bonding",
-    "H01L29/66":   "GAA/FinFET 트랜지스터",
-    "H01L29/78":   "MOSFET/나노시트",
+PERIOD_MONTHS = {"1개월": 1, "3개월": 3, "6개월": 6, "12개월": 12}
+MEMO_SIZE = 64      # 세션별 Figure/결과 메모 최대 항목 수
+PAGE_SIZES = [25, 50, 100, 200]
+
+# 트리맵 부모별 최대 자식 수 (나머지는 '기타 (n개)' 로 접음) — 노드 수 · payload 상한
+TREEMAP_TOP_K = {
+    "ipc":      (10, 8),        # L1 → L2
+    "ipc_l3":   (8, 6, 5),      # L1 → L2 → L3 요약
+    "drill":    (20, 15),       # 대분류 하나로 드릴다운 시 L2 → L3
+    "tech":     (10, 10),       # L1 → 기술 키워드
 }
-
-# 기술 키워드 → 카테고리 매핑 (spike 감지용)
-TECH_KEYWORDS = {
-    "HBM/고대역폭메모리":  ["HBM", "High Bandwidth Memory", "고대역폭", "wide IO"],
-    "Hybrid Bonding":      ["Hybrid Bonding", "하이브리드 본딩", "직접접합", "Cu-Cu bonding"],
-    "GAA 트랜지스터":      ["GAA", "Gate-All-Around", "나노시트", "Nanosheet", "MBCFET"],
-    "EUV 리소그래피":      ["EUV", "극자외선", "High-NA", "euv lithography"],
-    "TSV/3D 패키징":       ["TSV", "실리콘관통전극", "Through Silicon Via", "3D 패키징"],
-    "Advanced Packaging":  ["칩렛", "Chiplet", "UCIe", "CoWoS", "FOPLP", "팬아웃"],
-    "OLED/마이크로LED":    ["OLED", "유기발광", "MicroLED", "마이크로LED", "μLED"],
-    "AI 가속기":           ["NPU", "AI 가속", "뉴로모픽", "neuromorphic", "PIM"],
+DRILL_ALL = "전체 (요약)"
+EXPORT_FORMATS = {
+    "CSV":     ("csv",     "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
 }
-
-PERIOD_MONTHS = {"1개월": 1, "3개월": 3, "6개월": 6, "12개월": 12}
 SPIKE_COLORS = {
     "Strategic Spike 🔴": "#FF4B4B",
     "Emerging Signal 🟡": "#FFA500",
     "Normal ⚪":          "#AAAAAA",
 }
-
-# ─────────────────────────────────────────────
-# KIPRIS API 클라이언트
-# ─────────────────────────────────────────────
-class KiprisClient:
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        self.base_url = KIPRIS_BASE_URL
-        self.session = requests.Session()
-
-    def search_by_applicant(
-        self,
-        company_query: str,
-        start_date: str,      # YYYYMMDD — Python 측 필터용
-        end_date: str,        # YYYYMMDD — Python 측 필터용
-        max_pages: int = 5,
-    ) -> List[Dict]:
-        """
-        KIPRIS getWordSearch로 키워드 검색 후 Python에서 공개일 필터링.
-        openStartDate/openEndDate는 API가 지원하지 않아 제거.
-        """
-        endpoint = "/patUtiModInfoSearchSevice/getWordSearch"
-        all_patents: List[Dict] = []
-
-        for page in range(1, max_pages + 1):
-            params = {
-                "word":       company_query,
-                "ServiceKey": self.api_key,
-                "numOfRows":  "100",
-                "pageNo":     str(page),
-                "patent":     "true",
-                "utility":    "true",
-                "year":       "10",       # 최근 10년치 데이터 대상
-            }
-            try:
-                resp = self.session.get(
-                    self.base_url + endpoint, params=params, timeout=20
-                )
-                if resp.status_code != 200:
-                    st.warning(f"API 오류 {resp.status_code}: {company_query}")
-                    break
-                items = self._parse_xml(resp.content, start_date, end_date)
-                all_patents.extend(items["patents"])
-                if items["page_count"] < 100:
-                    break          # 마지막 페이지
-                time.sleep(0.3)
-            except Exception as e:
-                st.warning(f"{company_query} 검색 오류 (페이지 {page}): {e}")
-                break
-
-        return all_patents
-
-    def _parse_xml(self, content: bytes, start_date: str, end_date: str) -> Dict:
-        """
-        XML 파싱 + 공개일(openDate) 기준 Python 필터링.
-        필드명: response.body.items.item  (patentUtilityInfo 아님)
-        초록:   astrtCont  (abstractContent 아님)
-        """
-        result = {"patents": [], "page_count": 0}
-        try:
-            d    = xmltodict.parse(content)
-            body = d.get("response", {}).get("body", {})
-            raw  = body.get("items", {})
-            if not raw:
-                return result
-            items = raw.get("item", [])
-            if not items:
-                return result
-            if isinstance(items, dict):
-                items = [items]
-
-            result["page_count"] = len(items)
-            start_dt = datetime.strptime(start_date, "%Y%m%d")
-            end_dt   = datetime.strptime(end_date,   "%Y%m%d")
-
-            for item in items:
-                # 공개일 또는 출원일로 날짜 확정 (공개일 우선)
-                open_date = (item.get("openDate") or "").strip()
-                app_date  = (item.get("applicationDate") or "").strip()
-                date_str  = open_date if open_date else app_date
-
-                # 날짜 필터 (Python 측)
-                if date_str:
-                    try:
-                        dt = datetime.strptime(date_str[:8], "%Y%m%d")
-                        if dt < start_dt or dt > end_dt:
-                            continue
-                    except Exception:
-                        pass
-
-                result["patents"].append({
-                    "applicationNumber": item.get("applicationNumber", ""),
-                    "inventionTitle":    item.get("inventionTitle", ""),
-                    "applicantName":     item.get("applicantName", ""),
-                    "openDate":          open_date or app_date,
-                    "applicationDate":   app_date,
-                    "ipcNumber":         (item.get("ipcNumber") or "").strip(),
-                    "registerStatus":    item.get("registerStatus", ""),
-                    "abstract":          (item.get("astrtCont") or "").strip(),
-                })
-        except Exception as e:
-            st.warning(f"XML 파싱 오류: {e}")
-        return result
-
+SPIKE_SIGNALS = {
+    LEVEL_SPIKE:    "Strategic Spike 🔴",
+    LEVEL_EMERGING: "Emerging Signal 🟡",
+    LEVEL_NORMAL:   "Normal ⚪",
+}
 
 # ─────────────────────────────────────────────
 # 특허 분석기
@@ -240,44 +148,12 @@ class PatentAnalyzer:
     @staticmethod
     def classify_ipc(ipc_str: str) -> Tuple[str, str, str]:
         """IPC 코드 → (level1 대분류, level2 중분류, level3 소분류) 반환"""
-        ipc = (ipc_str or "").strip().upper().split(";")[0].strip()
-        l1 = l2 = l3 = "기타"
-        if not ipc:
-            return l1, l2, l3
-
-        # Level 1: 서브클래스 (H01L, G03F 등)
-        m = re.match(r"([A-Z]\d+[A-Z]+)", ipc)
-        sub = m.group(1) if m else ""
-        if sub in IPC_LEVEL1:
-            l1 = IPC_LEVEL1[sub]
-        elif sub:
-            l1 = sub
-
-        # Level 2: 메인그룹 (H01L21 등)
-        m2 = re.match(r"([A-Z]\d+[A-Z]+\d+)", ipc)
-        mg = m2.group(1) if m2 else ""
-        if mg in IPC_LEVEL2:
-            l2 = IPC_LEVEL2[mg]
-        elif mg:
-            l2 = mg
-
-        # Level 3: 서브그룹
-        for code, label in IPC_LEVEL3.items():
-            if ipc.startswith(code.replace("/", "").upper()) or code.upper() in ipc:
-                l3 = label
-                break
-
-        return l1, l2, l3
+        return default_taxonomy().classify_ipc(ipc_str)
 
     @staticmethod
     def classify_tech_keyword(title: str, abstract: str) -> str:
         """제목/초록 키워드로 기술 카테고리 분류"""
-        text = (title + " " + abstract).lower()
-        for category, keywords in TECH_KEYWORDS.items():
-            for kw in keywords:
-                if kw.lower() in text:
-                    return category
-        return "기타"
+        return default_taxonomy().classify_tech(title, abstract)
 
     @staticmethod
     def build_treemap_data(patents: List[Dict], company: str) -> pd.DataFrame:
@@ -292,61 +168,68 @@ class PatentAnalyzer:
         return pd.DataFrame(rows)
 
     @staticmethod
-    def detect_spikes(
-        patents: List[Dict], threshold_pct: float = 200.0
-    ) -> List[Dict]:
+    def build_corpus(all_patents: Dict[str, List[Dict]]) -> PatentCorpus:
+        """기업별 특허 → 기술/IPC 분류까지 마친 인코딩 코퍼스"""
+        tx = default_taxonomy()
+        return PatentCorpus.from_patents(all_patents, tx.classify_tech, tx.categories, tx.classify_ipc)
+
+    @staticmethod
+    def shared_corpus(
+        all_patents: Dict[str, List[Dict]],
+        shared: SharedArtifactCache,
+        fingerprint: str,
+    ) -> PatentCorpus:
         """
-        기술별 최근 1개월 공개 건수 vs 이전 11개월 월평균 비교
-        threshold_pct 이상이면 Strategic Spike, 150% 이상이면 Emerging Signal
+        분류를 마친 코퍼스를 워커 간 공유 — 같은 데이터 · 분류표면 다른 워커가 만든 결과를 읽기만 한다.
+        분류표가 바뀌면 키가 달라져 자동으로 다시 분류.
         """
-        cutoff_1m  = _months_ago(1)
-        cutoff_12m = _months_ago(12)
+        key  = f"corpus:{fingerprint}:{default_taxonomy().fingerprint}"
+        data = shared.get_or_build(key, lambda: PatentAnalyzer.build_corpus(all_patents).to_bytes())
+        return PatentCorpus.from_bytes(data)
 
-        # 기술 카테고리별 날짜 리스트
-        tech_dates: Dict[str, List[datetime]] = {k: [] for k in TECH_KEYWORDS}
+    @staticmethod
+    def build_cube(all_patents: Dict[str, List[Dict]]) -> CountCube:
+        """기업 × 기술 × IPC L1/L2/L3 × 공개월 카운트 큐브 (데이터 로드 시 1회)"""
+        return CountCube.from_corpus(PatentAnalyzer.build_corpus(all_patents))
 
-        for p in patents:
-            try:
-                od = datetime.strptime(str(p["openDate"])[:8], "%Y%m%d")
-            except Exception:
-                continue
-            if od < cutoff_12m:
-                continue
-            cat = PatentAnalyzer.classify_tech_keyword(
-                p["inventionTitle"], p["abstract"]
-            )
-            if cat in tech_dates:
-                tech_dates[cat].append(od)
+    @staticmethod
+    def spike_matrix(
+        cube: CountCube,
+        threshold_pct: float = 200.0,
+        detector: str = "legacy",
+    ) -> SpikeMatrix:
+        """전 기업 × 전 기술 Spike 매트릭스 (spike_engine 탐지기, 큐브 롤업)"""
+        return detect_matrix(cube, detector, threshold_pct)
 
+    @staticmethod
+    def spike_alerts(matrix: SpikeMatrix, company: str) -> List[Dict]:
+        """SpikeMatrix 한 행 → 대시보드 표시용 알림 리스트 (급증률 내림차순)"""
         alerts = []
-        for tech, dates in tech_dates.items():
-            recent   = [d for d in dates if d >= cutoff_1m]
-            older    = [d for d in dates if d < cutoff_1m]
-            count_1m = len(recent)
-            avg_11m  = len(older) / 11.0 if older else 0.0
-            ratio    = (count_1m / avg_11m * 100) if avg_11m > 0 else 0.0
-
-            if count_1m == 0:
-                continue
-
-            if ratio >= threshold_pct:
-                signal = "Strategic Spike 🔴"
-            elif ratio >= 150:
-                signal = "Emerging Signal 🟡"
-            else:
-                signal = "Normal ⚪"
-
-            alerts.append({
-                "기술 카테고리":    tech,
-                "최근 1개월 공개":  count_1m,
-                "이전 11개월 월평균": round(avg_11m, 1),
-                "급증률(%)":        round(ratio, 1),
-                "신호":             signal,
-            })
-
-        alerts.sort(key=lambda x: x["급증률(%)"], reverse=True)
+        for a in matrix.alerts(company):
+            row = {
+                "기술 카테고리":    a["tech_category"],
+                "최근 1개월 공개":  a["count_1m"],
+                "이전 11개월 월평균": a["avg_11m"],
+                "급증률(%)":        a["spike_ratio_pct"],
+                "신호":             SPIKE_SIGNALS[a["level"]],
+            }
+            if "score" in a:
+                row["탐지 점수"] = a["score"]
+            alerts.append(row)
         return alerts
 
+    @staticmethod
+    def detect_spikes(
+        patents: List[Dict], threshold_pct: float = 200.0
+    ) -> List[Dict]:
+        """
+        기술별 최근 1개월 공개 건수 vs 이전 11개월 월평균 비교
+        threshold_pct 이상이면 Strategic Spike, 150% 이상이면 Emerging Signal
+        """
+        cube   = PatentAnalyzer.build_cube({"_": patents})
+        matrix = PatentAnalyzer.spike_matrix(cube, threshold_pct)
+        return PatentAnalyzer.spike_alerts(matrix, "_")
+
     @staticmethod
     def monthly_trend(patents: List[Dict]) -> pd.DataFrame:
         """월별 공개 건수 집계"""
@@ -535,7 +418,8 @@ antigravity execute "
 # ─────────────────────────────────────────────
 def init_session():
     defaults = {
-        "patents_cache":  {},   # company → list of patents
+        "data_handle":    None, # DataHandle → 공용 저장소의 특허 + 큐브 · 인덱스 · 테이블
+        "data_fingerprint": None, # 공용 저장소 키
         "analysis_done":  False,
         "selected_companies": [],
         "selected_period": "6개월",
@@ -548,7 +432,7 @@ def init_session():
 # ─────────────────────────────────────────────
 # 사이드바
 # ─────────────────────────────────────────────
-def render_sidebar() -> Tuple[List[str], str, float, Dict]:
+def render_sidebar() -> Tuple[List[str], str, float, str, Dict, bool]:
     with st.sidebar:
         st.image(
             "https://upload.wikimedia.org/wikipedia/commons/thumb/2/2f/Stockage_de_d%C3%A9chets_radioactifs_%C3%A0_La_Hague.jpg/320px-Stockage_de_d%C3%A9chets_radioactifs_%C3%A0_La_Hague.jpg",
@@ -567,12 +451,21 @@ def render_sidebar() -> Tuple[List[str], str, float, Dict]:
         period = st.selectbox("공개일 기준 기간", list(PERIOD_MONTHS.keys()), index=2)
 
         st.subheader("Spike 임계값")
+        detector = st.selectbox(
+            "탐지 방식",
+            list(DETECTORS.keys()),
+            format_func=lambda k: DETECTORS[k].label,
+        )
+        det = DETECTORS[detector]
+        lo, hi, step = det.slider
+        cast = int if det.unit == "%" else float
         threshold = st.slider(
-            "Strategic Spike 판정 기준 (%)",
-            min_value=100,
-            max_value=500,
-            value=200,
-            step=50,
+            f"Strategic Spike 판정 기준 ({det.unit})",
+            min_value=cast(lo),
+            max_value=cast(hi),
+            value=cast(det.default_threshold),
+            step=cast(step),
+            key=f"threshold_{detector}",
         )
 
         st.subheader("이메일 알림 설정")
@@ -586,31 +479,462 @@ def render_sidebar() -> Tuple[List[str], str, float, Dict]:
 
         run_btn = st.button("🚀 분석 실행", type="primary", use_container_width=True)
 
-    return selected, period, threshold, email_cfg, run_btn
+    return selected, period, threshold, detector, email_cfg, run_btn
 
 
 # ─────────────────────────────────────────────
 # 데이터 로드
 # ─────────────────────────────────────────────
-@st.cache_data(ttl=3600, show_spinner=False)
-def load_patents(company_query: str, start_date: str, end_date: str) -> List[Dict]:
-    client = KiprisClient(KIPRIS_API_KEY)
-    return client.search_by_applicant(company_query, start_date, end_date, max_pages=5)
+@st.cache_resource(show_spinner=False)
+def get_patent_store() -> PatentStore:
+    """서버 프로세스 전체가 공유하는 디스크 캐시 (별도 워머 프로세스와도 공유)"""
+    return PatentStore()
+
+
+@st.cache_resource(show_spinner=False)
+def start_cache_warmer() -> CacheWarmer:
+    """
+    전체 기업 백그라운드 선수집 — 서버 프로세스당 1회 시작 (PATENT_PREFETCH=0 이면 끔).
+    새로 수집한 기업이 있으면 부팅 스냅샷도 새 데이터로 다시 만든다.
+    """
+    store  = get_patent_store()
+    warmer = CacheWarmer(
+        store,
+        [c["query"] for c in COMPANIES.values()],
+        on_refresh=lambda n: refresh_snapshot(store),
+    )
+    if os.getenv("PATENT_PREFETCH", "1") != "0":
+        warmer.start()
+    return warmer
+
+
+def period_range(period: str, now: Optional[datetime] = None) -> Tuple[str, str]:
+    """기간 라벨 → (시작일, 종료일) YYYYMMDD"""
+    end_dt   = now or datetime.now()
+    start_dt = end_dt - timedelta(days=int(PERIOD_MONTHS[period] * 30.44))
+    return start_dt.strftime("%Y%m%d"), end_dt.strftime("%Y%m%d")
+
+
+def fetch_company(
+    store: PatentStore,
+    company_query: str,
+    start_date: str,
+    end_date: str,
+) -> Tuple[List[Dict], List[str]]:
+    """
+    워커 스레드용 — st 호출 없이 (특허 목록, 경고 메시지) 반환.
+    공유 캐시(워머가 미리 채움)에서 원본을 꺼내 기간만 필터, 캐시가 없거나 만료됐을 때만 수집.
+    """
+    warnings: List[str] = []
+    entry = get_or_fetch(store, company_query, warn=warnings.append)
+    return filter_by_open_date(entry["patents"], start_date, end_date), warnings
+
+
+def render_company_preview(slot, company: str, patents: List[Dict]):
+    """수집이 끝난 기업부터 KPI · 월별 추이를 바로 표시 (전체 탭은 모든 기업 수집 후)"""
+    buckets = PatentAnalyzer.bucket_by_period(patents)
+    trend   = PatentAnalyzer.monthly_trend(patents)
+    with slot.container(border=True):
+        st.markdown(f"**{company}**")
+        c1, c2 = st.columns(2)
+        c1.metric("공개 특허 (기간 내)", f"{len(patents):,}건")
+        c2.metric("최근 1개월", f"{len(buckets['1개월']):,}건")
+        if not trend.empty:
+            fig = px.line(trend, x="year_month", y="count", markers=True, height=220)
+            fig.update_layout(margin=dict(l=0, r=0, t=10, b=0), xaxis_title=None, yaxis_title=None)
+            st.plotly_chart(fig, use_container_width=True, key=f"preview_{company}")
+
+
+def load_companies_progressively(
+    selected: List[str],
+    start_date: str,
+    end_date: str,
+    max_workers: int = 8,
+) -> Dict[str, List[Dict]]:
+    """
+    선택 기업을 스레드 풀로 동시에 수집하고, 끝나는 순서대로 미리보기 카드를 채운다.
+    첫 차트까지 걸리는 시간 ≈ 가장 빠른 한 기업의 수집 시간.
+    UI 호출은 모두 메인 스크립트 스레드(as_completed 루프)에서만 수행한다.
+    """
+    store    = get_patent_store()
+    progress = st.progress(0, text="특허 데이터 수집 중...")
+    preview  = st.empty()
+    cols     = preview.container().columns(min(len(selected), 3))
+    slots    = {c: cols[i % len(cols)].empty() for i, c in enumerate(selected)}
+
+    all_patents: Dict[str, List[Dict]] = {}
+    with ThreadPoolExecutor(max_workers=min(len(selected), max_workers)) as pool:
+        futures = {
+            pool.submit(fetch_company, store, COMPANIES[c]["query"], start_date, end_date): c
+            for c in selected
+        }
+        for i, fut in enumerate(as_completed(futures), 1):
+            company = futures[fut]
+            try:
+                patents, warnings = fut.result()
+            except Exception as e:
+                patents, warnings = [], [f"{company} 수집 오류: {e}"]
+            for w in warnings:
+                st.warning(w)
+            all_patents[company] = patents
+            render_company_preview(slots[company], company, patents)
+            progress.progress(i / len(selected), text=f"{company} 완료 ({i}/{len(selected)})")
+            st.toast(f"{company}: {len(patents)}건 수집 완료", icon="✅")
+    progress.empty()
+    preview.empty()
+
+    # 기업 순서는 선택 순서로 유지 (탭 · 차트 색상 일관성)
+    return {c: all_patents[c] for c in selected}
+
+
+def _format_age(age: Optional[float]) -> str:
+    if age is None:
+        return "캐시 없음"
+    if age < 60:
+        return "방금 전"
+    if age < 3600:
+        return f"{int(age // 60)}분 전"
+    if age < 86400:
+        return f"{int(age // 3600)}시간 전"
+    return f"{int(age // 86400)}일 전"
+
+
+def render_freshness(warmer: CacheWarmer):
+    """사이드바: 기업별 캐시 수집 시각 · 건수 · 워머 오류"""
+    store = get_patent_store()
+    fresh = store.freshness(c["query"] for c in COMPANIES.values())
+    with st.sidebar.expander("🗄 데이터 신선도", expanded=False):
+        if not warmer.running:
+            state = "중지됨"
+        elif warmer.is_leader:
+            state = "실행 중 (이 워커가 수집)"
+        else:
+            state = "대기 중 (다른 워커가 수집)"
+        st.caption(f"백그라운드 워머 {state} · {warmer.interval / 60:.0f}분 주기")
+        rows = []
+        for name, meta in COMPANIES.items():
+            f   = fresh[meta["query"]]
+            err = warmer.status.get(meta["query"], {}).get("last_error")
+            rows.append({
+                "기업":     name,
+                "갱신":     _format_age(f["age"]),
+                "건수":     f["count"],
+                "상태":     "⚠️ " + err if err else ("✅" if f["age"] is not None and f["age"] < DEFAULT_MAX_AGE else "⏳"),
+            })
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+
+def build_analysis_state(
+    all_patents: Dict[str, List[Dict]],
+    corpus: Optional[PatentCorpus] = None,
+    lag: Optional[RegistrationLag] = None,
+) -> Dict:
+    """데이터 로드 시 1회: 분류 → 카운트 큐브 + 단기 링버퍼 인덱스 + 컬럼형 특허 테이블 + 등록 소요 기간"""
+    if corpus is None:
+        corpus = PatentAnalyzer.build_corpus(all_patents)
+    table = patent_table(corpus, all_patents)
+    return {
+        "patent_corpus":    corpus,
+        "patent_cube":      CountCube.from_corpus(corpus),
+        "recent_index":     RecentActivityIndex.from_corpus(corpus),
+        "patent_table":     table,
+        "registration_lag": lag if lag is not None else RegistrationLag.from_table(table),
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def get_analysis_cache() -> ResourceCache:
+    """
+    데이터 지문 → 특허 데이터 + 분석 상태. 같은 데이터를 본 세션은 한 벌을 공유하고
+    세션 참조가 없는 항목만 LRU 로 제거 (PATENT_STORE_MAX_MB 상한, 기본 1024MB).
+    """
+    return ResourceCache(
+        max_entries=int(os.getenv("PATENT_STORE_MAX_ENTRIES", "16")),
+        max_bytes=int(float(os.getenv("PATENT_STORE_MAX_MB", "1024")) * 2**20),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_shared_artifacts() -> Optional[SharedArtifactCache]:
+    """
+    같은 호스트의 대시보드 워커(dashboard_cluster.py)가 공유하는 분류 결과 저장소.
+    PATENT_SHARED_DB="" 이면 끄고 워커마다 직접 분류.
+    """
+    if not SHARED_DB_PATH:
+        return None
+    try:
+        return SharedArtifactCache(SHARED_DB_PATH)
+    except Exception:                               # 읽기 전용 디스크 등 — 단일 워커 동작으로 후퇴
+        return None
+
+
+def attach_data(all_patents: Dict[str, List[Dict]]) -> DataHandle:
+    """
+    특허 데이터를 공용 저장소에 올리고(이미 있으면 재사용) 세션에는 참조 핸들만 보관.
+    이전 핸들은 교체되면서 수거되어 참조 수가 자동으로 내려간다.
+    """
+    fp = patents_fingerprint(all_patents)
+
+    def _build() -> Dict:
+        frozen = freeze_patents(all_patents)
+        shared = get_shared_artifacts()
+        corpus = PatentAnalyzer.shared_corpus(frozen, shared, fp) if shared else None
+        return {"patents": frozen, **build_analysis_state(frozen, corpus)}
+
+    handle = get_analysis_cache().checkout(fp, _build)
+    st.session_state["data_handle"]      = handle
+    st.session_state["data_fingerprint"] = fp
+    return handle
+
+
+# ─────────────────────────────────────────────
+# 부팅 스냅샷 (마지막 분석 상태 → 콜드 스타트 즉시 표시)
+# ─────────────────────────────────────────────
+def default_spike_params() -> Tuple[str, float]:
+    """사이드바 초기값과 같은 (탐지기, 임계값) — 스냅샷 Spike 매트릭스가 첫 화면 메모에 그대로 맞도록"""
+    detector = next(iter(DETECTORS))
+    det      = DETECTORS[detector]
+    cast     = int if det.unit == "%" else float
+    return detector, cast(det.default_threshold)
+
+
+def write_snapshot(selected: List[str], period: str, all_patents: Dict[str, List[Dict]], state: Dict):
+    """분석 상태를 부팅 스냅샷으로 저장 (특허 · 코퍼스 · 큐브 · 기본 Spike · IPC 트리)"""
+    detector, threshold = default_spike_params()
+    cube  = state["patent_cube"]
+    parts = {
+        "corpus":   state["patent_corpus"].to_bytes(),
+        "cube":     cube.to_bytes(),
+        "spikes":   PatentAnalyzer.spike_matrix(cube, threshold, detector).to_bytes(),
+        "ipc_tree": json.dumps(cube.ipc_tree(), ensure_ascii=False).encode("utf-8"),
+        "registration_lag": state["registration_lag"].to_bytes(),
+    }
+    meta = {
+        "selected":    list(selected),
+        "period":      period,
+        "fingerprint": patents_fingerprint(all_patents),
+        "taxonomy":    default_taxonomy().fingerprint,
+        "day":         datetime.now().strftime("%Y%m%d"),
+        "detector":    detector,
+        "threshold":   threshold,
+    }
+    save_snapshot(meta, all_patents, parts)
+
+
+def log_job_failure(label: str) -> Callable:
+    """폴링하지 않는(fire-and-forget) 작업의 Future 완료 콜백 — 실패를 로그로 남긴다"""
+    def _done(future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error("%s 실패: %s", label, error, exc_info=error)
+    return _done
+
+
+def refresh_snapshot(store: PatentStore):
+    """워머 갱신 후: 스냅샷과 같은 기업 · 기간을 새 캐시로 다시 분석해 저장 (데이터가 그대로면 생략)"""
+    meta = snapshot_meta()
+    if not meta:
+        return
+    start, end = period_range(meta["period"])
+    all_patents = {
+        c: fetch_company(store, COMPANIES[c]["query"], start, end)[0]
+        for c in meta["selected"] if c in COMPANIES
+    }
+    if patents_fingerprint(all_patents) == meta["fingerprint"] and meta["day"] == datetime.now().strftime("%Y%m%d"):
+        return
+    write_snapshot(meta["selected"], meta["period"], all_patents, build_analysis_state(all_patents))
+
+
+def state_from_snapshot(snap: Dict) -> Dict:
+    """
+    스냅샷 → 공용 저장소 항목. 분류표가 바뀌었으면 재분류, 날짜가 바뀌었으면
+    기간구간이 어긋나므로 큐브 · 인덱스만 코퍼스에서 다시 계산 (ms 단위).
+    """
+    meta   = snap["meta"]
+    parts  = snap["parts"]
+    frozen = freeze_patents(snap["patents"])
+    corpus = None
+    if meta.get("taxonomy") == default_taxonomy().fingerprint and "corpus" in parts:
+        corpus = PatentCorpus.from_bytes(parts["corpus"])
+    lag = None      # 심사 중 특허의 경과 기간이 날짜에 따라 달라지므로 같은 날 스냅샷만 재사용
+    if meta.get("day") == datetime.now().strftime("%Y%m%d") and "registration_lag" in parts:
+        lag = RegistrationLag.from_bytes(parts["registration_lag"])
+    state = build_analysis_state(frozen, corpus, lag)
+    if corpus is not None and meta.get("day") == datetime.now().strftime("%Y%m%d") and "cube" in parts:
+        state["patent_cube"] = CountCube.from_bytes(parts["cube"])
+    return {"patents": frozen, **state}
+
+
+def restore_snapshot() -> Optional[DataHandle]:
+    """
+    세션에 데이터가 없을 때 마지막 스냅샷을 붙인다. 다른 세션이 이미 올린 데이터면 파일도 읽지 않음.
+    같은 날 스냅샷이면 저장된 기본 Spike 매트릭스를 세션 메모에 넣어 첫 화면 계산을 건너뛴다.
+    """
+    meta = snapshot_meta()
+    if not meta or os.getenv("PATENT_BOOT_SNAPSHOT", "1") == "0":
+        return None
+    fp   = meta["fingerprint"]
+    snap: Dict = {}
+
+    def _build() -> Dict:
+        snap.update(load_snapshot() or {})
+        if not snap:
+            raise RuntimeError("스냅샷을 읽을 수 없습니다.")
+        return state_from_snapshot(snap)
+
+    try:
+        handle = get_analysis_cache().checkout(fp, _build)
+    except Exception:
+        return None
+    st.session_state["data_handle"]      = handle
+    st.session_state["data_fingerprint"] = fp
+    st.session_state["snapshot_meta"]    = meta
+
+    if snap and meta.get("day") == datetime.now().strftime("%Y%m%d") and "spikes" in snap["parts"]:
+        memoized("spike_matrix", meta["detector"], meta["threshold"],
+                 build=lambda: SpikeMatrix.from_bytes(snap["parts"]["spikes"]))
+    return handle
+
+
+def memoized(*key, build: Callable[[], Any]):
+    """
+    데이터 지문 + 위젯 상태(key)로 무거운 결과(Plotly Figure · 알림 · payload)를 재사용.
+    세션별 LRU — 다른 탭 · 위젯을 건드린 재실행에서는 만들어 둔 객체를 그대로 그린다.
+    """
+    memo = st.session_state.setdefault("_memo", OrderedDict())
+    k    = (st.session_state.get("data_fingerprint"),) + key
+    if k in memo:
+        memo.move_to_end(k)
+        return memo[k]
+    value = memo[k] = build()
+    while len(memo) > MEMO_SIZE:
+        memo.popitem(last=False)
+    return value
+
+
+def get_ipc_distribution(table: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """기업별 IPC 레벨 분포 (특허 수 기준 — 한 특허의 같은 메인그룹 코드는 1건)"""
+    return memoized("ipc_distribution", build=lambda: ipc_distribution(table, by="company", per_patent=True))
+
+
+def get_spike_matrix(cube: CountCube, threshold: float, detector: str) -> SpikeMatrix:
+    return memoized("spike_matrix", detector, threshold,
+                    build=lambda: PatentAnalyzer.spike_matrix(cube, threshold, detector))
+
+
+def get_spike_alerts(spike_mx: SpikeMatrix, detector: str) -> Dict[str, List[Dict]]:
+    """기업 → 알림 목록 (Spike · Antigravity · Firebase 탭 공용)"""
+    return memoized(
+        "spike_alerts", detector, spike_mx.threshold_pct,
+        build=lambda: {c: PatentAnalyzer.spike_alerts(spike_mx, c) for c in spike_mx.companies},
+    )
+
+
+def _format_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
+    return f"{n:,.1f} GB"
+
+
+def render_resource_usage():
+    """사이드바: 프로세스 공용 리소스가 들고 있는 메모리 (운영 점검용)"""
+    client = shared_client().pool_info()
+    store  = get_patent_store().memory_info()
+    tax    = default_taxonomy().memory_info()
+    rows = [
+        {"리소스": "KIPRIS 커넥션 풀", "항목": f"풀 {client['pools']} · 유휴 {client['idle_connections']}", "메모리": "-"},
+        {"리소스": "특허 원본 캐시",   "항목": f"{store['entries']}개 기업",  "메모리": _format_bytes(store["bytes"])},
+        {"리소스": "IPC 분류 메모",    "항목": f"{tax['entries']:,}개 코드",  "메모리": _format_bytes(tax["bytes"])},
+    ]
+    shared = get_shared_artifacts()
+    if shared is not None:
+        info = shared.memory_info()
+        rows.append({"리소스": "워커 공유 분류 (디스크)", "항목": f"{info['entries']}개",
+                     "메모리": _format_bytes(info["file_bytes"])})
+    cache   = get_analysis_cache()
+    current = st.session_state.get("data_fingerprint")
+    for info in cache.memory_info():
+        parts = " · ".join(f"{k.split('_')[-1]} {_format_bytes(v)}" for k, v in info["parts"].items())
+        rows.append({
+            "리소스": "공용 데이터" + (" (현재)" if info["key"] == current else ""),
+            "항목":   f"{info['key'][:8]} · 세션 {info['refs']} · 재사용 {info['hits']}회 · {parts}",
+            "메모리": _format_bytes(info["bytes"]),
+        })
+    with st.sidebar.expander("🧠 리소스 메모리", expanded=False):
+        st.caption(f"공용 데이터 {_format_bytes(cache.total_bytes)} / 상한 {_format_bytes(cache.max_bytes)}")
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+
+# ─────────────────────────────────────────────
+# 특허 목록 테이블 (서버측 페이지 · 정렬 · 필터, 요청 시 내보내기)
+# ─────────────────────────────────────────────
+def render_patent_table(
+    table: pd.DataFrame,
+    company: str,
+    columns: Dict[str, str],
+    key: str,
+    height: int = 400,
+):
+    """
+    컬럼형 특허 테이블에서 현재 페이지만 잘라 표시.
+    columns: 원본 컬럼 → 표시 이름 (순서 유지). 내보내기는 버튼을 눌렀을 때만 조각 단위로 생성.
+    """
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+    search  = c1.text_input("발명명칭 검색", key=f"{key}_search")
+    sort_by = c2.selectbox("정렬", list(columns), index=list(columns).index("openDate"),
+                           format_func=columns.get, key=f"{key}_sort")
+    order   = c3.radio("순서", ["내림차순", "오름차순"], key=f"{key}_order")
+    size    = c4.selectbox("페이지 크기", PAGE_SIZES, key=f"{key}_size")
+
+    view = query_table(
+        table, where={"company": company}, search=search,
+        sort_by=sort_by, ascending=(order == "오름차순"),
+    )
+    n_pages = max((len(view) - 1) // size + 1, 1)
+    page    = st.number_input(f"페이지 (총 {n_pages:,})", 1, n_pages, 1, key=f"{key}_page")
+    shown   = table_page(view, page, size)
+    st.dataframe(
+        shown[list(columns)].rename(columns=columns),
+        use_container_width=True, hide_index=True, height=height,
+    )
+    start = (min(page, n_pages) - 1) * size
+    st.caption(f"{len(view):,}건 중 {start + 1 if len(view) else 0:,}–{start + len(shown):,}번째")
+
+    # 내보내기: 필터 · 정렬 조건이 같을 때만 준비된 파일을 재사용
+    e1, e2 = st.columns([1, 3])
+    fmt_label = e1.selectbox("형식", list(EXPORT_FORMATS), key=f"{key}_fmt", label_visibility="collapsed")
+    fmt, mime = EXPORT_FORMATS[fmt_label]
+    sig      = (st.session_state.get("data_fingerprint"), company, search, sort_by, order, fmt)
+    prepared = st.session_state.get(f"{key}_export")
+    if prepared is None or prepared[0] != sig:
+        if e2.button(f"{fmt_label} 내보내기 준비 ({len(view):,}건)", key=f"{key}_prepare"):
+            with st.spinner("파일 생성 중..."):
+                data = export_table(view[list(columns)].rename(columns=columns), fmt)
+            st.session_state[f"{key}_export"] = prepared = (sig, data)
+    if prepared is not None and prepared[0] == sig:
+        e2.download_button(
+            f"{fmt_label} 다운로드", prepared[1], f"{company}_patents.{fmt}", mime, key=f"{key}_download",
+        )
 
 
 # ─────────────────────────────────────────────
 # Tab 1: 대시보드 개요
 # ─────────────────────────────────────────────
-def tab_overview(all_patents: Dict[str, List[Dict]], period: str):
+def tab_overview(
+    all_patents: Dict[str, List[Dict]],
+    period: str,
+    cube: CountCube,
+    spike_mx: SpikeMatrix,
+):
     st.subheader("📊 대시보드 개요")
 
     # KPI 카드
     total = sum(len(v) for v in all_patents.values())
-    spiky = sum(
-        1 for v in all_patents.values()
-        for s in PatentAnalyzer.detect_spikes(v)
-        if "Spike" in s["신호"]
-    )
+    spiky = spike_mx.spike_count()
     top_company = max(all_patents, key=lambda k: len(all_patents[k])) if all_patents else "-"
 
     c1, c2, c3, c4 = st.columns(4)
@@ -624,27 +948,24 @@ def tab_overview(all_patents: Dict[str, List[Dict]], period: str):
     # 기업별 공개 건수 비교 바 차트
     company_counts = {k: len(v) for k, v in all_patents.items()}
     if company_counts:
-        fig_bar = px.bar(
+        fig_bar = memoized("overview_bar", period, build=lambda: px.bar(
             x=list(company_counts.keys()),
             y=list(company_counts.values()),
             labels={"x": "기업", "y": "공개 특허 수"},
             title=f"기업별 공개 특허 수 ({period})",
             color=list(company_counts.values()),
             color_continuous_scale="Blues",
-        )
+        ))
         st.plotly_chart(fig_bar, use_container_width=True)
 
     # 기업별 월별 트렌드
     st.subheader("월별 공개 트렌드")
-    trend_frames = []
-    for company, patents in all_patents.items():
-        df = PatentAnalyzer.monthly_trend(patents)
-        df["company"] = company
-        trend_frames.append(df)
-
-    if trend_frames:
-        df_all = pd.concat(trend_frames, ignore_index=True)
-        fig_line = px.line(
+
+    def _trend():
+        df_all = cube.monthly_frame()
+        if df_all.empty:
+            return None
+        fig = px.line(
             df_all,
             x="year_month", y="count",
             color="company",
@@ -652,14 +973,18 @@ def tab_overview(all_patents: Dict[str, List[Dict]], period: str):
             title="기업별 월별 공개 특허 추이",
             labels={"year_month": "년월", "count": "공개 건수"},
         )
-        fig_line.update_xaxes(tickangle=45)
+        fig.update_xaxes(tickangle=45)
+        return fig
+
+    fig_line = memoized("overview_trend", build=_trend)
+    if fig_line is not None:
         st.plotly_chart(fig_line, use_container_width=True)
 
 
 # ─────────────────────────────────────────────
 # Tab 2: 트리맵 드릴다운
 # ─────────────────────────────────────────────
-def tab_treemap(all_patents: Dict[str, List[Dict]]):
+def tab_treemap(all_patents: Dict[str, List[Dict]], cube: CountCube, table: pd.DataFrame):
     st.subheader("🌳 IPC 기술 트리맵 드릴다운")
 
     # 기업 선택 (단일)
@@ -670,63 +995,79 @@ def tab_treemap(all_patents: Dict[str, List[Dict]]):
         st.warning("해당 기업의 특허 데이터가 없습니다.")
         return
 
-    df = PatentAnalyzer.build_treemap_data(patents, company)
-    if df.empty:
-        st.warning("분류 가능한 데이터가 없습니다.")
-        return
+    only = {"company": company}
 
     # ── Level 1/2 트리맵
     st.markdown("#### Level 1–2: 대분류 → 중분류")
-    df_l2 = df.groupby(["company", "l1", "l2"]).size().reset_index(name="count")
-    fig_tm = px.treemap(
-        df_l2,
-        path=["company", "l1", "l2"],
-        values="count",
-        title=f"{company} IPC 기술 분류 트리맵",
-        color="count",
-        color_continuous_scale="RdYlGn",
-    )
-    fig_tm.update_traces(textinfo="label+value+percent parent")
-    st.plotly_chart(fig_tm, use_container_width=True)
 
-    # ── Level 3 트리맵
+    def _treemap_l2():
+        df = fold_top_k(cube.frame("l1", "l2", where=only), ["l1", "l2"], TREEMAP_TOP_K["ipc"])
+        df.insert(0, "company", company)
+        fig = px.treemap(
+            df,
+            path=["company", "l1", "l2"],
+            values="count",
+            title=f"{company} IPC 기술 분류 트리맵",
+            color="count",
+            color_continuous_scale="RdYlGn",
+        )
+        fig.update_traces(textinfo="label+value+percent parent")
+        return fig
+
+    st.plotly_chart(memoized("treemap_l2", company, build=_treemap_l2), use_container_width=True)
+
+    # ── Level 3 트리맵: 요약(전 대분류 top-k) 또는 선택한 대분류 하위 트리만 상세 로드
     st.markdown("#### Level 2–3: 중분류 → 소분류")
-    df_l3 = df.groupby(["l1", "l2", "l3"]).size().reset_index(name="count")
-    fig_l3 = px.treemap(
-        df_l3,
-        path=["l1", "l2", "l3"],
-        values="count",
-        title=f"{company} IPC 세부 기술 트리맵 (Level 3)",
-        color="count",
-        color_continuous_scale="Blues",
-    )
-    fig_l3.update_traces(textinfo="label+value")
-    st.plotly_chart(fig_l3, use_container_width=True)
+    l1_nodes = cube.frame("l1", where=only).sort_values("count", ascending=False)["l1"].tolist()
+    drill    = st.selectbox("드릴다운 (대분류)", [DRILL_ALL] + l1_nodes, key="treemap_drill")
+
+    def _treemap_l3():
+        if drill == DRILL_ALL:
+            df    = fold_top_k(cube.frame("l1", "l2", "l3", where=only), ["l1", "l2", "l3"],
+                               TREEMAP_TOP_K["ipc_l3"])
+            path  = ["l1", "l2", "l3"]
+            title = f"{company} IPC 세부 기술 트리맵 (Level 3)"
+        else:
+            df    = fold_top_k(cube.frame("l2", "l3", where={**only, "l1": drill}), ["l2", "l3"],
+                               TREEMAP_TOP_K["drill"])
+            df.insert(0, "l1", drill)
+            path  = ["l1", "l2", "l3"]
+            title = f"{company} · {drill} 세부 기술 트리맵"
+        fig = px.treemap(
+            df,
+            path=path,
+            values="count",
+            title=title,
+            color="count",
+            color_continuous_scale="Blues",
+        )
+        fig.update_traces(textinfo="label+value")
+        return fig
+
+    st.plotly_chart(memoized("treemap_l3", company, drill, build=_treemap_l3), use_container_width=True)
+    st.caption("부모마다 상위 노드만 표시하고 나머지는 '기타 (n개)' 로 접었습니다. "
+               "대분류를 선택하면 해당 하위 트리를 더 자세히 불러옵니다.")
 
     # ── 기술 키워드 트리맵
     st.markdown("#### 기술 키워드 분류 트리맵")
-    df_tech = df.groupby(["l1", "tech"]).size().reset_index(name="count")
-    fig_tech = px.treemap(
-        df_tech,
+    fig_tech = memoized("treemap_tech", company, build=lambda: px.treemap(
+        fold_top_k(cube.frame("l1", "tech", where=only), ["l1", "tech"], TREEMAP_TOP_K["tech"]),
         path=["l1", "tech"],
         values="count",
         title=f"{company} 기술 키워드 트리맵",
         color="count",
         color_continuous_scale="Viridis",
-    )
+    ))
     st.plotly_chart(fig_tech, use_container_width=True)
 
     # 상세 테이블
     with st.expander("📋 IPC 분류별 특허 목록"):
-        show_df = pd.DataFrame(patents)[
-            ["inventionTitle", "openDate", "ipcNumber", "applicantName"]
-        ].rename(columns={
+        render_patent_table(table, company, {
             "inventionTitle": "발명명칭",
             "openDate":       "공개일",
             "ipcNumber":      "IPC",
             "applicantName":  "출원인",
-        })
-        st.dataframe(show_df, use_container_width=True, height=400)
+        }, key="treemap_table", height=400)
 
 
 # ─────────────────────────────────────────────
@@ -734,15 +1075,20 @@ def tab_treemap(all_patents: Dict[str, List[Dict]]):
 # ─────────────────────────────────────────────
 def tab_spikes(
     all_patents: Dict[str, List[Dict]],
-    threshold: float,
+    cube: CountCube,
+    recent: RecentActivityIndex,
+    spike_mx: SpikeMatrix,
+    detector: str,
     email_cfg: Dict,
 ):
     st.subheader("⚡ Strategic Spike 감지 — Green Light Signal")
+    det = DETECTORS[detector]
+    st.caption(
+        f"탐지 방식: {det.label} · 임계값 {spike_mx.threshold_pct:g}{det.unit}"
+        + ("" if det.score is None else " · 최근 1개월 = 마지막 완결 달력 월")
+    )
 
-    all_spikes: Dict[str, List[Dict]] = {}
-    for company, patents in all_patents.items():
-        spikes = PatentAnalyzer.detect_spikes(patents, threshold_pct=threshold)
-        all_spikes[company] = spikes
+    all_spikes = get_spike_alerts(spike_mx, detector)
 
     # 신호등 표시
     for company, spikes in all_spikes.items():
@@ -769,19 +1115,14 @@ def tab_spikes(
 
     # 전체 비교 히트맵
     st.subheader("기업 × 기술 Spike 히트맵")
-    heatmap_rows = []
-    for company, spikes in all_spikes.items():
-        for s in spikes:
-            heatmap_rows.append({
-                "기업":       company,
-                "기술":       s["기술 카테고리"],
-                "급증률(%)":  s["급증률(%)"],
-            })
-    if heatmap_rows:
-        df_hm = pd.DataFrame(heatmap_rows).pivot_table(
-            index="기업", columns="기술", values="급증률(%)", fill_value=0
-        )
-        fig_hm = px.imshow(
+
+    def _heatmap():
+        df_hm = spike_mx.heatmap_frame()
+        if df_hm.empty:
+            return None
+        df_hm.index.name   = "기업"
+        df_hm.columns.name = "기술"
+        return px.imshow(
             df_hm,
             text_auto=".0f",
             aspect="auto",
@@ -789,8 +1130,62 @@ def tab_spikes(
             title="기업 × 기술 급증률(%) 히트맵",
             labels={"color": "급증률(%)"},
         )
+
+    fig_hm = memoized("spike_heatmap", detector, spike_mx.threshold_pct, build=_heatmap)
+    if fig_hm is not None:
         st.plotly_chart(fig_hm, use_container_width=True)
 
+    # 단기 모니터링 (일/주 링버퍼)
+    st.subheader("⏱ 단기 공개 모니터링")
+    windows = {"최근 48시간": ("days", 2), "최근 7일": ("days", 7),
+               "최근 4주": ("weeks", 4), "최근 12주": ("weeks", 12)}
+    win = st.radio("구간", list(windows.keys()), horizontal=True)
+    unit, n = windows[win]
+    recent.advance(datetime.now().date())      # 공유 인덱스는 add() 때만 전진 — 새 데이터 없이 날짜가 바뀐 경우
+    df_recent = recent.frame(**{unit: n})
+    df_recent = df_recent.loc[:, df_recent.sum(axis=0) > 0]
+    if df_recent.empty:
+        st.info(f"{win} 동안 공개된 특허가 없습니다.")
+    else:
+        st.dataframe(df_recent, use_container_width=True)
+        if unit == "days":
+            flat = [p for ps in all_patents.values() for p in ps]
+            rows = recent.rows_since(n)[::-1][:50]
+            st.dataframe(
+                pd.DataFrame([flat[i] for i in rows])[
+                    ["openDate", "applicantName", "inventionTitle", "ipcNumber"]
+                ].rename(columns={
+                    "openDate":       "공개일",
+                    "applicantName":  "출원인",
+                    "inventionTitle": "발명명칭",
+                    "ipcNumber":      "IPC",
+                }),
+                use_container_width=True,
+                hide_index=True,
+            )
+
+    # 탐지기 백테스트
+    with st.expander("🧪 탐지기 백테스트 (과거 월별 재현)"):
+        st.caption(
+            "각 월 시점에서 탐지기를 재현해, 이후 3개월 평균이 직전 11개월 평균의 1.5배 이상으로 "
+            "실제 급증한 경우를 적중으로 봅니다. 리드타임은 급증이 월 건수로 드러나기까지의 개월 수입니다."
+        )
+        # 작업 풀(프로세스)에서 계산 — 탐지기 · 임계값을 바꾸면 진행 중인 백테스트는 취소 후 재제출
+        if st.button("백테스트 실행") or "backtest_job" in st.session_state:
+            job = ensure_job(
+                "backtest_job",
+                (st.session_state.get("data_fingerprint"), detector, spike_mx.threshold_pct),
+                "탐지기 백테스트",
+                backtest, cube, thresholds={detector: spike_mx.threshold_pct},
+            )
+            try:
+                result = poll_job(job, key="backtest")
+            except Exception as e:
+                st.error(f"백테스트 오류: {e}")
+            else:
+                if result is not None:
+                    st.dataframe(result, use_container_width=True)
+
     # 이메일 발송
     st.subheader("📧 Spike 알림 이메일 발송")
     selected_company = st.selectbox("보고서 발송 기업", list(all_spikes.keys()))
@@ -823,7 +1218,12 @@ def tab_spikes(
 # ─────────────────────────────────────────────
 # Tab 4: 기업별 상세
 # ─────────────────────────────────────────────
-def tab_company_detail(all_patents: Dict[str, List[Dict]]):
+def tab_company_detail(
+    all_patents: Dict[str, List[Dict]],
+    cube: CountCube,
+    table: pd.DataFrame,
+    lag: RegistrationLag,
+):
     st.subheader("🏢 기업별 상세 분석")
 
     company = st.selectbox("기업", list(all_patents.keys()), key="detail_company")
@@ -834,68 +1234,124 @@ def tab_company_detail(all_patents: Dict[str, List[Dict]]):
         return
 
     # 기간별 버킷 건수
-    buckets = PatentAnalyzer.bucket_by_period(patents)
-    bucket_counts = {k: len(v) for k, v in buckets.items()}
-    fig_bucket = px.bar(
-        x=list(bucket_counts.keys()),
-        y=list(bucket_counts.values()),
-        title=f"{company} — 기간별 공개 특허 수",
-        labels={"x": "기간", "y": "공개 건수"},
-        color=list(bucket_counts.values()),
-        color_continuous_scale="Teal",
-    )
-    st.plotly_chart(fig_bucket, use_container_width=True)
+    only = {"company": company}
+
+    def _bucket():
+        bucket_counts = cube.period_counts(where=only)
+        return px.bar(
+            x=list(bucket_counts.keys()),
+            y=list(bucket_counts.values()),
+            title=f"{company} — 기간별 공개 특허 수",
+            labels={"x": "기간", "y": "공개 건수"},
+            color=list(bucket_counts.values()),
+            color_continuous_scale="Teal",
+        )
+
+    st.plotly_chart(memoized("detail_bucket", company, build=_bucket), use_container_width=True)
 
     # 기술 카테고리 도넛 차트
-    tech_counts: Dict[str, int] = {}
-    for p in patents:
-        cat = PatentAnalyzer.classify_tech_keyword(p["inventionTitle"], p["abstract"])
-        tech_counts[cat] = tech_counts.get(cat, 0) + 1
-
-    fig_pie = px.pie(
-        names=list(tech_counts.keys()),
-        values=list(tech_counts.values()),
-        title=f"{company} 기술 카테고리 분포",
-        hole=0.4,
-    )
-    st.plotly_chart(fig_pie, use_container_width=True)
-
-    # IPC 상위 10개
-    ipc_counts: Dict[str, int] = {}
-    for p in patents:
-        ipc = (p["ipcNumber"] or "").split(";")[0].strip()[:7]
-        if ipc:
-            ipc_counts[ipc] = ipc_counts.get(ipc, 0) + 1
-    top_ipc = sorted(ipc_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-    if top_ipc:
-        fig_ipc = px.bar(
-            x=[x[0] for x in top_ipc],
-            y=[x[1] for x in top_ipc],
-            title=f"{company} 상위 IPC 코드 (Top 10)",
+    def _pie():
+        df_tech = cube.frame("tech", where=only)
+        return px.pie(
+            names=df_tech["tech"],
+            values=df_tech["count"],
+            title=f"{company} 기술 카테고리 분포",
+            hole=0.4,
+        )
+
+    st.plotly_chart(memoized("detail_pie", company, build=_pie), use_container_width=True)
+
+    # IPC 상위 10개 — 전 기업 메인그룹 분포를 한 번에 만들어 두고 기업 행만 선택
+    def _top_ipc():
+        dist    = get_ipc_distribution(table)["group"]
+        top_ipc = dist[dist["company"] == company].head(10)
+        if top_ipc.empty:
+            return None
+        return px.bar(
+            x=top_ipc["group"].astype(str),
+            y=top_ipc["count"],
+            title=f"{company} 상위 IPC 메인그룹 (Top 10)",
             labels={"x": "IPC", "y": "건수"},
-            color=[x[1] for x in top_ipc],
+            color=top_ipc["count"],
             color_continuous_scale="Oranges",
         )
+
+    fig_ipc = memoized("detail_top_ipc", company, build=_top_ipc)
+    if fig_ipc is not None:
         st.plotly_chart(fig_ipc, use_container_width=True)
 
+    render_registration_lag(lag, company, table)
+
     # 특허 목록 테이블
     with st.expander("📋 전체 특허 목록"):
-        df_show = pd.DataFrame(patents)[
-            ["inventionTitle", "openDate", "applicationDate",
-             "ipcNumber", "applicantName", "registerStatus"]
-        ].rename(columns={
+        render_patent_table(table, company, {
             "inventionTitle":  "발명명칭",
             "openDate":        "공개일",
             "applicationDate": "출원일",
             "ipcNumber":       "IPC",
             "applicantName":   "출원인",
             "registerStatus":  "등록상태",
-        })
-        st.dataframe(df_show, use_container_width=True, height=500)
-        csv = df_show.to_csv(index=False).encode("utf-8-sig")
-        st.download_button("CSV 다운로드", csv, f"{company}_patents.csv", "text/csv")
+        }, key="detail_table", height=500)
+
+
+LAG_COLUMNS = {
+    "patents":          "특허 수",
+    "registered":       "등록",
+    "pending":          "심사 중",
+    "median_months":    "중앙값(개월)",
+    "p90_months":       "P90(개월)",
+    "km_median_months": "KM 중앙값(개월)",
+}
 
 
+def render_registration_lag(lag: RegistrationLag, company: str, table: pd.DataFrame):
+    """출원 → 등록 소요 기간: 전 기업 비교 + 선택 기업 상위 IPC 그룹 (데이터 로드 시 계산된 분포를 선택만)"""
+    st.markdown("#### ⏱ 출원 → 등록 소요 기간")
+    companies = lag.summaries["company"]
+    if companies.empty or not companies["registered"].any():
+        st.info("등록일 정보가 있는 특허가 없습니다. (데이터를 다시 불러오면 등록일이 포함됩니다)")
+        return
+    st.caption(
+        f"기준일 {lag.as_of} · 중앙값 · P90 은 등록된 특허 기준, "
+        "KM 중앙값은 심사 중 특허를 중도 절단으로 반영한 Kaplan–Meier 추정"
+    )
+
+    def _curves(dim: str, labels: List[str], title: str):
+        curve = lag.curve(dim, labels)
+        if curve.empty:
+            return None
+        fig = px.line(curve, x="month", y="survival", color=dim, title=title,
+                      labels={"month": "출원 후 개월", "survival": "미등록 비율", dim: ""})
+        fig.add_hline(y=0.5, line_dash="dot", line_color="gray")
+        return fig
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.dataframe(companies.rename(columns={"company": "기업", **LAG_COLUMNS}).round(1),
+                     hide_index=True, use_container_width=True)
+    with col2:
+        fig = memoized("detail_lag_company", build=lambda: _curves(
+            "company", companies["company"].tolist(), "기업별 등록 대기 생존 곡선"))
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True)
+
+    # 선택 기업의 상위 IPC 메인그룹 — 그룹별 소요 기간은 전 기업 특허 기준
+    dist   = get_ipc_distribution(table)["group"]
+    groups = dist.loc[dist["company"] == company, "group"].astype(str).head(8).tolist()
+    ipc    = lag.summaries["ipc"]
+    ipc    = ipc[ipc["ipc"].isin(groups)]
+    if ipc.empty:
+        return
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.dataframe(ipc.rename(columns={"ipc": f"{company} 상위 IPC", **LAG_COLUMNS}).round(1),
+                     hide_index=True, use_container_width=True)
+    with col2:
+        fig = memoized("detail_lag_ipc", company, build=lambda: _curves(
+            "ipc", ipc["ipc"].tolist(), "IPC 메인그룹별 등록 대기 생존 곡선 (전 기업)"))
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True)
+
 # ─────────────────────────────────────────────
 # Tab 5: Antigravity 프롬프트
 # ─────────────────────────────────────────────
@@ -903,19 +1359,19 @@ def tab_antigravity(
     all_patents: Dict[str, List[Dict]],
     period: str,
     threshold: float,
+    detector: str,
+    spike_mx: SpikeMatrix,
 ):
     st.subheader("🔮 Antigravity 실행 프롬프트")
     st.caption("아래 프롬프트를 복사하여 Antigravity 에이전트에 붙여넣으세요.")
 
-    all_spikes_flat: List[Dict] = []
-    for patents in all_patents.values():
-        all_spikes_flat.extend(
-            PatentAnalyzer.detect_spikes(patents, threshold_pct=threshold)
-        )
+    def _prompt():
+        all_spikes_flat: List[Dict] = []
+        for spikes in get_spike_alerts(spike_mx, detector).values():
+            all_spikes_flat.extend(spikes)
+        return build_antigravity_prompts(list(all_patents.keys()), period, all_spikes_flat)
 
-    prompt_text = build_antigravity_prompts(
-        list(all_patents.keys()), period, all_spikes_flat
-    )
+    prompt_text = memoized("antigravity_prompt", period, detector, threshold, build=_prompt)
     st.code(prompt_text, language="bash")
 
     if st.button("클립보드에 복사 (텍스트 영역)"):
@@ -932,6 +1388,7 @@ def tab_antigravity(
         "analysis_config": {
             "target_companies": list(all_patents.keys()),
             "period":           period,
+            "spike_detector":      detector,
             "spike_threshold_pct": threshold,
             "signal_colors": {
                 "strategic_spike": "#00FF00",
@@ -962,41 +1419,52 @@ def tab_antigravity(
 # ─────────────────────────────────────────────
 # Tab 6: Firebase 동기화
 # ─────────────────────────────────────────────
-def tab_firebase(all_patents: Dict[str, List[Dict]], period: str, threshold: float):
-    st.subheader("🔥 Firebase 대시보드 데이터 구조")
-    st.caption("실제 Firebase 연동 시 아래 JSON을 'dashboard_trends' 컬렉션에 저장합니다.")
-
+def build_firebase_payload(
+    all_patents: Dict[str, List[Dict]],
+    period: str,
+    cube: CountCube,
+    all_spikes: Dict[str, List[Dict]],
+) -> Dict:
     payload = {
         "generated_at": datetime.now().isoformat(),
         "period":        period,
         "companies": {},
     }
-    for company, patents in all_patents.items():
-        buckets = PatentAnalyzer.bucket_by_period(patents)
-        spikes  = PatentAnalyzer.detect_spikes(patents, threshold_pct=threshold)
-        df      = PatentAnalyzer.build_treemap_data(patents, company)
-
-        tech_tree: Dict = {}
-        if not df.empty:
-            for _, row in df.iterrows():
-                l1 = row["l1"]
-                l2 = row["l2"]
-                l3 = row["l3"]
-                tech_tree.setdefault(l1, {}).setdefault(l2, {}).setdefault(l3, 0)
-                tech_tree[l1][l2][l3] += 1  # type: ignore
+    for company in all_patents:
+        only   = {"company": company}
+        spikes = all_spikes.get(company, [])
 
         payload["companies"][company] = {
-            "buckets": {k: len(v) for k, v in buckets.items()},
+            "buckets": cube.period_counts(where=only),
             "spikes":  [
                 {**s, "signal_color": "#00FF00" if "Spike" in s["신호"] else "#FFA500"}
                 for s in spikes
             ],
-            "ipc_tree": tech_tree,
+            "ipc_tree": cube.ipc_tree(where=only),
         }
+    return payload
+
 
+def tab_firebase(
+    all_patents: Dict[str, List[Dict]],
+    period: str,
+    cube: CountCube,
+    spike_mx: SpikeMatrix,
+    detector: str,
+):
+    st.subheader("🔥 Firebase 대시보드 데이터 구조")
+    st.caption("실제 Firebase 연동 시 아래 JSON을 'dashboard_trends' 컬렉션에 저장합니다.")
+
+    payload = memoized(
+        "firebase_payload", period, detector, spike_mx.threshold_pct,
+        build=lambda: build_firebase_payload(all_patents, period, cube, get_spike_alerts(spike_mx, detector)),
+    )
     st.json(payload)
 
-    json_bytes = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    json_bytes = memoized(
+        "firebase_json", period, detector, spike_mx.threshold_pct,
+        build=lambda: json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8"),
+    )
     st.download_button(
         "dashboard_trends.json 다운로드",
         json_bytes,
@@ -1005,6 +1473,98 @@ def tab_firebase(all_patents: Dict[str, List[Dict]], period: str, threshold: flo
     )
 
 
+# ─────────────────────────────────────────────
+# Tab 7: 신규 기술 토픽 (NMF)
+# ─────────────────────────────────────────────
+def tab_topics(all_patents: Dict[str, List[Dict]], corpus: PatentCorpus):
+    st.subheader("🧭 신규 기술 토픽")
+    st.caption(
+        "고정 기술 키워드 대신 제목 + 요약의 TF-IDF 를 NMF 로 분해해 토픽을 찾습니다. "
+        "같은 데이터는 저장된 분해를 재사용하고, 새 데이터는 직전 분해에서 이어서 계산합니다."
+    )
+
+    c1, c2, c3 = st.columns(3)
+    n_topics = c1.slider("토픽 수", 5, 30, N_TOPICS, key="topic_k")
+    window   = c2.selectbox("성장률 비교 구간 (개월)", [1, 3, 6], index=1, key="topic_window",
+                            help="최근 n개월 토픽 가중치 vs 그 직전 n개월")
+    min_docs = c3.number_input("최소 최근 건수", min_value=0.0, value=3.0, step=1.0, key="topic_min_docs",
+                               help="최근 구간 토픽 가중치(특허 건수 단위)가 이보다 작은 조합은 성장 순위에서 제외")
+
+    # 작업 풀(프로세스)에서 계산 — 토픽 수 · 구간을 바꾸면 진행 중인 작업은 취소 후 재제출
+    if not (st.button("토픽 분석 실행") or "topic_job" in st.session_state):
+        return
+    fp     = st.session_state.get("data_fingerprint")
+    shared = get_shared_artifacts()
+    texts  = [
+        f"{p.get('inventionTitle') or ''} {p.get('abstract') or ''}"
+        for patents in all_patents.values() for p in patents
+    ]
+    job = ensure_job(
+        "topic_job", (fp, n_topics, window), "토픽 분석",
+        topic_report, texts, corpus.company_idx, corpus.open_day, list(corpus.companies),
+        n_topics=n_topics, cache_path=SHARED_DB_PATH if shared else None, fingerprint=fp,
+        growth_months=window,
+    )
+    try:
+        result = poll_job(job, key="topics")
+    except Exception as e:
+        st.error(f"토픽 분석 오류: {e}")
+        return
+    if result is None:
+        return
+
+    meta = result["meta"]
+    st.caption(
+        f"문서 {meta['n_docs']:,}건 · 어휘 {meta['n_terms']:,}개 · "
+        f"{'저장된 분해 재사용' if meta['cached'] else ('직전 분해에서 웜스타트' if meta['warm'] else '새로 분해')} · "
+        f"{meta['seconds']:.1f}s"
+    )
+    st.dataframe(result["topics"].rename(columns={"topic": "토픽", "terms": "상위 단어"}),
+                 hide_index=True, use_container_width=True)
+
+    growth = result["growth"]
+    ranked = growth[growth["recent"] >= min_docs].sort_values(
+        ["new", "growth_pct"], ascending=False, na_position="last"
+    )
+
+    def _heatmap():
+        pivot = growth.pivot(index="company", columns="topic", values="growth_pct")
+        fig = px.imshow(
+            pivot.clip(-100, 300),
+            color_continuous_scale="RdBu_r",
+            color_continuous_midpoint=0,
+            aspect="auto",
+            title=f"기업 × 토픽 성장률 (최근 {window}개월 vs 직전 {window}개월, %)",
+        )
+        fig.update_xaxes(tickangle=-30)
+        return fig
+
+    st.plotly_chart(memoized("topic_heatmap", n_topics, window, build=_heatmap), use_container_width=True)
+
+    st.markdown("**성장 상위 기업 · 토픽**")
+    st.dataframe(
+        ranked.head(20).rename(columns={
+            "company": "기업", "topic": "토픽", "recent": "최근", "previous": "직전",
+            "growth_pct": "성장률(%)", "new": "신규",
+        }),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    topic = st.selectbox("토픽 월별 추이", result["topics"]["topic"].tolist(), key="topic_pick")
+    monthly = result["monthly"]
+
+    def _trend():
+        return px.line(
+            monthly[monthly["topic"] == topic],
+            x="month", y="weight", color="company", markers=True,
+            title=f"{topic} — 기업별 월별 가중치 (건수 단위)",
+            labels={"month": "공개월", "weight": "가중치", "company": "기업"},
+        )
+
+    st.plotly_chart(memoized("topic_trend", n_topics, window, topic, build=_trend), use_container_width=True)
+
+
 # ─────────────────────────────────────────────
 # 메인
 # ─────────────────────────────────────────────
@@ -1017,7 +1577,9 @@ def main():
         "Strategic Spike 감지 · Antigravity 연동"
     )
 
-    selected, period, threshold, email_cfg, run_btn = render_sidebar()
+    warmer = start_cache_warmer()
+    selected, period, threshold, detector, email_cfg, run_btn = render_sidebar()
+    render_freshness(warmer)
     st.session_state["selected_period"]    = period
     st.session_state["selected_companies"] = selected
 
@@ -1026,50 +1588,56 @@ def main():
         return
 
     if run_btn:
-        months      = PERIOD_MONTHS[period]
-        end_dt      = datetime.now()
-        start_dt    = end_dt - timedelta(days=int(months * 30.44))
-        start_str   = start_dt.strftime("%Y%m%d")
-        end_str     = end_dt.strftime("%Y%m%d")
-
-        all_patents: Dict[str, List[Dict]] = {}
-        progress = st.progress(0, text="특허 데이터 수집 중...")
-        for i, company in enumerate(selected, 1):
-            progress.progress(i / len(selected), text=f"{company} 수집 중...")
-            q = COMPANIES[company]["query"]
-            patents = load_patents(q, start_str, end_str)
-            all_patents[company] = patents
-            st.toast(f"{company}: {len(patents)}건 수집 완료", icon="✅")
-        progress.empty()
-
-        st.session_state["patents_cache"] = all_patents
-
-    all_patents = st.session_state.get("patents_cache", {})
-
-    if not all_patents:
+        start_str, end_str = period_range(period)
+        all_patents = load_companies_progressively(selected, start_str, end_str)
+
+        handle = attach_data(all_patents)
+        st.session_state.pop("snapshot_meta", None)
+        # 다음 콜드 스타트용 스냅샷은 화면을 막지 않도록 작업 풀 스레드에서 저장
+        state = {k: handle[k] for k in ("patent_corpus", "patent_cube", "registration_lag")}
+        job   = shared_pool().submit("스냅샷 저장", write_snapshot, list(selected), period, handle["patents"], state,
+                                     kind="io")
+        job.future.add_done_callback(log_job_failure("스냅샷 저장"))
+
+    # 세션 사본으로 들어온 데이터(이전 방식 · 외부 주입)는 공용 저장소로 옮기고 사본은 버림
+    legacy = st.session_state.pop("patents_cache", None)
+    if legacy:
+        attach_data(legacy)
+
+    handle = st.session_state.get("data_handle") or restore_snapshot()
+    if handle is None or not handle["patents"]:
         return
 
-    tabs = st.tabs([
-        "📊 대시보드 개요",
-        "🌳 트리맵 드릴다운",
-        "⚡ Spike 감지",
-        "🏢 기업 상세",
-        "🔮 Antigravity 프롬프트",
-        "🔥 Firebase 구조",
-    ])
-
-    with tabs[0]:
-        tab_overview(all_patents, period)
-    with tabs[1]:
-        tab_treemap(all_patents)
-    with tabs[2]:
-        tab_spikes(all_patents, threshold, email_cfg)
-    with tabs[3]:
-        tab_company_detail(all_patents)
-    with tabs[4]:
-        tab_antigravity(all_patents, period, threshold)
-    with tabs[5]:
-        tab_firebase(all_patents, period, threshold)
+    snap = st.session_state.get("snapshot_meta")
+    if snap:
+        st.caption(
+            f"💾 마지막 분석 스냅샷 ({_format_age(time.time() - snap['saved_at'])} · "
+            f"{', '.join(snap['selected'])} · {snap['period']}) — **분석 실행**으로 현재 선택을 다시 분석합니다."
+        )
+
+    # 데이터 로드 시 1회 만든 카운트 큐브 — 모든 탭은 큐브 슬라이스/롤업만 수행
+    all_patents = handle["patents"]
+    cube   = handle["patent_cube"]
+    recent = handle["recent_index"]
+    table  = handle["patent_table"]
+    render_resource_usage()
+
+    # st.tabs 는 모든 탭 본문을 매번 실행하므로, 라디오 내비게이션으로 활성 탭만 계산 · 렌더링
+    def spike_mx() -> SpikeMatrix:      # Spike 를 쓰는 탭에서만 계산 (메모)
+        return get_spike_matrix(cube, threshold, detector)
+
+    tabs = {
+        "📊 대시보드 개요":       lambda: tab_overview(all_patents, period, cube, spike_mx()),
+        "🌳 트리맵 드릴다운":     lambda: tab_treemap(all_patents, cube, table),
+        "⚡ Spike 감지":          lambda: tab_spikes(all_patents, cube, recent, spike_mx(), detector, email_cfg),
+        "🏢 기업 상세":           lambda: tab_company_detail(all_patents, cube, table, handle["registration_lag"]),
+        "🔮 Antigravity 프롬프트": lambda: tab_antigravity(all_patents, period, threshold, detector, spike_mx()),
+        "🔥 Firebase 구조":       lambda: tab_firebase(all_patents, period, cube, spike_mx(), detector),
+        "🧭 신규 토픽":           lambda: tab_topics(all_patents, handle["patent_corpus"]),
+    }
+    active = st.radio("화면", list(tabs), horizontal=True, key="active_tab", label_visibility="collapsed")
+    st.divider()
+    tabs[active]()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,478 @@
+"""
+특허 표 통계 (streamlit 비의존, pandas 벡터 연산)
+- IPC 분포: 다중 IPC 문자열을 explode → 범주형 → 고유 코드에서만 정규식 파싱 →
+  섹션 / 서브클래스 / 메인그룹 / 서브그룹 분포를 그룹(기업 등)별로 한 번에
+- new_app.py · patent_intelligence_dashboard.py 가 같은 API 를 사용
+- 기술 성숙도: IPC 그룹 · 기술 카테고리별 누적 출원 로지스틱 S-커브를 수천 계열 한 번에 적합
+- 출원 → 등록 소요 기간: 기업 · IPC 그룹별 중앙값 · P90 · Kaplan–Meier 생존 곡선 (심사 중 특허는 중도 절단)
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from patent_engine import pack_npz, unpack_npz
+
+IPC_LEVELS = ("section", "subclass", "group", "subgroup")
+IPC_SEPARATORS = r"\s*[|;,]\s*"      # KIPRIS 는 '|', 일부 원천 데이터는 ';' · ','
+IPC_SECTIONS = {
+    'A': '생활필수품',
+    'B': '처리조작/운수',
+    'C': '화학/야금',
+    'D': '섬유/지류',
+    'E': '고정구조물',
+    'F': '기계공학',
+    'G': '물리학',
+    'H': '전기',
+}
+# 'H01L 21/02' · 'H01L21/02' · 'H01L' 모두 허용 → 섹션 H · 서브클래스 H01L · 메인그룹 H01L 21 · 서브그룹 H01L 21/02
+_IPC_RE = r"^(?P<section>[A-H])(?P<cls>\d{2}[A-Z])\s*(?P<main>\d{1,4})?\s*(?:/\s*(?P<sub>\d{1,6}))?"
+
+
+def explode_ipc(df: pd.DataFrame, column: str = "ipcNumber", by: Optional[str] = None) -> pd.DataFrame:
+    """
+    특허 1행 → IPC 코드 1행 (row: 원래 행 위치, by 컬럼 유지) + 레벨별 범주형 컬럼.
+    파싱은 고유 코드(범주)에서만 하므로 비용은 특허 수가 아니라 서로 다른 코드 수에 비례한다.
+    해석할 수 없는 코드는 레벨 값이 NaN.
+    """
+    codes = (
+        pd.Series(df[column].to_numpy()).fillna("").astype(str).str.upper()
+        .str.split(IPC_SEPARATORS, regex=True)
+        .explode()
+        .str.strip()
+    )
+    codes = codes[codes.str.len() > 0]
+    cat   = codes.astype("category")
+    parts = cat.cat.categories.to_series().str.extract(_IPC_RE)
+
+    subclass = parts["section"] + parts["cls"]
+    group    = subclass + " " + parts["main"]
+    levels = {
+        "section":  parts["section"],
+        "subclass": subclass,
+        "group":    group,
+        "subgroup": group + "/" + parts["sub"],
+    }
+
+    rows = codes.index.to_numpy()
+    out  = pd.DataFrame({"row": rows})
+    if by is not None:
+        out[by] = df[by].take(rows).reset_index(drop=True)       # 범주형 기업 컬럼은 범주형 그대로
+    code_idx = cat.cat.codes.to_numpy()
+    for level, values in levels.items():
+        # 범주 → 레벨 값 매핑도 범주 단위 (take) 후 다시 범주형으로
+        out[level] = pd.Categorical(values.to_numpy()[code_idx])
+    return out
+
+
+def ipc_distribution(
+    df: pd.DataFrame,
+    by: Optional[str] = None,
+    column: str = "ipcNumber",
+    levels: Sequence[str] = IPC_LEVELS,
+    per_patent: bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """
+    레벨 → 분포 표 [by, 레벨, count, share]. count 내림차순(그룹 안에서), share 는 그룹 내 비율.
+    per_patent=True 면 한 특허에 같은 레벨 값이 여러 번 나와도 1건으로 센다 (특허 수 기준).
+    """
+    ex   = explode_ipc(df, column, by)
+    keys = [by] if by is not None else []
+    out: Dict[str, pd.DataFrame] = {}
+    for level in levels:
+        sub = ex[ex[level].notna()]
+        if per_patent:
+            sub = sub.drop_duplicates(["row", level])
+        counts = (
+            sub.groupby(keys + [level], observed=True, sort=False).size()
+            .rename("count").reset_index()
+        )
+        counts = counts.sort_values(keys + ["count"], ascending=[True] * len(keys) + [False], kind="stable")
+        total  = counts.groupby(keys, observed=True)["count"].transform("sum") if keys else counts["count"].sum()
+        counts["share"] = counts["count"] / total
+        out[level] = counts.reset_index(drop=True)
+    return out
+
+
+def ipc_section_label(codes: pd.Series) -> pd.Series:
+    """IPC 코드 → 'H: 전기' 형식 섹션 설명 (목록에 없는 섹션은 '기타')"""
+    section = codes.astype(str).str[0]
+    return section + ": " + section.map(IPC_SECTIONS).fillna("기타")
+
+
+# ─────────────────────────────────────────────
+# 기술 성숙도 (로지스틱 S-커브 일괄 적합)
+# ─────────────────────────────────────────────
+S_CURVE_MIN_PATENTS = 5       # 이보다 특허가 적은 계열은 적합하지 않음
+S_CURVE_MAX_RATIO   = 100.0   # 포화 수준 상한 = 현재 누적의 100배 (초기 지수 성장 계열의 발산 방지)
+S_CURVE_ITERATIONS  = 100
+MATURITY_STAGES = (           # 현재 누적 / 포화 수준 경계
+    ("emerging",  0.10),
+    ("growth",    0.50),
+    ("mature",    0.90),
+    ("saturated", np.inf),
+)
+
+
+def logistic(t: np.ndarray, saturation: np.ndarray, rate: np.ndarray, inflection: np.ndarray) -> np.ndarray:
+    """K / (1 + exp(−r (t − t0)))"""
+    return saturation / (1.0 + np.exp(-rate * (t - inflection)))
+
+
+def fit_logistic(t: np.ndarray, Y: np.ndarray, iterations: int = S_CURVE_ITERATIONS) -> Dict[str, np.ndarray]:
+    """
+    누적 건수 계열 Y (계열 수 × 시점 수) 전부를 한 번에 로지스틱 최소제곱 적합 (배치 Levenberg–Marquardt).
+    계열마다 마지막 누적값으로 정규화하고 K = 1 + e^a, r = e^b 로 매개변수화해
+    포화 수준 ≥ 현재 누적 · 성장률 > 0 을 보장한다. 3×3 정규방정식을 계열 축으로 쌓아 np.linalg.solve 한 번.
+    반환: saturation · rate · inflection · r2 · capped(포화 수준 상한에 걸림) 배열.
+    """
+    t    = np.asarray(t, dtype=np.float64)
+    Y    = np.asarray(Y, dtype=np.float64)
+    S    = Y.shape[0]
+    last = np.maximum(Y[:, -1], 1.0)
+    y    = Y / last[:, None]
+    tc   = t - t.mean()
+    span = max(float(tc.max() - tc.min()), 1.0)
+    a_max = np.log(S_CURVE_MAX_RATIO - 1.0)
+
+    # 초기값: K = 2 × 현재, t0 = 마지막 시점, r = 8 / 기간
+    p = np.column_stack([np.zeros(S), np.full(S, np.log(8.0 / span)), np.full(S, tc[-1])])
+    lam = np.full(S, 1e-2)
+
+    def _model(p):
+        K, r, t0 = 1.0 + np.exp(p[:, 0]), np.exp(p[:, 1]), p[:, 2]
+        s = 1.0 / (1.0 + np.exp(-r[:, None] * (tc[None, :] - t0[:, None])))
+        return K, r, t0, s
+
+    def _sse(p):
+        K, _, _, s = _model(p)
+        return ((y - K[:, None] * s) ** 2).sum(axis=1)
+
+    sse = _sse(p)
+    for _ in range(iterations):
+        K, r, t0, s = _model(p)
+        ds  = s * (1.0 - s)
+        res = y - K[:, None] * s
+        J   = np.stack([
+            (K[:, None] - 1.0) * s,                                  # ∂/∂a
+            K[:, None] * ds * (tc[None, :] - t0[:, None]) * r[:, None],   # ∂/∂b
+            -K[:, None] * ds * r[:, None],                           # ∂/∂t0
+        ], axis=2)
+        JtJ = np.einsum("stp,stq->spq", J, J)
+        Jtr = np.einsum("stp,st->sp", J, res)
+        diag = np.einsum("spp->sp", JtJ)
+        A    = JtJ + (lam[:, None] * np.maximum(diag, 1e-9))[:, :, None] * np.eye(3)
+        step = np.linalg.solve(A, Jtr[:, :, None])[:, :, 0]
+        cand = p + step
+        cand[:, 0] = np.minimum(cand[:, 0], a_max)
+        cand[:, 1] = np.clip(cand[:, 1], np.log(0.05 / span), np.log(50.0 / span))
+        new  = _sse(cand)
+        ok   = new < sse
+        p[ok]   = cand[ok]
+        sse     = np.where(ok, new, sse)
+        lam     = np.where(ok, lam * 0.3, lam * 10.0)
+        if np.all(lam > 1e6):               # 모든 계열이 더 줄일 수 없는 상태
+            break
+
+    K, r, t0, _ = _model(p)
+    tss = ((y - y.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(tss > 0, 1.0 - sse / tss, np.nan)
+    return {
+        "saturation": K * last,
+        "rate":       r,
+        "inflection": t0 + t.mean(),
+        "r2":         r2,
+        "capped":     p[:, 0] >= a_max - 1e-9,
+    }
+
+
+def maturity_stage(fraction: np.ndarray) -> np.ndarray:
+    """현재 누적 / 포화 수준 → 성숙 단계 라벨"""
+    bounds = np.array([b for _, b in MATURITY_STAGES[:-1]])
+    labels = np.array([name for name, _ in MATURITY_STAGES], dtype=object)
+    return labels[np.searchsorted(bounds, fraction, side="right")]
+
+
+def yearly_counts(keys: pd.Series, years: pd.Series) -> Tuple[list, np.ndarray, np.ndarray]:
+    """(계열 라벨, 연도 축, 계열 × 연도 건수) — 빈 연도는 0 으로 채운 연속 연도 축"""
+    ok    = keys.notna().to_numpy() & years.notna().to_numpy()
+    k     = keys[ok].astype(str).to_numpy()
+    yr    = years[ok].astype(int).to_numpy()
+    if not len(yr):
+        return [], np.array([], dtype=int), np.zeros((0, 0))
+    axis  = np.arange(yr.min(), yr.max() + 1)
+    codes, labels = pd.factorize(k, sort=True)
+    counts = np.zeros((len(labels), len(axis)))
+    np.add.at(counts, (codes, yr - axis[0]), 1)
+    return list(labels), axis, counts
+
+
+def s_curve_table(
+    series: Dict[str, Tuple[pd.Series, pd.Series]],
+    min_patents: int = S_CURVE_MIN_PATENTS,
+    last_year: Optional[int] = None,
+) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """
+    series: 레벨 이름 → (계열 키, 연도) 행 단위 Series 쌍 (예: IPC 메인그룹 · 기술 카테고리).
+    모든 레벨의 계열을 같은 연도 축에 쌓아 fit_logistic 한 번으로 적합.
+    last_year 이후 연도는 제외 — 진행 중인 해의 덜 찬 건수가 포화처럼 보이지 않도록 완결 연도까지만 적합.
+    반환: (계열별 표 [level, series, patents, saturation, inflection, rate, r2, capped, fraction, stage],
+           연도 축, 계열 × 연도 누적 건수)
+    """
+    blocks = []
+    for level, (keys, years) in series.items():
+        if last_year is not None:
+            years = years.where(pd.to_numeric(years, errors="coerce") <= last_year)
+        labels, axis, counts = yearly_counts(keys, years)
+        if labels:
+            blocks.append((level, labels, axis, counts))
+    if not blocks:
+        empty = pd.DataFrame(columns=["level", "series", "patents", "saturation", "inflection",
+                                      "rate", "r2", "capped", "fraction", "stage"])
+        return empty, np.array([], dtype=int), np.zeros((0, 0))
+
+    lo = min(b[2][0] for b in blocks)
+    hi = max(b[2][-1] for b in blocks)
+    axis = np.arange(lo, hi + 1)
+    rows, mats = [], []
+    for level, labels, ax, counts in blocks:
+        full = np.zeros((len(labels), len(axis)))
+        full[:, ax[0] - lo: ax[-1] - lo + 1] = counts
+        keep = full.sum(axis=1) >= min_patents
+        rows.append(pd.DataFrame({"level": level, "series": np.asarray(labels, dtype=object)[keep]}))
+        mats.append(full[keep])
+    table = pd.concat(rows, ignore_index=True)
+    cum   = np.cumsum(np.vstack(mats), axis=1)
+
+    fit = fit_logistic(axis, cum) if len(cum) else {k: np.array([]) for k in
+                                                    ("saturation", "rate", "inflection", "r2", "capped")}
+    table["patents"]    = cum[:, -1].astype(int) if len(cum) else []
+    table["saturation"] = fit["saturation"]
+    table["inflection"] = fit["inflection"]
+    table["rate"]       = fit["rate"]
+    table["r2"]         = fit["r2"]
+    table["capped"]     = fit["capped"]
+    table["fraction"]   = table["patents"] / table["saturation"]
+    table["stage"]      = maturity_stage(table["fraction"].to_numpy())
+    return table, axis, cum
+
+
+# ─────────────────────────────────────────────
+# 출원 → 등록 소요 기간 (분위수 · Kaplan–Meier 생존 곡선)
+# ─────────────────────────────────────────────
+LAG_MAX_MONTHS   = 120          # 생존 곡선 월 축 (이보다 긴 기간은 이 시점에서 중도 절단)
+LAG_MIN_PATENTS  = 5            # 이보다 특허가 적은 그룹은 요약하지 않음
+LAG_QUANTILES    = (0.5, 0.9)
+DAYS_PER_MONTH   = 30.44
+REFUSED_STATUSES = ("거절", "취하", "포기", "무효")   # 등록 없이 종결 — 등록 대기 집합에서 제외
+
+
+def parse_dates(values) -> np.ndarray:
+    """
+    'YYYYMMDD' · 'YYYY.MM.DD' · 'YYYY-MM-DD' · 빈 값 혼합 → datetime64[D] (해석할 수 없으면 NaT).
+    고유 값에서만 파싱하고 입력 컬럼은 바꾸지 않는다.
+    """
+    values = values if isinstance(values, pd.Series) else pd.Series(np.asarray(values, dtype=object))
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values.to_numpy().astype("datetime64[D]")
+    codes, uniques = pd.factorize(values.to_numpy())
+    digits = pd.Series(uniques, dtype=object).astype(str).str.replace(r"\D", "", regex=True).str[:8]
+    parsed = pd.to_datetime(digits, format="%Y%m%d", errors="coerce").to_numpy().astype("datetime64[D]")
+    out    = np.full(len(codes), np.datetime64("NaT"), dtype="datetime64[D]")
+    valid  = codes >= 0
+    out[valid] = parsed[codes[valid]]
+    return out
+
+
+def registration_lags(
+    application,
+    register,
+    status=None,
+    as_of: Optional[datetime] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    특허별 (경과 일수, 등록 여부). 등록일이 있으면 출원 → 등록 일수(사건),
+    없으면 출원 → as_of 일수(아직 심사 중 — 중도 절단).
+    출원일이 없거나 등록일이 출원일보다 앞서거나, 등록 없이 종결(status 가 거절 · 취하 등)된 특허는 NaN.
+    """
+    app   = parse_dates(application)
+    reg   = parse_dates(register)
+    as_of = np.datetime64((as_of or datetime.now()).date(), "D")
+    event = ~np.isnat(reg)
+    end   = np.where(event, reg, as_of)
+    drop  = np.isnat(app)
+    days  = (end - np.where(drop, end, app)).astype(np.int64).astype(np.float64)
+    drop |= days < 0
+    if status is not None:
+        drop |= ~event & pd.Series(np.asarray(status, dtype=object)).isin(REFUSED_STATUSES).to_numpy()
+    days[drop] = np.nan
+    return days, event & ~drop
+
+
+def group_quantiles(groups: np.ndarray, values: np.ndarray, n_groups: int,
+                    quantiles: Sequence[float] = LAG_QUANTILES) -> np.ndarray:
+    """
+    그룹별 분위수 (그룹 수 × 분위수 수, np.quantile 선형 보간과 같음).
+    (그룹, 값) 정렬 한 번 후 그룹 시작 위치 + 분위 위치를 인덱싱 — 값이 없는 그룹은 NaN.
+    """
+    order  = np.lexsort((values, groups))
+    v      = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    out    = np.full((n_groups, len(quantiles)), np.nan)
+    has    = counts > 0
+    for j, q in enumerate(quantiles):
+        pos  = q * (counts[has] - 1)
+        lo   = np.floor(pos).astype(np.int64)
+        frac = pos - lo
+        hi   = np.minimum(lo + 1, counts[has] - 1)
+        out[has, j] = v[starts[has] + lo] * (1 - frac) + v[starts[has] + hi] * frac
+    return out
+
+
+def kaplan_meier(groups: np.ndarray, months: np.ndarray, event: np.ndarray, n_groups: int,
+                 max_months: int = LAG_MAX_MONTHS) -> np.ndarray:
+    """
+    그룹별 월 단위 Kaplan–Meier 생존 곡선 S[g, k] = 출원 후 k개월이 지나도록 미등록일 확률.
+    (그룹, 월) 사건 · 중도 절단 수를 bincount 로 모아 위험 집합 = 그룹 전체 − 이전 달까지 빠진 수,
+    S = cumprod(1 − 사건 / 위험 집합). 위험 집합이 빈 뒤는 NaN.
+    """
+    event  = event & (months <= max_months)
+    months = np.minimum(months, max_months)
+    width  = max_months + 1
+    flat   = groups * width + months
+    d = np.bincount(flat[event], minlength=n_groups * width).reshape(n_groups, width)
+    c = np.bincount(flat[~event], minlength=n_groups * width).reshape(n_groups, width)
+    leaving = d + c
+    at_risk = leaving.sum(axis=1, keepdims=True) - (np.cumsum(leaving, axis=1) - leaving)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hazard = np.where(at_risk > 0, d / at_risk, 0.0)
+    S = np.cumprod(1.0 - hazard, axis=1)
+    S[at_risk == 0] = np.nan
+    return S
+
+
+def survival_median(S: np.ndarray) -> np.ndarray:
+    """생존 곡선이 처음 0.5 이하가 되는 월 (도달하지 않으면 NaN)"""
+    below = S <= 0.5
+    first = np.argmax(below, axis=1).astype(np.float64)
+    first[~below.any(axis=1)] = np.nan
+    return first
+
+
+class RegistrationLag:
+    """
+    출원 → 등록 소요 기간 분포. 기준(dim: 기업 · IPC 메인그룹 등)마다
+    summary: [dim, patents, registered, pending, median_months, p90_months, km_median_months]
+    survival: 그룹 × 월(0 ~ LAG_MAX_MONTHS) Kaplan–Meier 생존 곡선.
+    median · p90 은 등록된 특허만의 분위수라 심사 중 특허가 많으면 짧게 치우친다 —
+    km_median 은 심사 중 특허를 중도 절단으로 반영한 값.
+    """
+
+    def __init__(self, summaries: Dict[str, pd.DataFrame], survival: Dict[str, np.ndarray], as_of: str):
+        self.summaries = summaries
+        self.survival  = survival
+        self.as_of     = as_of
+
+    @classmethod
+    def from_table(
+        cls,
+        df: pd.DataFrame,
+        by: Sequence[str] = ("company",),
+        ipc_level: Optional[str] = "group",
+        as_of: Optional[datetime] = None,
+        min_patents: int = LAG_MIN_PATENTS,
+        max_months: int = LAG_MAX_MONTHS,
+    ) -> "RegistrationLag":
+        """
+        특허 표(applicationDate · registerDate · registerStatus · ipcNumber) → 기준별 분포.
+        by 컬럼마다 한 기준, ipc_level 이 있으면 'ipc' 기준 추가 (한 특허의 같은 코드는 1건).
+        """
+        as_of = as_of or datetime.now()
+        days, event = registration_lags(
+            df["applicationDate"], df["registerDate"] if "registerDate" in df.columns else [""] * len(df),
+            df["registerStatus"] if "registerStatus" in df.columns else None, as_of,
+        )
+        keys = {col: (np.arange(len(df)), df[col]) for col in by}
+        if ipc_level:
+            ipc = explode_ipc(df).drop_duplicates(["row", ipc_level])
+            keys["ipc"] = (ipc["row"].to_numpy(), ipc[ipc_level])
+
+        summaries, survival = {}, {}
+        for dim, (rows, labels) in keys.items():
+            summaries[dim], survival[dim] = cls._dimension(
+                dim, days[rows], event[rows], labels, min_patents, max_months,
+            )
+        return cls(summaries, survival, as_of.date().isoformat())
+
+    @staticmethod
+    def _dimension(dim: str, days: np.ndarray, event: np.ndarray, labels,
+                   min_patents: int, max_months: int) -> Tuple[pd.DataFrame, np.ndarray]:
+        codes, uniques = pd.factorize(pd.Series(labels).to_numpy())
+        valid  = (codes >= 0) & ~np.isnan(days)
+        codes, days, event = codes[valid], days[valid], event[valid]
+        counts = np.bincount(codes, minlength=len(uniques))
+        keep   = np.flatnonzero(counts >= min_patents)
+        remap  = np.full(len(uniques), -1)
+        remap[keep] = np.arange(len(keep))
+        codes  = remap[codes]
+        sel    = codes >= 0
+        codes, days, event = codes[sel], days[sel], event[sel]
+
+        months = np.ceil(days / DAYS_PER_MONTH).astype(np.int64)
+        S      = kaplan_meier(codes, months, event, len(keep), max_months)
+        q      = group_quantiles(codes[event], days[event] / DAYS_PER_MONTH, len(keep))
+        registered = np.bincount(codes[event], minlength=len(keep))
+        summary = pd.DataFrame({
+            dim:                np.asarray(uniques, dtype=object)[keep].astype(str),
+            "patents":          counts[keep],
+            "registered":       registered,
+            "pending":          counts[keep] - registered,
+            "median_months":    q[:, 0],
+            "p90_months":       q[:, 1],
+            "km_median_months": survival_median(S),
+        })
+        order = np.argsort(-summary["patents"].to_numpy(), kind="stable")
+        return summary.iloc[order].reset_index(drop=True), S[order]
+
+    def curve(self, dim: str, labels: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """생존 곡선 long 형식 [dim, month, survival] (labels 로 그룹 선택, NaN 구간 제외)"""
+        summary = self.summaries[dim]
+        S       = self.survival[dim]
+        idx     = np.arange(len(summary)) if labels is None else \
+            np.flatnonzero(summary[dim].isin(list(labels)).to_numpy())
+        months  = np.arange(S.shape[1])
+        out = pd.DataFrame({
+            dim:        np.repeat(summary[dim].to_numpy()[idx], len(months)),
+            "month":    np.tile(months, len(idx)),
+            "survival": S[idx].ravel(),
+        })
+        return out.dropna(subset=["survival"]).reset_index(drop=True)
+
+    def to_bytes(self) -> bytes:
+        """npz 직렬화 (그룹 라벨은 JSON) — 부팅 스냅샷 저장용"""
+        meta, arrays = {"as_of": self.as_of, "dims": {}}, {}
+        for dim, summary in self.summaries.items():
+            meta["dims"][dim] = summary[dim].tolist()
+            for col in summary.columns.drop(dim):
+                arrays[f"{dim}__{col}"] = summary[col].to_numpy()
+            arrays[f"{dim}__survival"] = self.survival[dim]
+        return pack_npz(meta, **arrays)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RegistrationLag":
+        meta, z = unpack_npz(data)
+        summaries, survival = {}, {}
+        for dim, labels in meta["dims"].items():
+            cols = {k[len(dim) + 2:]: v for k, v in z.items() if k.startswith(f"{dim}__")}
+            survival[dim]  = cols.pop("survival")
+            summaries[dim] = pd.DataFrame({dim: pd.Series(labels, dtype=str), **cols})
+        return cls(summaries, survival, meta["as_of"])
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(S.nbytes for S in self.survival.values())
+                   + sum(s.memory_usage(deep=True).sum() for s in self.summaries.values()))
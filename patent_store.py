@@ -0,0 +1,666 @@
+"""
+특허 원본 공유 캐시 + 백그라운드 캐시 워머
+- 기업(검색어)별 KIPRIS 원본을 디스크 JSON 으로 보관 — 대시보드 여러 세션 · 별도 프로세스가 공유
+- KIPRIS 검색은 기간과 무관하게 같은 결과를 돌려주므로 날짜 필터 없이 저장하고 조회 시 기간만 잘라냄
+- CacheWarmer: 일정 주기로 오래된 기업만 다시 수집 (대시보드와 함께 시작하거나 단독 실행)
+- ResourceCache: 데이터 지문별 특허 데이터 + 분석 상태(큐브 · 테이블) 공용 저장소
+  세션은 DataHandle 로 참조만 보관, 참조 수 기반 LRU 제거 + 메모리 상한
+- 다중 워커: SharedArtifactCache(SQLite) 로 분류 결과(코퍼스)를 프로세스 간 공유,
+  FileLock 으로 키별 빌드 · 캐시 워머를 워커 전체에서 한 번만 수행
+- 부팅 스냅샷: 마지막 분석의 특허 + 파생 상태(코퍼스 · 큐브 · Spike · IPC 트리)를 npz 한 파일로 보관
+
+단독 실행 예:
+  python patent_store.py --interval 3600
+  python patent_store.py --once
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from kipris_client import shared_client
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "PATENT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".patent_cache"),
+)
+DEFAULT_MAX_AGE = 3600      # 초 — 기존 st.cache_data(ttl=3600) 과 동일
+WARM_INTERVAL   = 1800      # 초 — 워머는 만료 전에 미리 갱신해 대화형 조회가 항상 캐시에 맞도록
+SNAPSHOT_PATH   = os.getenv("PATENT_SNAPSHOT", os.path.join(DEFAULT_CACHE_DIR, "analysis_snapshot.npz"))
+SHARED_DB_PATH  = os.getenv("PATENT_SHARED_DB", os.path.join(DEFAULT_CACHE_DIR, "shared.sqlite3"))
+CONFIG_PATH     = os.path.join(os.path.dirname(os.path.abspath(__file__)), "antigravity_agent.config")
+
+logger = logging.getLogger(__name__)
+
+
+def _safe_name(query: str) -> str:
+    """검색어 → 파일명 (한글은 유지, 경로 구분자 등만 치환)"""
+    return re.sub(r"[^\w\-]+", "_", query).strip("_") or "_"
+
+
+# ─────────────────────────────────────────────
+# 프로세스 간 파일 잠금
+# ─────────────────────────────────────────────
+try:
+    import fcntl
+except ImportError:                                 # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    잠금 파일 기반 배타 잠금 (POSIX flock / Windows msvcrt). 프로세스가 죽으면 OS 가 자동 해제.
+    with FileLock(path): ...  또는  acquire(blocking=False) 로 리더 선출.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh  = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if self._fh is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fh = open(self.path, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            else:
+                while True:
+                    try:
+                        fh.seek(0)
+                        msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        if not blocking:
+                            raise
+                        time.sleep(0.1)
+        except OSError:
+            fh.close()
+            return False
+        self._fh = fh
+        return True
+
+    def release(self):
+        if self._fh is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+            else:
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+    @property
+    def held(self) -> bool:
+        return self._fh is not None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+# ─────────────────────────────────────────────
+# 디스크 캐시
+# ─────────────────────────────────────────────
+class PatentStore:
+    """
+    검색어별 {"query", "fetched_at", "patents"} JSON 파일.
+    쓰기는 임시 파일 → os.replace 로 원자적으로 교체해 다른 프로세스가 반쯤 쓴 파일을 읽지 않는다.
+    같은 프로세스 안에서는 파일 수정 시각이 바뀌지 않았으면 메모리 사본을 그대로 돌려준다.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._mem: Dict[str, tuple] = {}          # query → (mtime, entry, 파일 크기)
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, query: str) -> str:
+        return os.path.join(self.cache_dir, f"{_safe_name(query)}.json")
+
+    def get(self, query: str) -> Optional[Dict]:
+        """캐시 항목 {"query", "fetched_at"(epoch 초), "patents"} — 없으면 None"""
+        path = self._path(query)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        with self._lock:
+            hit = self._mem.get(query)
+            if hit and hit[0] == mtime:
+                return hit[1]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            size = os.path.getsize(path)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._mem[query] = (mtime, entry, size)
+        return entry
+
+    def put(self, query: str, patents: List[Dict]) -> Dict:
+        entry = {"query": query, "fetched_at": time.time(), "patents": patents}
+        path  = self._path(query)
+        tmp   = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        with self._lock:
+            self._mem[query] = (os.path.getmtime(path), entry, os.path.getsize(path))
+        return entry
+
+    def age(self, query: str) -> Optional[float]:
+        """마지막 수집 후 경과 초 (캐시 없음: None)"""
+        entry = self.get(query)
+        return None if entry is None else max(time.time() - entry["fetched_at"], 0.0)
+
+    def is_fresh(self, query: str, max_age: float = DEFAULT_MAX_AGE) -> bool:
+        age = self.age(query)
+        return age is not None and age < max_age
+
+    def freshness(self, queries: Iterable[str]) -> Dict[str, Dict]:
+        """검색어별 {"fetched_at", "age", "count"} — 캐시 없으면 값이 None"""
+        out: Dict[str, Dict] = {}
+        for q in queries:
+            entry = self.get(q)
+            out[q] = {
+                "fetched_at": entry["fetched_at"] if entry else None,
+                "age":        max(time.time() - entry["fetched_at"], 0.0) if entry else None,
+                "count":      len(entry["patents"]) if entry else None,
+            }
+        return out
+
+    def memory_info(self) -> Dict[str, int]:
+        """메모리 사본 수 · 대략적 바이트 (JSON 파일 크기 기준 — 파이썬 객체는 보통 2~4배)"""
+        with self._lock:
+            sizes = [v[2] for v in self._mem.values()]
+        return {"entries": len(sizes), "bytes": int(sum(sizes))}
+
+
+def fetch_patents(query: str, warn: Optional[Callable[[str], None]] = None, max_pages: int = 5) -> List[Dict]:
+    """KIPRIS 원본 수집 (날짜 필터 없음) — 공용 클라이언트의 커넥션 풀 재사용"""
+    return shared_client().search_by_applicant(query, max_pages=max_pages, warn=warn)
+
+
+def get_or_fetch(
+    store: PatentStore,
+    query: str,
+    max_age: float = DEFAULT_MAX_AGE,
+    warn: Optional[Callable[[str], None]] = None,
+) -> Dict:
+    """
+    신선한 캐시가 있으면 그대로, 없으면 수집 후 저장.
+    수집 결과가 비면(네트워크 오류 포함) 저장하지 않고 오래된 캐시라도 유지한다.
+    """
+    entry = store.get(query)
+    if entry is not None and time.time() - entry["fetched_at"] < max_age:
+        return entry
+    patents = fetch_patents(query, warn=warn)
+    if not patents:
+        return entry or {"query": query, "fetched_at": None, "patents": []}
+    return store.put(query, patents)
+
+
+# ─────────────────────────────────────────────
+# 백그라운드 캐시 워머
+# ─────────────────────────────────────────────
+class CacheWarmer:
+    """
+    queries 를 interval 초마다 순회하며 max_age 보다 오래된 항목만 다시 수집.
+    데몬 스레드라 대시보드 프로세스 종료 시 함께 정리된다.
+    같은 캐시 디렉터리를 쓰는 워머(대시보드 워커 여러 개 + 단독 프로세스) 중 warmer.lock 을
+    잡은 하나만 수집하고, 나머지는 대기하다 리더 프로세스가 죽으면 이어받는다.
+    """
+
+    def __init__(
+        self,
+        store: PatentStore,
+        queries: Iterable[str],
+        interval: float = WARM_INTERVAL,
+        max_age: Optional[float] = None,
+        fetch: Callable[[str], List[Dict]] = fetch_patents,
+        on_refresh: Optional[Callable[[int], None]] = None,
+    ):
+        self.store    = store
+        self.queries  = list(dict.fromkeys(queries))
+        self.interval = interval
+        self.max_age  = interval if max_age is None else max_age
+        self.fetch    = fetch
+        self.on_refresh = on_refresh           # 새로 수집한 기업이 있을 때 호출 (스냅샷 갱신 등)
+        self.status: Dict[str, Dict] = {q: {"last_error": None, "last_run": None} for q in self.queries}
+        self._stop    = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.leader   = FileLock(os.path.join(store.cache_dir, "warmer.lock"))
+
+    def refresh(self, force: bool = False) -> int:
+        """오래된 항목 1회 갱신. 반환: 새로 수집한 기업 수"""
+        done = 0
+        for q in self.queries:
+            if self._stop.is_set():
+                break
+            if not force and self.store.is_fresh(q, self.max_age):
+                continue
+            try:
+                patents = self.fetch(q)
+                if not patents:
+                    raise RuntimeError("수집 결과 없음")
+                self.store.put(q, patents)
+                self.status[q] = {"last_error": None, "last_run": time.time()}
+                done += 1
+                logger.info("캐시 갱신: %s %d건", q, len(patents))
+            except Exception as e:          # 한 기업 실패가 다른 기업 갱신을 막지 않도록
+                self.status[q] = {"last_error": str(e), "last_run": time.time()}
+                logger.warning("캐시 갱신 실패: %s — %s", q, e)
+        return done
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                if self.leader.acquire(blocking=False):
+                    n = self.refresh()
+                    if n and self.on_refresh is not None:
+                        try:
+                            self.on_refresh(n)
+                        except Exception as e:
+                            logger.warning("갱신 후처리 실패: %s", e)
+                    self._stop.wait(self.interval)
+                else:                               # 다른 프로세스가 리더 — 짧게 대기 후 재시도
+                    self._stop.wait(min(self.interval, 60))
+        finally:
+            self.leader.release()
+
+    def start(self) -> "CacheWarmer":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="patent-cache-warmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_leader(self) -> bool:
+        return self.leader.held
+
+
+# ─────────────────────────────────────────────
+# 분석 상태 공용 캐시
+# ─────────────────────────────────────────────
+def nbytes_of(obj) -> int:
+    """
+    numpy 배열 · DataFrame · nbytes 속성 객체 · 컨테이너(dict/list/tuple/매핑)의 대략적 메모리 (바이트).
+    특허 dict 목록처럼 다른 캐시와 공유되는 객체도 모두 더하므로 상한 추정치다.
+    """
+    if obj is None:
+        return 0
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if hasattr(obj, "nbytes"):
+        return int(obj.nbytes)
+    if isinstance(obj, (dict, MappingProxyType)):
+        return sys.getsizeof(obj) + sum(
+            sys.getsizeof(k) + nbytes_of(v) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(nbytes_of(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+def freeze_patents(all_patents: Dict[str, List[Dict]]) -> MappingProxyType:
+    """기업 → 특허 목록을 읽기 전용 매핑 + 튜플로 (세션 간 공유 객체가 실수로 바뀌지 않도록)"""
+    return MappingProxyType({c: tuple(ps) for c, ps in all_patents.items()})
+
+
+class ResourceCache:
+    """
+    키(데이터 지문) → 빌드 결과 dict 의 프로세스 공용 캐시.
+    - 같은 데이터를 본 세션 · 재실행은 한 번 만든 객체를 공유 (키별 잠금으로 빌드도 한 번)
+    - 세션은 checkout() 으로 받은 DataHandle 로 참조 — 참조 수가 0인 항목만 LRU 로 제거
+    - max_entries / max_bytes 를 넘으면 참조 없는 오래된 항목부터 제거.
+      참조 중인 항목만으로 상한을 넘으면 제거하지 않고 경고만 남긴다 (사용 중 데이터는 유지)
+    보관하는 객체는 읽기 전용으로 다뤄야 한다.
+    """
+
+    def __init__(self, max_entries: int = 8, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self._items: "OrderedDict[str, Dict]" = OrderedDict()
+        self._meta: Dict[str, Dict] = {}
+        self._refs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._building: Dict[str, threading.Lock] = {}
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(sum(m["bytes"].values()) for m in self._meta.values())
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self._meta[key]["hits"] += 1
+                self._meta[key]["last_used"] = time.time()
+            return item
+
+    def get_or_build(self, key: str, build: Callable[[], Dict], acquire: bool = False) -> Dict:
+        """키가 없으면 build() 결과를 저장. acquire=True 면 반환 전에 참조 수를 올린다 (제거 방지)"""
+        item = self._get_acquire(key, acquire)
+        if item is not None:
+            return item
+        with self._lock:
+            key_lock = self._building.setdefault(key, threading.Lock())
+        with key_lock:
+            item = self._get_acquire(key, acquire)
+            if item is not None:
+                return item
+            t0   = time.time()
+            item = build()
+            meta = {
+                "built_at":   time.time(),
+                "build_sec":  time.time() - t0,
+                "last_used":  time.time(),
+                "hits":       0,
+                "bytes":      {k: nbytes_of(v) for k, v in item.items()},
+            }
+            with self._lock:
+                self._items[key] = item
+                self._meta[key]  = meta
+                self._building.pop(key, None)
+                if acquire:
+                    self._refs[key] = self._refs.get(key, 0) + 1
+                self._evict()
+            return item
+
+    def _get_acquire(self, key: str, acquire: bool) -> Optional[Dict]:
+        item = self.get(key)
+        if item is not None and acquire:
+            with self._lock:
+                if key in self._items:
+                    self._refs[key] = self._refs.get(key, 0) + 1
+                else:                               # get 직후 제거된 경우 — 다시 빌드
+                    item = None
+        return item
+
+    def checkout(self, key: str, build: Callable[[], Dict]) -> "DataHandle":
+        """빌드(필요 시) + 참조 획득을 한 번에. 세션은 반환된 핸들만 보관"""
+        item = self.get_or_build(key, build, acquire=True)
+        return DataHandle(self, key, item)
+
+    def release(self, key: str):
+        with self._lock:
+            n = self._refs.get(key, 0) - 1
+            if n > 0:
+                self._refs[key] = n
+            else:
+                self._refs.pop(key, None)
+            self._evict()
+
+    def _evict(self):
+        """(잠금 보유 상태에서 호출) 참조 없는 LRU 항목부터 상한 이하가 될 때까지 제거"""
+        def over() -> bool:
+            if len(self._items) > self.max_entries:
+                return True
+            if self.max_bytes is None:
+                return False
+            return sum(sum(m["bytes"].values()) for m in self._meta.values()) > self.max_bytes
+
+        for key in list(self._items):               # 오래된 순
+            if not over():
+                return
+            if self._refs.get(key, 0) > 0:
+                continue
+            self._items.pop(key)
+            self._meta.pop(key, None)
+        if over():
+            logger.warning(
+                "공용 캐시 상한 초과: 참조 중인 항목 %d개 (%.1f MB)",
+                len(self._items), sum(sum(m["bytes"].values()) for m in self._meta.values()) / 2**20,
+            )
+
+    def clear(self):
+        """참조 없는 항목 전부 제거"""
+        with self._lock:
+            for key in [k for k in self._items if self._refs.get(k, 0) == 0]:
+                self._items.pop(key)
+                self._meta.pop(key, None)
+
+    def memory_info(self) -> List[Dict]:
+        """키별 {"key", "bytes"(합계), "parts"(항목별), "refs", "hits", "build_sec", "last_used"} — 최근 사용 순"""
+        with self._lock:
+            keys = list(reversed(self._items))
+            meta = {k: dict(self._meta[k]) for k in keys}
+            refs = dict(self._refs)
+        return [
+            {
+                "key":       k,
+                "bytes":     sum(meta[k]["bytes"].values()),
+                "parts":     meta[k]["bytes"],
+                "refs":      refs.get(k, 0),
+                "hits":      meta[k]["hits"],
+                "build_sec": meta[k]["build_sec"],
+                "last_used": meta[k]["last_used"],
+            }
+            for k in keys
+        ]
+
+
+class DataHandle:
+    """
+    세션이 session_state 에 보관하는 공용 캐시 참조 (데이터 자체는 복사하지 않음).
+    세션이 끝나 session_state 가 정리되거나 다른 데이터로 교체되면 객체가 수거되면서
+    weakref.finalize 가 참조 수를 내린다. release() 로 즉시 반납할 수도 있다.
+    """
+
+    def __init__(self, cache: ResourceCache, key: str, item: Dict):
+        self.key  = key
+        self.item = item
+        self._finalizer = weakref.finalize(self, cache.release, key)
+
+    def __getitem__(self, name: str):
+        return self.item[name]
+
+    def release(self):
+        self._finalizer()
+
+    @property
+    def alive(self) -> bool:
+        return self._finalizer.alive
+
+
+# ─────────────────────────────────────────────
+# 부팅 스냅샷
+# ─────────────────────────────────────────────
+def save_snapshot(
+    meta: Dict,
+    all_patents: Dict[str, List[Dict]],
+    parts: Dict[str, bytes],
+    path: str = SNAPSHOT_PATH,
+):
+    """
+    메타(JSON) + 특허 원본(JSON) + 직렬화된 파생 상태(parts: 이름 → 바이트)를 npz 한 파일로 원자적 저장.
+    압축하지 않아 읽을 때는 파일 복사 수준의 비용만 든다.
+    """
+    def _blob(b: bytes) -> np.ndarray:
+        return np.frombuffer(b, dtype=np.uint8)
+
+    meta    = {**meta, "saved_at": time.time(), "parts": sorted(parts)}
+    patents = json.dumps({c: list(ps) for c, ps in all_patents.items()}, ensure_ascii=False)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                meta=_blob(json.dumps(meta, ensure_ascii=False).encode("utf-8")),
+                patents=_blob(patents.encode("utf-8")),
+                **{f"part_{k}": _blob(v) for k, v in parts.items()},
+            )
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def snapshot_meta(path: str = SNAPSHOT_PATH) -> Optional[Dict]:
+    """스냅샷 메타만 읽기 (특허 · 파생 상태 본문은 읽지 않음). 없거나 깨졌으면 None"""
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            return json.loads(z["meta"].tobytes().decode("utf-8"))
+    except Exception:
+        return None
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Dict]:
+    """{"meta", "patents"(기업 → 특허 목록), "parts"(이름 → 바이트)} — 없거나 깨졌으면 None"""
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            meta    = json.loads(z["meta"].tobytes().decode("utf-8"))
+            patents = json.loads(z["patents"].tobytes().decode("utf-8"))
+            parts   = {k[len("part_"):]: z[k].tobytes() for k in z.files if k.startswith("part_")}
+    except Exception as e:
+        if os.path.exists(path):
+            logger.warning("스냅샷 읽기 실패: %s — %s", path, e)
+        return None
+    return {"meta": meta, "patents": patents, "parts": parts}
+
+
+# ─────────────────────────────────────────────
+# 프로세스 간 공유 아티팩트 (SQLite)
+# ─────────────────────────────────────────────
+class SharedArtifactCache:
+    """
+    키 → 바이트(npz 등) 를 SQLite 파일 하나에 보관 — 같은 호스트의 대시보드 워커들이 공유.
+    get_or_build 는 키별 FileLock 안에서 다시 확인 후 빌드하므로 워커가 몇 개든 계산은 한 번.
+    SQLite 연결은 호출마다 열어 스레드 간 공유하지 않는다 (WAL 모드, 읽기는 잠금 없이 병행).
+    """
+
+    def __init__(self, path: str = SHARED_DB_PATH, max_entries: int = 64):
+        self.path        = path
+        self.max_entries = max_entries
+        self.lock_dir    = f"{path}.locks"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                " key TEXT PRIMARY KEY, data BLOB NOT NULL,"
+                " created_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._connect() as db:
+            row = db.execute("SELECT data FROM artifacts WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                db.execute("UPDATE artifacts SET used_at = ? WHERE key = ?", (time.time(), key))
+        return None if row is None else bytes(row[0])
+
+    def put(self, key: str, data: bytes):
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO artifacts (key, data, created_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(data), now, now),
+            )
+            db.execute(
+                "DELETE FROM artifacts WHERE key NOT IN "
+                "(SELECT key FROM artifacts ORDER BY used_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def get_or_build(self, key: str, build: Callable[[], bytes]) -> bytes:
+        data = self.get(key)
+        if data is not None:
+            return data
+        with FileLock(os.path.join(self.lock_dir, _safe_name(key) + ".lock")):
+            data = self.get(key)                    # 잠금 대기 중 다른 워커가 만들었을 수 있음
+            if data is None:
+                data = build()
+                self.put(key, data)
+        return data
+
+    def memory_info(self) -> Dict[str, int]:
+        """항목 수 · 저장 바이트 · DB 파일 크기"""
+        with self._connect() as db:
+            n, size = db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM artifacts").fetchone()
+        try:
+            file_size = os.path.getsize(self.path)
+        except OSError:
+            file_size = 0
+        return {"entries": int(n), "bytes": int(size), "file_bytes": file_size}
+
+
+def load_target_companies(path: str = CONFIG_PATH) -> List[str]:
+    """antigravity_agent.config 의 target_companies (검색어 목록)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("analysis_config", {}).get("target_companies", [])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="KIPRIS 특허 캐시 워머")
+    parser.add_argument("--companies", nargs="+", default=None,
+                        help="검색어 목록 (기본: antigravity_agent.config target_companies)")
+    parser.add_argument("--cache-dir", type=str,   default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--interval",  type=float, default=WARM_INTERVAL, help="갱신 주기(초)")
+    parser.add_argument("--once",      action="store_true", help="오래된 항목만 1회 갱신 후 종료")
+    parser.add_argument("--force",     action="store_true", help="신선도와 무관하게 전부 다시 수집")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s", stream=sys.stderr)
+    queries = args.companies or load_target_companies()
+    warmer  = CacheWarmer(PatentStore(args.cache_dir), queries, interval=args.interval)
+
+    if args.once or args.force:
+        n = warmer.refresh(force=args.force)
+        logger.info("갱신 %d / %d곳", n, len(queries))
+        return 0
+
+    logger.info("%d곳을 %.0f초 주기로 갱신합니다 (Ctrl+C 종료)", len(queries), args.interval)
+    warmer.start()
+    try:
+        while warmer.running:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        warmer.stop(timeout=5)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
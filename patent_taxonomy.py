@@ -0,0 +1,168 @@
+"""
+반도체/디스플레이 기술 분류 체계 (streamlit 비의존)
+- IPC L1/L2/L3 매핑 · 기술 키워드 사전
+- Taxonomy: 키워드를 카테고리별 정규식으로 미리 컴파일, IPC 분류 결과는 코드 문자열별로 메모이즈
+  (같은 IPC 코드가 기업 · 세션 · 재실행마다 반복되므로 프로세스당 한 번만 계산)
+"""
+
+import hashlib
+import json
+import re
+import sys
+import threading
+from typing import Dict, List, Tuple
+
+from patent_engine import OTHER_LABEL
+
+# IPC 섹션 → 기술 분류 매핑
+IPC_LEVEL1 = {
+    "H01L": "반도체 소자/공정",
+    "G03F": "포토리소그래피",
+    "G09G": "디스플레이 구동",
+    "G02F": "LCD/광학 소자",
+    "H04N": "이미지센서",
+    "H01M": "에너지저장/배터리",
+    "H02M": "전력변환",
+    "G06N": "AI/뉴로모픽",
+}
+
+IPC_LEVEL2 = {
+    "H01L21": "반도체 제조공정 (전공정)",
+    "H01L25": "패키징/어셈블리 (후공정)",
+    "H01L27": "집적회로 설계",
+    "H01L29": "트랜지스터/소자 구조",
+    "H01L33": "LED/마이크로LED",
+    "H01L51": "OLED 소자",
+}
+
+IPC_LEVEL3 = {
+    "H01L21/02":   "기판/웨이퍼 처리",
+    "H01L21/027":  "노광/포토리소그래피",
+    "H01L21/306":  "식각(Etch)",
+    "H01L21/3105": "CMP(화학기계연마)",
+    "H01L21/44":   "금속배선/연결",
+    "H01L21/768":  "다층배선",
+    "H01L25/065":  "3D 스택/HBM",
+    "H01L25/18":   "Hybrid Bonding",
+    "H01L29/66":   "GAA/FinFET 트랜지스터",
+    "H01L29/78":   "MOSFET/나노시트",
+}
+
+# 기술 키워드 → 카테고리 매핑 (spike 감지용)
+TECH_KEYWORDS = {
+    "HBM/고대역폭메모리":  ["HBM", "High Bandwidth Memory", "고대역폭", "wide IO"],
+    "Hybrid Bonding":      ["Hybrid Bonding", "하이브리드 본딩", "직접접합", "Cu-Cu bonding"],
+    "GAA 트랜지스터":      ["GAA", "Gate-All-Around", "나노시트", "Nanosheet", "MBCFET"],
+    "EUV 리소그래피":      ["EUV", "극자외선", "High-NA", "euv lithography"],
+    "TSV/3D 패키징":       ["TSV", "실리콘관통전극", "Through Silicon Via", "3D 패키징"],
+    "Advanced Packaging":  ["칩렛", "Chiplet", "UCIe", "CoWoS", "FOPLP", "팬아웃"],
+    "OLED/마이크로LED":    ["OLED", "유기발광", "MicroLED", "마이크로LED", "μLED"],
+    "AI 가속기":           ["NPU", "AI 가속", "뉴로모픽", "neuromorphic", "PIM"],
+}
+
+
+# ─────────────────────────────────────────────
+# 컴파일된 분류기
+# ─────────────────────────────────────────────
+_SUBCLASS_RE   = re.compile(r"([A-Z]\d+[A-Z]+)")
+_MAIN_GROUP_RE = re.compile(r"([A-Z]\d+[A-Z]+\d+)")
+
+
+class Taxonomy:
+    """
+    기술 키워드 · IPC 매핑을 컴파일한 분류기. 결과는 기존 PatentAnalyzer 규칙과 동일:
+    - 기술: 사전 순서상 첫 매칭 카테고리 (대소문자 무시 부분 문자열), 없으면 '기타'
+    - IPC: 첫 번째 코드의 서브클래스 / 메인그룹 / 서브그룹 라벨
+    """
+
+    def __init__(
+        self,
+        tech_keywords: Dict[str, List[str]] = None,
+        ipc_level1: Dict[str, str] = None,
+        ipc_level2: Dict[str, str] = None,
+        ipc_level3: Dict[str, str] = None,
+    ):
+        self.tech_keywords = tech_keywords or TECH_KEYWORDS
+        self.ipc_level1    = ipc_level1 or IPC_LEVEL1
+        self.ipc_level2    = ipc_level2 or IPC_LEVEL2
+        self.ipc_level3    = [
+            (code.replace("/", "").upper(), code.upper(), label)
+            for code, label in (ipc_level3 or IPC_LEVEL3).items()
+        ]
+        self._tech_res = [
+            (cat, re.compile("|".join(re.escape(kw.lower()) for kw in kws)))
+            for cat, kws in self.tech_keywords.items() if kws
+        ]
+        self._ipc_memo: Dict[str, Tuple[str, str, str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self.tech_keywords)
+
+    @property
+    def fingerprint(self) -> str:
+        """분류표 내용 지문 — 분류 결과를 디스크에 공유할 때 키에 포함 (사전이 바뀌면 자동 무효화)"""
+        tables = [self.tech_keywords, self.ipc_level1, self.ipc_level2, self.ipc_level3]
+        raw    = json.dumps(tables, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+    def classify_tech(self, title: str, abstract: str) -> str:
+        """제목/초록 키워드로 기술 카테고리 분류"""
+        text = (title + " " + abstract).lower()
+        for cat, pattern in self._tech_res:
+            if pattern.search(text):
+                return cat
+        return OTHER_LABEL
+
+    def classify_ipc(self, ipc_str: str) -> Tuple[str, str, str]:
+        """IPC 코드 → (level1 대분류, level2 중분류, level3 소분류), 코드 문자열별 메모이즈"""
+        key = ipc_str or ""
+        hit = self._ipc_memo.get(key)
+        if hit is not None:
+            return hit
+
+        ipc = key.strip().upper().split(";")[0].strip()
+        l1 = l2 = l3 = OTHER_LABEL
+        if ipc:
+            # Level 1: 서브클래스 (H01L, G03F 등)
+            m   = _SUBCLASS_RE.match(ipc)
+            sub = m.group(1) if m else ""
+            if sub:
+                l1 = self.ipc_level1.get(sub, sub)
+
+            # Level 2: 메인그룹 (H01L21 등)
+            m2 = _MAIN_GROUP_RE.match(ipc)
+            mg = m2.group(1) if m2 else ""
+            if mg:
+                l2 = self.ipc_level2.get(mg, mg)
+
+            # Level 3: 서브그룹
+            for compact, code, label in self.ipc_level3:
+                if ipc.startswith(compact) or code in ipc:
+                    l3 = label
+                    break
+
+        out = (l1, l2, l3)
+        with self._lock:
+            self._ipc_memo[key] = out
+        return out
+
+    def memory_info(self) -> Dict[str, int]:
+        """메모 항목 수 · 대략적 바이트 (문자열 키 + 튜플)"""
+        memo = self._ipc_memo
+        return {
+            "entries": len(memo),
+            "bytes":   sys.getsizeof(memo) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in list(memo.items())),
+        }
+
+
+_DEFAULT: Taxonomy = None
+
+
+def default_taxonomy() -> Taxonomy:
+    """프로세스 공용 Taxonomy (대시보드는 st.cache_resource 로 감싸 사용)"""
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = Taxonomy()
+    return _DEFAULT
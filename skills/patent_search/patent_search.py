@@ -2,7 +2,8 @@
 KIPRIS 공개특허 검색 스킬
 - 출원인명 + 공개일 기준 검색
 - IPC 코드 기반 기술 분류
-- Spike 감지 결과 JSON 출력
+- Spike 감지 결과 JSON 출력 (탐지기: legacy / calendar / poisson / ewma / cusum)
+- 단기 모니터링: --recent-days N (예: 2 = 최근 48시간) 일 단위 링버퍼 집계
 """
 
 import sys
@@ -16,7 +17,7 @@ from datetime import datetime, timedelta
 
 def _months_ago(n: int) -> datetime:
     return datetime.now() - timedelta(days=int(n * 30.44))
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 try:
     from dotenv import load_dotenv
@@ -24,6 +25,16 @@ try:
 except ImportError:
     pass
 
+# 저장소 루트의 공용 분석 엔진 (patent_engine / spike_engine)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from patent_engine import (  # noqa: E402
+    OTHER_LABEL,
+    CountCube,
+    PatentCorpus,
+    RecentActivityIndex,
+)
+from spike_engine import DETECTORS, backtest, detect_matrix     # noqa: E402
+
 KIPRIS_API_KEY  = os.getenv("KIPRIS_API_KEY", "qIq7ZsqpirwelaLXJZmwe=yjRgV0AbM=Oapp9CI=f6g=")
 KIPRIS_BASE_URL = "http://plus.kipris.or.kr/kipo-api/kipi"
 
@@ -159,73 +170,80 @@ def classify_ipc(ipc_str: str) -> Dict[str, str]:
     return {"ipc_code": ipc, "level1": level1, "level2": level2}
 
 
-def detect_spikes(patents: List[Dict], threshold_pct: float = 200.0) -> List[Dict]:
+def _ipc_levels(ipc_str: str):
+    """classify_ipc 결과 → 코퍼스용 (level1, level2, level3) 튜플"""
+    c = classify_ipc(ipc_str)
+    return c["level1"], c["level2"], OTHER_LABEL
+
+
+def build_corpus(all_patents: Dict[str, List[Dict]]) -> PatentCorpus:
+    """기업별 특허 → 기술/IPC 분류까지 마친 인코딩 코퍼스"""
+    return PatentCorpus.from_patents(all_patents, classify_tech, list(TECH_KEYWORDS), _ipc_levels)
+
+
+def build_cube(all_patents: Dict[str, List[Dict]]) -> CountCube:
+    """기업별 특허 → 기업 × 기술 × IPC × 공개월 카운트 큐브"""
+    return CountCube.from_corpus(build_corpus(all_patents))
+
+
+def recent_activity(all_patents: Dict[str, List[Dict]], days: int = 2) -> Dict:
     """
-    최근 1개월 공개 건수 vs 이전 11개월 월평균 비교.
+    최근 days일(오늘 포함) 공개 현황. KIPRIS 공개일은 일 단위라 48시간 = days 2.
+    기업 × 기술 건수는 링버퍼, 특허 목록은 공개일 정렬 인덱스에서 바로 꺼낸다.
+    """
+    corpus = build_corpus(all_patents)
+    index  = RecentActivityIndex.from_corpus(corpus, n_days=max(days, 120))
+    flat   = [p for patents in all_patents.values() for p in patents]
+    counts = index.frame(days=days)
+    return {
+        "days":   days,
+        "counts": {
+            company: {t: int(n) for t, n in row.items() if n}
+            for company, row in counts.iterrows()
+        },
+        "patents": [flat[i] for i in index.rows_since(days)[::-1]],
+    }
+
+
+def detect_spikes(
+    patents: List[Dict],
+    threshold_pct: Optional[float] = 200.0,
+    detector: str = "legacy",
+) -> List[Dict]:
+    """
+    최근 1개월 공개 건수 vs 이전 11개월 월평균 비교 (detector='legacy').
     threshold_pct 초과 → 'Strategic Spike' (Green Light #00FF00)
     150% 이상         → 'Emerging Signal'
+    그 밖의 detector 는 spike_engine.DETECTORS 참고 (threshold 단위가 탐지기마다 다름).
     """
-    now        = datetime.now()
-    cutoff_1m  = _months_ago(1)
-    cutoff_12m = _months_ago(12)
+    matrix = detect_matrix(build_cube({"_": patents}), detector, threshold_pct)
+    return matrix.alerts("_")
 
-    tech_dates: Dict[str, list] = {k: [] for k in TECH_KEYWORDS}
 
-    for p in patents:
-        try:
-            od = datetime.strptime(str(p["openDate"])[:8], "%Y%m%d")
-        except Exception:
-            continue
-        if od < cutoff_12m:
-            continue
-        cat = classify_tech(p["inventionTitle"], p["abstract"])
-        if cat in tech_dates:
-            tech_dates[cat].append(od)
-
-    alerts = []
-    for tech, dates in tech_dates.items():
-        recent   = [d for d in dates if d >= cutoff_1m]
-        older    = [d for d in dates if d < cutoff_1m]
-        count_1m = len(recent)
-        avg_11m  = len(older) / 11.0 if older else 0.0
-        ratio    = (count_1m / avg_11m * 100) if avg_11m > 0 else 0.0
-
-        if count_1m == 0:
-            continue
-
-        if ratio >= threshold_pct:
-            signal = "Strategic Spike"
-            color  = "#00FF00"
-            blink  = True
-        elif ratio >= 150:
-            signal = "Emerging Signal"
-            color  = "#FFA500"
-            blink  = False
-        else:
-            signal = "Normal"
-            color  = "#AAAAAA"
-            blink  = False
-
-        alerts.append({
-            "tech_category":   tech,
-            "count_1m":        count_1m,
-            "avg_11m":         round(avg_11m, 1),
-            "spike_ratio_pct": round(ratio, 1),
-            "signal":          signal,
-            "signal_color":    color,
-            "blink":           blink,
-        })
-
-    alerts.sort(key=lambda x: x["spike_ratio_pct"], reverse=True)
-    return alerts
+def save_snapshot(all_patents: Dict[str, List[Dict]], snapshot_dir: str) -> str:
+    """수집한 원본 특허를 스냅샷 JSON 으로 저장 (spike_backtest.py 입력)"""
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = os.path.join(snapshot_dir, f"patents_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"generated_at": datetime.now().isoformat(), "companies": all_patents},
+            f, ensure_ascii=False,
+        )
+    return path
 
 
 def run_analysis(
     companies: List[Dict],
     period_months: int = 12,
-    spike_threshold: float = 200.0,
+    spike_threshold: Optional[float] = None,
+    detector: str = "legacy",
+    with_backtest: bool = False,
+    snapshot_dir: Optional[str] = None,
+    recent_days: Optional[int] = None,
 ) -> Dict:
     """기업 목록에 대해 KIPRIS 검색 + Spike 분석 수행 후 결과 반환"""
+    if spike_threshold is None:
+        spike_threshold = DETECTORS[detector].default_threshold
     end_dt    = datetime.now()
     start_dt  = end_dt - timedelta(days=int(period_months * 30.44))
     start_str = start_dt.strftime("%Y%m%d")
@@ -235,35 +253,48 @@ def run_analysis(
         "generated_at":    datetime.now().isoformat(),
         "period_months":   period_months,
         "spike_threshold": spike_threshold,
+        "spike_detector":  detector,
         "companies":       {},
     }
 
+    all_patents: Dict[str, List[Dict]] = {}
     for co in companies:
         name  = co["name"]
         query = co.get("query", name)
         print(f"\n[INFO] {name} 수집 시작...", file=sys.stderr)
+        all_patents[name] = search_kipris_patents(query, start_str, end_str)
+
+    if snapshot_dir:
+        path = save_snapshot(all_patents, snapshot_dir)
+        print(f"[INFO] 스냅샷 저장: {path}", file=sys.stderr)
 
-        patents = search_kipris_patents(query, start_str, end_str)
-        spikes  = detect_spikes(patents, spike_threshold)
+    # 전 기업을 한 번에 인코딩 → 큐브 롤업으로 분포/Spike 계산
+    cube   = build_cube(all_patents)
+    matrix = detect_matrix(cube, detector, spike_threshold)
 
-        ipc_dist:  Dict[str, int] = {}
-        tech_dist: Dict[str, int] = {}
-        for p in patents:
-            l2  = classify_ipc(p["ipcNumber"])["level2"]
-            ipc_dist[l2] = ipc_dist.get(l2, 0) + 1
-            cat = classify_tech(p["inventionTitle"], p["abstract"])
-            tech_dist[cat] = tech_dist.get(cat, 0) + 1
+    for name, patents in all_patents.items():
+        only   = {"company": name}
+        spikes = matrix.alerts(name)
+        ipc_df  = cube.frame("l2", where=only)
+        tech_df = cube.frame("tech", where=only)
 
         output["companies"][name] = {
             "total_patents":     len(patents),
-            "ipc_distribution":  ipc_dist,
-            "tech_distribution": tech_dist,
+            "ipc_distribution":  dict(zip(ipc_df["l2"], ipc_df["count"].tolist())),
+            "tech_distribution": dict(zip(tech_df["tech"], tech_df["count"].tolist())),
             "spikes":            spikes,
             "sample_patents":    patents[:5],
         }
-        spike_cnt = sum(1 for s in spikes if s["signal"] == "Strategic Spike")
+        spike_cnt = matrix.spike_count(name)
         print(f"[INFO] {name}: {len(patents)}건, Spike {spike_cnt}개", file=sys.stderr)
 
+    if recent_days:
+        output["recent"] = recent_activity(all_patents, recent_days)
+
+    if with_backtest:
+        thresholds = {detector: spike_threshold}
+        output["backtest"] = backtest(cube, thresholds=thresholds).to_dict(orient="records")
+
     return output
 
 
@@ -274,12 +305,24 @@ if __name__ == "__main__":
     parser.add_argument("--companies", nargs="+", default=["삼성전자", "SK하이닉스"],
                         help="분석할 기업명 목록")
     parser.add_argument("--period",    type=int,   default=12,   help="분석 기간(개월)")
-    parser.add_argument("--threshold", type=float, default=200.0, help="Spike 임계값(%)")
+    parser.add_argument("--detector",  choices=list(DETECTORS), default="legacy",
+                        help="Spike 탐지 방식")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Spike 임계값 (legacy/calendar: %%, poisson/ewma: σ, cusum: h — 생략 시 탐지기 기본값)")
+    parser.add_argument("--backtest",  action="store_true",
+                        help="과거 월별 재현 백테스트 결과(탐지기별 정밀도/리드타임) 포함")
+    parser.add_argument("--recent-days", type=int, default=None,
+                        help="최근 N일 공개 현황 포함 (2 = 최근 48시간)")
+    parser.add_argument("--snapshot-dir", type=str, default=None,
+                        help="원본 특허 스냅샷 저장 디렉터리 (spike_backtest.py 입력)")
     parser.add_argument("--output",    type=str,   default="-",   help="결과 파일 (- = stdout)")
     args = parser.parse_args()
 
     companies = [{"name": c, "query": c} for c in args.companies]
-    result    = run_analysis(companies, args.period, args.threshold)
+    result    = run_analysis(
+        companies, args.period, args.threshold, args.detector, args.backtest,
+        args.snapshot_dir, args.recent_days,
+    )
 
     json_str = json.dumps(result, ensure_ascii=False, indent=2)
     if args.output == "-":
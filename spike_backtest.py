@@ -0,0 +1,234 @@
+"""
+Spike 임계값 파라미터 스윕 백테스트 도구
+- 저장된 특허 스냅샷(patent_search.py --snapshot-dir 출력)을 병합해 과거를 재현
+- 임계값 × 기준 윈도우 격자를 전 기업에 대해 프로세스 풀로 병렬 평가
+- 격자 전체를 (임계값 × 시계열 × 월) 브로드캐스트로 한 번에 계산
+- 알림 건수 대비 적중률 순위표 출력
+
+사용 예:
+  python spike_backtest.py snapshots/ --thresholds 100:500:25 --windows 3,6,11,12
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from patent_engine import OTHER_LABEL, CountCube, PatentCorpus, keyword_classifier
+from spike_engine import ALARM_MIN_COUNT, DETECTORS, monthly_series, score_calendar, surge_events
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "antigravity_agent.config")
+
+
+def load_agent_config(path: str = CONFIG_PATH) -> Dict:
+    """antigravity_agent.config 의 analysis_config 섹션"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("analysis_config", {})
+
+
+def load_snapshots(paths: Sequence[str]) -> Dict[str, List[Dict]]:
+    """
+    스냅샷 JSON({"companies": {기업: [특허...]}}) 여러 개를 병합.
+    디렉터리는 *.json 전체, 같은 출원번호는 나중 스냅샷이 우선한다.
+    """
+    files: List[str] = []
+    for p in paths:
+        files.extend(sorted(glob.glob(os.path.join(p, "*.json"))) if os.path.isdir(p) else [p])
+
+    merged: Dict[str, Dict[str, Dict]] = {}
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            snap = json.load(f)
+        for company, patents in (snap.get("companies") or {}).items():
+            if not isinstance(patents, list):
+                continue
+            bucket = merged.setdefault(company, {})
+            for p in patents:
+                key = p.get("applicationNumber") or f"{p.get('inventionTitle')}|{p.get('openDate')}"
+                bucket[key] = p
+    return {c: list(v.values()) for c, v in merged.items()}
+
+
+def _parse_grid(spec: str, cast=float) -> List:
+    """'100:500:25' (시작:끝:간격, 끝 포함) 또는 '3,6,11' → 리스트"""
+    if ":" in spec:
+        lo, hi, step = (float(v) for v in spec.split(":"))
+        return [cast(v) for v in np.arange(lo, hi + step / 2, step)]
+    return [cast(v) for v in spec.split(",") if v.strip()]
+
+
+# ─────────────────────────────────────────────
+# 격자 평가 (프로세스 풀 작업 단위)
+# ─────────────────────────────────────────────
+def _sweep_chunk(
+    x: np.ndarray,
+    detector: str,
+    windows: Sequence[int],
+    thresholds: np.ndarray,
+    truth_window: int,
+    horizon: int,
+    lift: float,
+    min_count: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    시계열 묶음 x (시계열 수 × 월 수) 하나에 대해 격자 전체를 평가.
+    반환: alerts / hits / lead_sum (윈도우 수 × 임계값 수), 정답 급증 수.
+    """
+    score_fn = DETECTORS[detector].score or score_calendar
+    event, lead = surge_events(x, truth_window, horizon, lift, min_count)
+
+    m = x.shape[-1]
+    evaluable = np.zeros(x.shape, dtype=bool)
+    evaluable[:, truth_window: max(m - horizon, truth_window)] = True
+    eligible = evaluable & (x >= min_count)
+
+    alerts   = np.zeros((len(windows), len(thresholds)), dtype=np.int64)
+    hits     = np.zeros_like(alerts)
+    lead_sum = np.zeros_like(alerts)
+    thr      = thresholds[:, None]
+    for wi, w in enumerate(windows):
+        score = score_fn(x, int(w))[eligible]               # 평가 대상 셀만 1차원으로
+        hit   = event[eligible]
+        ld    = lead[eligible]
+        alarm = score[None, :] >= thr                       # (임계값 수, 셀 수)
+        alerts[wi]   = alarm.sum(axis=1)
+        hits[wi]     = (alarm & hit[None, :]).sum(axis=1)
+        lead_sum[wi] = (alarm * ld[None, :]).sum(axis=1)
+    return alerts, hits, lead_sum, int((event & evaluable).sum())
+
+
+def sweep(
+    cube: CountCube,
+    detector: str = "calendar",
+    thresholds: Optional[Sequence[float]] = None,
+    windows: Sequence[int] = (3, 6, 9, 11, 12, 18, 24),
+    truth_window: int = 11,
+    horizon: int = 3,
+    lift: float = 1.5,
+    min_count: int = ALARM_MIN_COUNT,
+    min_alerts: int = 5,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    임계값 × 윈도우 격자 백테스트. 기업 단위로 시계열을 나눠 프로세스 풀에서 평가 후 합산.
+    반환 DataFrame 은 적중률(hit_rate) 내림차순, 같은 적중률이면 알림 수가 적은 순.
+    알림이 min_alerts 건 미만인 조합은 적중률이 우연에 좌우되므로 순위 맨 뒤로 보낸다.
+    """
+    det = DETECTORS[detector]
+    if thresholds is None:
+        lo, hi, step = det.slider
+        thresholds = np.arange(lo, hi + step / 2, step / 2)
+    thresholds = np.asarray(thresholds, dtype=float)
+    windows    = [int(w) for w in windows]
+
+    series, months = monthly_series(cube)
+    techs  = [i for i, t in enumerate(cube.labels["tech"]) if t != OTHER_LABEL]
+    chunks = [series[ci][techs] for ci in range(series.shape[0])]
+    args   = (detector, windows, thresholds, truth_window, horizon, lift, min_count)
+
+    shape    = (len(windows), len(thresholds))
+    alerts   = np.zeros(shape, dtype=np.int64)
+    hits     = np.zeros(shape, dtype=np.int64)
+    lead_sum = np.zeros(shape, dtype=np.int64)
+    n_events = 0
+    if chunks and months:
+        if workers == 1 or len(chunks) == 1:
+            results = [_sweep_chunk(c, *args) for c in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_sweep_chunk, chunks, *[[a] * len(chunks) for a in args]))
+        for a, h, l, e in results:
+            alerts += a
+            hits += h
+            lead_sum += l
+            n_events += e
+
+    n_months = max(len(months) - truth_window - horizon, 1)
+    ww, tt = np.meshgrid(windows, thresholds, indexing="ij")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hit_rate = np.where(alerts > 0, hits / alerts, 0.0)
+        lead     = np.where(hits > 0, lead_sum / hits, 0.0)
+    df = pd.DataFrame({
+        "window":           ww.ravel(),
+        "threshold":        tt.ravel(),
+        "alerts":           alerts.ravel(),
+        "alerts_per_month": np.round(alerts.ravel() / n_months, 2),
+        "hits":             hits.ravel(),
+        "hit_rate":         np.round(hit_rate.ravel(), 3),
+        "recall":           np.round(hits.ravel() / n_events, 3) if n_events else 0.0,
+        "lead_time_mean":   np.round(lead.ravel(), 2),
+    })
+    df["_enough"] = df["alerts"] >= min_alerts
+    df = df.sort_values(
+        ["_enough", "hit_rate", "alerts"], ascending=[False, False, True], ignore_index=True
+    ).drop(columns="_enough")
+    df.index = df.index + 1
+    df.index.name = "rank"
+    return df
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    cfg = load_agent_config()
+
+    parser = argparse.ArgumentParser(description="Spike 임계값 파라미터 스윕 백테스트")
+    parser.add_argument("snapshots", nargs="+", help="스냅샷 JSON 파일 또는 디렉터리")
+    parser.add_argument("--detector",   choices=list(DETECTORS), default="calendar")
+    parser.add_argument("--thresholds", type=str, default=None,
+                        help="임계값 격자 (예: 100:500:25 또는 150,200,300) — 생략 시 탐지기 슬라이더 범위")
+    parser.add_argument("--windows",    type=str, default="3,6,9,11,12,18,24",
+                        help="기준 윈도우(개월) 격자")
+    parser.add_argument("--horizon",    type=int,   default=3,   help="정답 판정 미래 구간(개월)")
+    parser.add_argument("--lift",       type=float, default=1.5, help="정답 판정 배수")
+    parser.add_argument("--min-count",  type=int,   default=ALARM_MIN_COUNT, help="알림 최소 월 건수")
+    parser.add_argument("--min-alerts", type=int,   default=5,   help="순위 산정 최소 알림 수")
+    parser.add_argument("--workers",    type=int,   default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--top",        type=int,   default=20,  help="출력할 상위 행 수")
+    parser.add_argument("--output",     type=str,   default=None, help="전체 순위표 CSV 저장 경로")
+    args = parser.parse_args(argv)
+
+    t0 = time.time()
+    all_patents = load_snapshots(args.snapshots)
+    if not all_patents:
+        print("[ERROR] 스냅샷에서 특허를 찾지 못했습니다.", file=sys.stderr)
+        return 1
+
+    classify = keyword_classifier(cfg.get("tech_keywords", {}))
+    corpus   = PatentCorpus.from_patents(all_patents, classify, list(cfg.get("tech_keywords", {})))
+    cube     = CountCube.from_corpus(corpus)
+    t1 = time.time()
+
+    thresholds = _parse_grid(args.thresholds) if args.thresholds else None
+    table = sweep(
+        cube, args.detector, thresholds, _parse_grid(args.windows, int),
+        horizon=args.horizon, lift=args.lift, min_count=args.min_count,
+        min_alerts=args.min_alerts, workers=args.workers,
+    )
+    t2 = time.time()
+
+    print(f"[INFO] 기업 {len(all_patents)}곳 · 특허 {len(corpus):,}건 · 로드 {t1 - t0:.1f}s · "
+          f"격자 {len(table)}개 평가 {t2 - t1:.2f}s", file=sys.stderr)
+    if args.detector in ("legacy", "calendar"):
+        cur = table[(table["window"] == 11) & (table["threshold"] == cfg.get("spike_threshold_pct", 200))]
+        emg = table[(table["window"] == 11) & (table["threshold"] == cfg.get("emerging_threshold_pct", 150))]
+        for label, row in (("spike_threshold_pct", cur), ("emerging_threshold_pct", emg)):
+            if not row.empty:
+                r = row.iloc[0]
+                print(f"[INFO] 현재 {label}={r['threshold']:g}: 순위 {row.index[0]} · "
+                      f"알림 {int(r['alerts'])} · 적중률 {r['hit_rate']:.1%}", file=sys.stderr)
+
+    print(table.head(args.top).to_string())
+    if args.output:
+        table.to_csv(args.output, encoding="utf-8-sig")
+        print(f"[INFO] 저장 완료: {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+통계 기반 Spike 탐지 엔진
+- 달력 월(calendar month) 단위 기업 × 기술 시계열 (CountCube 롤업)
+- 탐지기: legacy(기존 30.44일 규칙) / calendar / poisson / ewma / cusum
+- 모든 탐지기는 (시계열 수 × 월 수) 배열 전체를 한 번에 계산 (벡터화)
+- 백테스트: 과거 각 월 시점을 재현해 탐지기별 정밀도 · 리드타임 산출
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from patent_engine import (
+    LEVEL_EMERGING,
+    LEVEL_NORMAL,
+    LEVEL_SPIKE,
+    OTHER_LABEL,
+    CountCube,
+    SpikeMatrix,
+    compute_spike_matrix,
+)
+
+# 점수형(σ/h) 탐지기의 Emerging 임계값 = Spike 임계값 × 이 비율 (150% / 200% 와 같은 비율)
+# 비율형(%) 탐지기는 기존대로 고정 150% 사용
+EMERGING_FACTOR = 0.75
+EMERGING_PCT    = 150.0
+# 신호 판정 최소 당월 건수 — 현재 매트릭스와 백테스트가 같은 값을 써야 정밀도가 그대로 옮겨진다
+ALARM_MIN_COUNT = 3
+
+
+# ─────────────────────────────────────────────
+# 월별 시계열
+# ─────────────────────────────────────────────
+def monthly_series(
+    cube: CountCube,
+    now: Optional[datetime] = None,
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    (기업, 기술, 월) 롤업 → 완결된 달력 월까지의 시계열.
+    반환: counts (기업 수, 기술 수, 월 수), 월 라벨 목록.
+    양 끝의 불완전한 월은 제외한다 — 현재 진행 중인 월, 그리고 가장 이른 공개일이 1일이 아니라
+    일부만 담긴 첫 달(수집 기간이 월 중간에서 시작 — 기준선을 낮춰 거짓 급증을 만든다).
+    데이터 마지막 월 이후 빈 달은 0으로 채운다.
+    """
+    now    = now or cube.now
+    first  = cube.first_day
+    skip   = int(first is not None and first != first.astype("datetime64[M]").astype("datetime64[D]"))
+    months = cube.labels["month"][skip:-1]      # 부분 수집 첫 달 · 마지막 칸 '날짜없음' 제외
+    arr    = cube.rollup("company", "tech", "month")[:, :, skip:-1]
+    if not months:
+        return arr, []
+
+    first = np.datetime64(months[0], "M")
+    last  = np.datetime64(now.strftime("%Y-%m"), "M") - 1
+    n_m   = int(last - first) + 1
+    if n_m <= 0:
+        return arr[:, :, :0], []
+    out = np.zeros(arr.shape[:2] + (n_m,), dtype=np.int64)
+    keep = min(n_m, arr.shape[2])
+    out[:, :, :keep] = arr[:, :, :keep]
+    return out, [str(m) for m in np.arange(first, last + 1)]
+
+
+def _trailing_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """x[..., t] 직전 window개월 평균 (t 자신 제외). 이력이 부족한 구간은 있는 만큼 평균"""
+    csum  = np.concatenate([np.zeros(x.shape[:-1] + (1,)), np.cumsum(x, axis=-1)], axis=-1)
+    t     = np.arange(x.shape[-1])
+    start = np.maximum(t - window, 0)
+    n     = np.maximum(t - start, 1)
+    return (csum[..., t] - csum[..., start]) / n
+
+
+# ─────────────────────────────────────────────
+# 탐지기 (모두 (..., 월) 배열 → 같은 모양의 점수 배열)
+# ─────────────────────────────────────────────
+def score_calendar(x: np.ndarray, window: int) -> np.ndarray:
+    """당월 건수 / 직전 window개월 월평균 × 100 (%)"""
+    base = _trailing_mean(x, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(base > 0, x / base * 100.0, 0.0)
+
+
+def score_poisson(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Poisson z-점수: (당월 - λ) / √λ.
+    λ 는 직전 window개월 평균에 약한 사전값(1건/1개월)을 섞어 소표본 분산 0을 방지.
+    """
+    base = _trailing_mean(x, window)
+    n    = np.minimum(np.arange(x.shape[-1]), window)
+    lam  = (base * n + 1.0) / (n + 1.0)
+    return (x - lam) / np.sqrt(lam)
+
+
+def score_ewma(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    EWMA 관리도: (당월 - 전월까지의 EWMA 평균) / EWMA 표준편차 (하한 1건).
+    α = 2 / (window + 1). 월 축만 순차 계산하고 시계열 축은 벡터 연산.
+    """
+    alpha = 2.0 / (window + 1.0)
+    x     = x.astype(float)
+    score = np.zeros_like(x)
+    mean  = x[..., 0].copy()
+    var   = np.zeros_like(mean)
+    for t in range(1, x.shape[-1]):
+        score[..., t] = (x[..., t] - mean) / np.sqrt(np.maximum(var, 1.0))
+        diff  = x[..., t] - mean
+        mean  = mean + alpha * diff
+        var   = (1.0 - alpha) * (var + alpha * diff * diff)
+    return score
+
+
+def score_cusum(x: np.ndarray, window: int, k: float = 0.5) -> np.ndarray:
+    """
+    단측(상승) CUSUM: S_t = max(0, S_{t-1} + z_t - k).
+    z_t 는 직전 window개월 평균 대비 Poisson 표준화 잔차.
+    기준선이 window개월 채워지기 전(워밍업)에는 누적하지 않아 초반 소표본 경보를 막는다.
+    """
+    base  = _trailing_mean(x, window)
+    z     = (x - base) / np.sqrt(np.maximum(base, 1.0))
+    score = np.zeros(x.shape, dtype=float)
+    s     = np.zeros(x.shape[:-1])
+    for t in range(window, x.shape[-1]):
+        s = np.maximum(0.0, s + z[..., t] - k)
+        score[..., t] = s
+    return score
+
+
+@dataclass(frozen=True)
+class Detector:
+    name: str
+    label: str
+    unit: str                                   # "%" 또는 "σ" / "h"
+    default_threshold: float
+    slider: Tuple[float, float, float]          # (min, max, step)
+    score: Optional[Callable[[np.ndarray, int], np.ndarray]]
+
+    def emerging_threshold(self, threshold: float) -> float:
+        return EMERGING_PCT if self.unit == "%" else threshold * EMERGING_FACTOR
+
+
+DETECTORS: Dict[str, Detector] = {
+    "legacy":   Detector("legacy",   "기존 규칙 (최근 30일 vs 11개월 평균)", "%", 200.0, (100.0, 500.0, 50.0), None),
+    "calendar": Detector("calendar", "달력 월 비율",                       "%", 200.0, (100.0, 500.0, 50.0), score_calendar),
+    "poisson":  Detector("poisson",  "Poisson z-점수",                     "σ", 3.0,   (1.0, 6.0, 0.5),      score_poisson),
+    "ewma":     Detector("ewma",     "EWMA 관리도",                        "σ", 3.0,   (1.0, 6.0, 0.5),      score_ewma),
+    "cusum":    Detector("cusum",    "CUSUM 누적합",                       "h", 4.0,   (1.0, 10.0, 0.5),     score_cusum),
+}
+
+
+# ─────────────────────────────────────────────
+# 현재 시점 Spike 매트릭스
+# ─────────────────────────────────────────────
+def detect_matrix(
+    cube: CountCube,
+    detector: str = "legacy",
+    threshold: Optional[float] = None,
+    window: int = 11,
+    min_count: int = ALARM_MIN_COUNT,
+) -> SpikeMatrix:
+    """
+    선택한 탐지기로 전 기업 × 전 기술 SpikeMatrix 를 계산.
+    legacy 는 기존 compute_spike_matrix, 나머지는 마지막 완결 월 기준 점수로 신호 판정.
+    """
+    det       = DETECTORS[detector]
+    threshold = det.default_threshold if threshold is None else float(threshold)
+    emerging  = det.emerging_threshold(threshold)
+    if det.score is None:
+        return compute_spike_matrix(cube, threshold_pct=threshold, emerging_pct=emerging)
+
+    techs  = [t for t in cube.labels["tech"] if t != OTHER_LABEL]
+    keep   = [cube.labels["tech"].index(t) for t in techs]
+    series, _ = monthly_series(cube)
+    series = series[:, keep, :]
+    n_c    = series.shape[0]
+    if series.shape[-1] == 0:
+        zeros = np.zeros((n_c, len(techs)))
+        return SpikeMatrix(list(cube.labels["company"]), techs, zeros.astype(int), zeros, zeros,
+                           threshold, emerging)
+
+    score   = det.score(series, window)[..., -1]
+    current = series[..., -1]
+    base    = _trailing_mean(series, window)[..., -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(base > 0, current / base * 100.0, 0.0)
+
+    level = np.full(score.shape, LEVEL_NORMAL, dtype=np.int8)
+    ok    = current >= min_count
+    level[ok & (score >= emerging)]                    = LEVEL_EMERGING
+    level[ok & (score >= threshold)]                   = LEVEL_SPIKE
+
+    return SpikeMatrix(
+        list(cube.labels["company"]), techs, current, base, ratio,
+        threshold, emerging,
+        score=score, level=level,
+    )
+
+
+# ─────────────────────────────────────────────
+# 백테스트
+# ─────────────────────────────────────────────
+def surge_events(
+    x: np.ndarray,
+    window: int = 11,
+    horizon: int = 3,
+    lift: float = 1.5,
+    min_count: int = 3,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    정답 라벨: t 이후 horizon개월 평균이 t 이전 window개월 평균의 lift배 이상이고
+    horizon 기간 합계가 min_count 이상이면 '실제 급증'.
+    반환: event (..., 월) bool, lead (..., 월) — 급증이 처음 월 건수로 드러나는 개월 수 (없으면 0).
+    마지막 horizon개월은 미래가 없으므로 항상 False.
+    """
+    x    = x.astype(float)
+    m    = x.shape[-1]
+    base = _trailing_mean(x, window)
+    fut  = np.zeros_like(x)
+    lead = np.zeros(x.shape, dtype=np.int64)
+    seen = np.zeros(x.shape, dtype=bool)
+    bar  = np.maximum(lift * base, 1.0)
+    for k in range(1, horizon + 1):
+        shifted = np.zeros_like(x)
+        shifted[..., : m - k] = x[..., k:]
+        fut += shifted
+        first = ~seen & (shifted >= bar)
+        lead[first] = k
+        seen |= first
+    event = (fut / horizon >= lift * base) & (fut >= min_count)
+    event[..., max(m - horizon, 0):] = False
+    return event, np.where(event, lead, 0)
+
+
+def backtest(
+    cube: CountCube,
+    detectors: Optional[Sequence[str]] = None,
+    thresholds: Optional[Dict[str, float]] = None,
+    window: int = 11,
+    horizon: int = 3,
+    lift: float = 1.5,
+    min_count: int = ALARM_MIN_COUNT,
+) -> pd.DataFrame:
+    """
+    과거 모든 월 시점에서 각 탐지기를 재현(replay)해 정밀도와 리드타임을 보고.
+    탐지기 점수는 t 시점까지의 데이터만 사용하므로 각 월의 판정은 당시 시점과 동일하다.
+    legacy 는 월 격자에서 calendar(window=11) 와 같은 규칙으로 평가한다.
+    """
+    detectors  = list(detectors or DETECTORS)
+    thresholds = thresholds or {}
+    series, _  = monthly_series(cube)
+    techs      = [i for i, t in enumerate(cube.labels["tech"]) if t != OTHER_LABEL]
+    x          = series[:, techs, :].reshape(-1, series.shape[-1])
+
+    event, lead = surge_events(x, window, horizon, lift, min_count)
+    evaluable   = np.zeros(x.shape, dtype=bool)
+    evaluable[:, window: max(x.shape[-1] - horizon, window)] = True
+    n_events    = int((event & evaluable).sum())
+
+    rows = []
+    for name in detectors:
+        det   = DETECTORS[name]
+        thr   = thresholds.get(name, det.default_threshold)
+        fn    = det.score or score_calendar
+        alarm = (fn(x, window) >= thr) & (x >= min_count) & evaluable
+        hits  = alarm & event
+        n_alarm, n_hit = int(alarm.sum()), int(hits.sum())
+        rows.append({
+            "detector":       name,
+            "threshold":      thr,
+            "alerts":         n_alarm,
+            "hits":           n_hit,
+            "precision":      round(n_hit / n_alarm, 3) if n_alarm else 0.0,
+            "recall":         round(n_hit / n_events, 3) if n_events else 0.0,
+            "lead_time_mean": round(float(lead[hits].mean()), 2) if n_hit else 0.0,
+        })
+    return pd.DataFrame(rows).sort_values(["precision", "recall"], ascending=False, ignore_index=True)
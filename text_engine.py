@@ -0,0 +1,233 @@
+"""
+특허 텍스트 엔진 (streamlit 비의존)
+- 제목 + 요약을 한 번만 토큰화해 희소 문서-단어 행렬(CSR)로 — 연도별 키워드 · 추세 · 키워드 필터가 모두
+  이 행렬 위의 희소 행렬 축약(그룹 지시행렬 곱 · 열 합)이 된다
+- 한국어 처리: 기존 불용어 + 어절 끝 조사 제거('전극을' → '전극'). 명사 끝 글자와 겹치는 조사
+  ('의' · '로' · '과' …)는 같은 코퍼스에 남는 부분이 단어로 있을 때만 합침('반도체의' → '반도체', '집적회로' 유지)
+- 어휘(단어 → 열 번호)는 행렬마다 따로 — 열은 그 문서들에 실제 나온 단어뿐
+"""
+
+import re
+import threading
+from functools import lru_cache
+from typing import Callable, Container, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# new_app.analyze_yearly_keywords 의 불용어 그대로
+STOPWORDS = frozenset([
+    '및', '이를', '있는', '위한', '하는', '또는', '되는', '통한', '있다', '한다',
+    '본', '발명', '기술', '장치', '있을', '수행', '형성', '구성',
+])
+
+# 어절 끝 조사 — 긴 것부터. 여러 글자 조사와 을/를/은/는 만 무조건 제거
+# ('이' · '가' 는 명사 끝 글자('디스플레이')와 겹쳐 제외)
+JOSA_SUFFIXES = (
+    "으로써", "으로서", "에서의", "에서는", "으로는",
+    "으로", "에서", "에게", "까지", "부터", "로써", "로서", "에는",
+    "은", "는", "을", "를",
+)
+# 명사 끝 글자와 겹치는 조사('집적회로' · '처리결과' · '효과') — 남는 부분이 알려진 단어일 때만 제거
+WEAK_JOSA_SUFFIXES = ("과의", "와의", "에의", "의", "에", "와", "과", "로")
+_WORD_RE = re.compile(r"\w+")
+_JOSA_RE = re.compile(r"(?<=[가-힣])(?:" + "|".join(JOSA_SUFFIXES) + r")$")
+_WEAK_RE = re.compile(r"(?<=[가-힣])(?:" + "|".join(WEAK_JOSA_SUFFIXES) + r")$")
+_HANGUL  = re.compile(r"[가-힣]")
+VERB_STEM_ENDS = ("하", "되", "있", "없")   # '형성하는' 의 '는' 은 조사가 아닌 어미
+
+MIN_TOKEN_LEN = 2
+
+
+def strip_josa(word: str, known: Optional[Container[str]] = None) -> str:
+    """
+    한글 어절 끝 조사 제거 — 남는 부분이 MIN_TOKEN_LEN 보다 짧거나 용언 어간이면 원형 유지.
+    WEAK_JOSA_SUFFIXES 는 남는 부분이 known(같은 코퍼스의 단어 등)에 있을 때만 제거한다.
+
+    >>> [strip_josa(w) for w in ("집적회로", "처리결과", "방열효과", "반도체를", "기판으로")]
+    ['집적회로', '처리결과', '방열효과', '반도체', '기판']
+    >>> strip_josa("반도체의"), strip_josa("반도체의", {"반도체"}), strip_josa("집적회로", {"반도체"})
+    ('반도체의', '반도체', '집적회로')
+    """
+    if not _HANGUL.search(word[-1:]):
+        return word
+    stem = _JOSA_RE.sub("", word)
+    if stem == word and known is not None:
+        weak = _WEAK_RE.sub("", word)
+        stem = weak if weak in known else word
+    if len(stem) < MIN_TOKEN_LEN or (stem != word and stem.endswith(VERB_STEM_ENDS)):
+        return word
+    return stem
+
+
+@lru_cache(maxsize=1 << 18)
+def _normalize(word: str) -> str:
+    """어절 → 토큰 ('' 이면 버림). 특허 문서는 어휘가 좁아 어절 단위 캐시 적중률이 높다"""
+    word = strip_josa(word)
+    return word if len(word) >= MIN_TOKEN_LEN and word not in STOPWORDS else ""
+
+
+def tokenize(text: str, stopwords: Iterable[str] = STOPWORDS) -> List[str]:
+    """\\w+ 단어 → 조사 제거 → 2글자 이상 · 불용어 제외"""
+    words = _WORD_RE.findall(text or "")
+    if stopwords is STOPWORDS:
+        return [t for t in map(_normalize, words) if t]
+    out = []
+    for word in words:
+        word = strip_josa(word)
+        if len(word) >= MIN_TOKEN_LEN and word not in stopwords:
+            out.append(word)
+    return out
+
+
+class Vocabulary:
+    """단어 → 열 번호 (추가만 되는 사전, 스레드 안전). index 에는 같은 열을 가리키는 별칭(조사 붙은 형태)도 들어간다"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.terms: List[str]      = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def ids(self, tokens: Sequence[str]) -> List[int]:
+        index = self.index
+        out   = [index.get(t, -1) for t in tokens]
+        if -1 in out:
+            with self._lock:
+                for i, t in enumerate(tokens):
+                    if out[i] < 0:
+                        j = index.get(t)
+                        if j is None:
+                            j = index[t] = len(self.terms)
+                            self.terms.append(t)
+                        out[i] = j
+        return out
+
+    def lookup(self, terms: Iterable[str]) -> List[int]:
+        """이미 있는 단어의 열 번호만 (없는 단어는 건너뜀)"""
+        return [self.index[t] for t in terms if t in self.index]
+
+
+class DocumentTermMatrix:
+    """
+    문서 × 단어 빈도 CSR 행렬. 열 번호는 vocab 기준 — from_texts 는 실제 나온 단어만 열로 남긴다.
+    """
+
+    def __init__(self, X: sparse.csr_matrix, vocab: Vocabulary):
+        self.X     = X
+        self.vocab = vocab
+
+    def __len__(self) -> int:
+        return self.X.shape[0]
+
+    @property
+    def terms(self) -> List[str]:
+        return self.vocab.terms[: self.X.shape[1]]
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: Iterable[str],
+        vocab: Optional[Vocabulary] = None,
+        tokenizer: Callable[[str], List[str]] = tokenize,
+    ) -> "DocumentTermMatrix":
+        """
+        텍스트 목록을 한 번씩만 토큰화해 CSR 로 (같은 문서 안 중복 단어는 빈도로 합산).
+        vocab 을 넘기지 않으면 이 행렬 전용 어휘를 쓴다. 만든 뒤 compact 로 나온 단어만 · 조사 형태 합침.
+        """
+        vocab   = vocab if vocab is not None else Vocabulary()
+        indptr  = [0]
+        indices: List[int] = []
+        for text in texts:
+            indices.extend(vocab.ids(tokenizer(text)))
+            indptr.append(len(indices))
+        X = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+            shape=(len(indptr) - 1, len(vocab)),
+        )
+        return cls(X, vocab).compact()
+
+    def compact(self) -> "DocumentTermMatrix":
+        """
+        실제 나온 단어만 열로 남기고, 조사가 붙은 형태('반도체의')는 같은 행렬에 원형('반도체')이 있으면
+        그 열로 합친 새 행렬 (새 어휘 — 합쳐진 형태는 index 별칭으로 남아 조회 가능).
+        """
+        old     = self.vocab.terms
+        present = np.flatnonzero(self.X.getnnz(axis=0))
+        known   = {old[j] for j in present}
+        stems   = {t: strip_josa(t, known) for t in known}
+        vocab   = Vocabulary()
+        remap   = np.full(self.X.shape[1], -1, dtype=np.int64)
+        for j in present:
+            term = stem = old[j]
+            while stems[stem] != stem:              # '회로의' → '회로' 처럼 원형도 합쳐지는 경우를 끝까지 따라감
+                stem = stems[stem]
+            remap[j] = vocab.ids([stem])[0]
+            vocab.index[term] = int(remap[j])
+        X = sparse.csr_matrix(
+            (self.X.data, remap[self.X.indices], self.X.indptr),
+            shape=(self.X.shape[0], len(vocab)),
+        )
+        X.sum_duplicates()
+        return DocumentTermMatrix(X, vocab)
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        columns: Sequence[str] = ("inventionTitle", "astrtCont"),
+        vocab: Optional[Vocabulary] = None,
+    ) -> "DocumentTermMatrix":
+        """여러 텍스트 컬럼을 공백으로 이어 한 문서로 (없는 컬럼은 무시)"""
+        cols = [c for c in columns if c in df.columns]
+        text = df[cols[0]].fillna("").astype(str) if cols else pd.Series([""] * len(df))
+        for c in cols[1:]:
+            text = text + " " + df[c].fillna("").astype(str)
+        return cls.from_texts(text.tolist(), vocab)
+
+    # ── 축약 ─────────────────────────────────
+    def term_counts(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """단어별 총 빈도 (mask: 문서 불리언 — 해당 문서만)"""
+        X = self.X if mask is None else self.X[np.asarray(mask, dtype=bool)]
+        return np.asarray(X.sum(axis=0)).ravel()
+
+    def group_counts(self, codes: np.ndarray, n_groups: Optional[int] = None) -> sparse.csr_matrix:
+        """
+        문서 그룹(연도 · 기업 등 정수 코드, 음수는 제외)별 단어 빈도 (그룹 수 × 단어 수, 희소 CSR).
+        그룹 지시행렬 G(그룹 × 문서) 와의 희소 곱 한 번 — 필요한 열만 .toarray() 할 것.
+        """
+        codes = np.asarray(codes)
+        n     = int(n_groups if n_groups is not None else (codes.max() + 1 if len(codes) else 0))
+        keep  = codes >= 0
+        G = sparse.csr_matrix(
+            (np.ones(int(keep.sum()), dtype=self.X.dtype), (codes[keep], np.flatnonzero(keep))),
+            shape=(n, len(codes)),
+        )
+        return (G @ self.X).tocsr()
+
+    def top_terms(self, counts, k: int = 10) -> List[tuple]:
+        """빈도 벡터(밀집 또는 희소 1행) → 상위 k (단어, 빈도), 빈도 내림차순 · 동률은 먼저 등장한 단어 우선"""
+        if sparse.issparse(counts):
+            row  = sparse.csr_matrix(counts)
+            row.eliminate_zeros()
+            nz, vals = row.indices, row.data
+        else:
+            counts = np.asarray(counts)
+            nz     = np.flatnonzero(counts)
+            vals   = counts[nz]
+        if not len(nz):
+            return []
+        order = np.lexsort((nz, -vals))[:k]
+        terms = self.vocab.terms
+        return [(terms[nz[i]], int(vals[i])) for i in order]
+
+    def contains_any(self, terms: Iterable[str]) -> np.ndarray:
+        """terms 중 하나라도 포함한 문서 마스크 (검색어도 같은 규칙으로 토큰화해 넘길 것)"""
+        index = self.vocab.index
+        ids   = [i for i in self.vocab.lookup(strip_josa(t, index) for t in terms) if i < self.X.shape[1]]
+        if not ids:
+            return np.zeros(len(self), dtype=bool)
+        return np.asarray(self.X[:, ids].sum(axis=1)).ravel() > 0
@@ -0,0 +1,378 @@
+"""
+신규 기술 토픽 탐색 (streamlit 비의존 — 작업 풀 프로세스에서 실행)
+- 제목 + 요약 → text_engine 문서-단어 행렬 → TF-IDF → 미니배치 NMF (곱셈 갱신, CPU · numpy/scipy 만)
+- 문서를 공개월 순으로 배치 처리하며 토픽 행렬 H 를 이어받아 갱신 (월 → 월 웜스타트)
+- 분해 결과는 공유 아티팩트 캐시에: 같은 데이터면 그대로 재사용, 새 데이터(다음 달)는 직전 분해에서 출발
+- 기업 × 토픽 × 월 가중치로 최근 구간 대비 직전 구간 성장률 리포트
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from patent_engine import pack_npz, unpack_npz
+from text_engine import DocumentTermMatrix, Vocabulary
+
+N_TOPICS      = 12
+MAX_FEATURES  = 5000        # TF-IDF 어휘 상한 (문서 빈도 상위)
+MIN_DF        = 3           # 이보다 적은 문서에만 나온 단어는 제외
+MAX_DF        = 0.5         # 이 비율보다 많은 문서에 나온 단어는 제외 (상투어)
+BATCH_SIZE    = 4096        # 미니배치 문서 수 (한 달이 더 크면 나눠서)
+W_ITERATIONS  = 10          # 배치마다 문서-토픽 가중치 W 갱신 횟수
+H_ITERATIONS  = 3           # 배치마다 토픽-단어 행렬 H 갱신 횟수
+COLD_EPOCHS   = 3           # 처음 분해할 때 전체 패스 수
+WARM_EPOCHS   = 1           # 직전 분해에서 출발할 때 전체 패스 수
+FORGET        = 0.7         # 배치 누적 통계 감쇠 — 최근 월 문서 비중을 높임
+RESEED_SIMILARITY = 0.5     # 두 토픽의 문서 가중치 상관이 이 이상이면(한 군집을 나눠 가짐) 하나를 새 군집 후보로 교체
+RESEED_DOCS   = 0.005       # 교체 토픽의 중심을 잡을 '가장 설명 안 되는 문서' 비율
+POLISH_PASSES = 3           # 월 순 스트리밍 뒤 전체 데이터 통계(감쇠 없음)로 H 를 다듬는 패스 수
+GROWTH_MONTHS = 3           # 성장률: 최근 n개월 vs 그 직전 n개월
+TOP_TERMS     = 8
+EPS           = 1e-10
+
+
+# ─────────────────────────────────────────────
+# TF-IDF
+# ─────────────────────────────────────────────
+def tfidf(
+    dtm: DocumentTermMatrix,
+    max_features: int = MAX_FEATURES,
+    min_df: int = MIN_DF,
+    max_df: float = MAX_DF,
+) -> Tuple[sparse.csr_matrix, List[str]]:
+    """
+    빈도 행렬 → (로그 tf × 평활 idf, 행 L2 정규화) float32 CSR + 선택된 단어 목록.
+    어휘는 문서 빈도 상위 max_features 개로 자른다.
+    """
+    X  = dtm.X
+    n  = X.shape[0]
+    df = np.bincount(X.indices, minlength=X.shape[1])
+    ok = np.flatnonzero((df >= min_df) & (df <= max(max_df * n, min_df)))
+    if len(ok) > max_features:
+        ok = ok[np.argsort(-df[ok], kind="stable")[:max_features]]
+        ok.sort()
+    X = X[:, ok].astype(np.float32)
+    X.data = 1.0 + np.log(X.data)
+    X = X @ sparse.diags((np.log((1.0 + n) / (1.0 + df[ok])) + 1.0).astype(np.float32))
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    X = sparse.diags((1.0 / np.maximum(norms, EPS)).astype(np.float32)) @ X
+    terms = dtm.terms
+    return X.tocsr(), [terms[i] for i in ok]
+
+
+# ─────────────────────────────────────────────
+# 미니배치 NMF (곱셈 갱신)
+# ─────────────────────────────────────────────
+def _solve_w(Xb: sparse.csr_matrix, H: np.ndarray, HHt: np.ndarray, iterations: int = W_ITERATIONS) -> np.ndarray:
+    """H 고정 · 배치 문서의 W (Frobenius 손실 곱셈 갱신)"""
+    XHt = np.asarray(Xb @ H.T)
+    W   = XHt / (HHt.sum(axis=0) + EPS)
+    for _ in range(iterations):
+        W *= XHt / (W @ HHt + EPS)
+    return W
+
+
+def _batches(order: np.ndarray, months: np.ndarray, batch_size: int):
+    """공개월 순 문서 번호를 월 경계 · batch_size 로 자른 배치들"""
+    m = months[order]
+    cuts = np.flatnonzero(np.diff(m)) + 1
+    for chunk in np.split(order, cuts):
+        for i in range(0, len(chunk), batch_size):
+            yield chunk[i:i + batch_size]
+
+
+def _residuals(X: sparse.csr_matrix, H: np.ndarray, batch_size: int = BATCH_SIZE) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """문서별 재구성 오차 ‖x − wH‖² + 토픽별 사용량 ΣW + 토픽 간 문서 가중치 상관 행렬"""
+    k     = H.shape[0]
+    HHt   = H @ H.T
+    res   = np.empty(X.shape[0], dtype=np.float32)
+    usage = np.zeros(k)
+    gram  = np.zeros((k, k))
+    for i in range(0, X.shape[0], batch_size):
+        Xb  = X[i:i + batch_size]
+        XHt = np.asarray(Xb @ H.T)
+        W   = _solve_w(Xb, H, HHt)
+        sq  = np.asarray(Xb.multiply(Xb).sum(axis=1)).ravel()
+        res[i:i + batch_size] = sq - 2.0 * (W * XHt).sum(axis=1) + ((W @ HHt) * W).sum(axis=1)
+        usage += W.sum(axis=0)
+        gram  += W.T @ W
+    mean = usage / max(X.shape[0], 1)
+    cov  = gram / max(X.shape[0], 1) - np.outer(mean, mean)
+    std  = np.sqrt(np.maximum(np.diag(cov), EPS))
+    return res, usage, cov / np.outer(std, std)
+
+
+def reseed_topic(X: sparse.csr_matrix, H: np.ndarray) -> Optional[int]:
+    """
+    같은 문서들에 함께 걸리는 토픽 쌍(가중치 상관 ≥ RESEED_SIMILARITY) 중 덜 쓰이는 쪽을,
+    현재 토픽들로 가장 설명이 안 되는 문서들의 중심으로 교체 (제자리 갱신, 교체한 토픽 번호 반환).
+    곱셈 갱신은 큰 군집을 쪼개는 국소해에 머무르기 쉬워, 작게 새로 생긴 군집(신규 토픽)을 놓치지 않도록.
+    """
+    if H.shape[0] < 2 or X.shape[0] == 0:
+        return None
+    res, usage, corr = _residuals(X, H)
+    np.fill_diagonal(corr, -1.0)
+    i, j = np.unravel_index(np.argmax(corr), corr.shape)
+    if corr[i, j] < RESEED_SIMILARITY:
+        return None
+    n_docs = max(int(len(res) * RESEED_DOCS), min(len(res), 20))
+    worst  = np.argpartition(-res, n_docs - 1)[:n_docs]
+    target = i if usage[i] < usage[j] else j
+    center = np.asarray(X[worst].mean(axis=0)).ravel()
+    H[target] = center / max(np.linalg.norm(center), EPS) * np.linalg.norm(H[target]) + EPS
+    return int(target)
+
+
+def fit_nmf(
+    X: sparse.csr_matrix,
+    n_topics: int = N_TOPICS,
+    months: Optional[np.ndarray] = None,
+    init: Optional[np.ndarray] = None,
+    epochs: Optional[int] = None,
+    batch_size: int = BATCH_SIZE,
+    seed: int = 42,
+) -> np.ndarray:
+    """
+    X ≈ W H 의 H (토픽 × 단어). 문서를 months(정수, 오름차순 처리) 순 미니배치로 흘려 보내며
+    누적 통계 A = ΣWᵀW, B = ΣWᵀX (FORGET 감쇠) 로 H 를 갱신 — 메모리는 배치 크기에 비례.
+    init 이 있으면 그 H 에서 출발 (웜스타트, 기본 WARM_EPOCHS 패스).
+    스트리밍 뒤에는 reseed_topic 으로 신규 군집 자리를 만들고, 전체 문서 통계(감쇠 없음)로 POLISH_PASSES 번 다듬는다
+    — 감쇠 통계만으로는 초기 월에 없던 토픽이 다음 패스의 앞쪽 월 문서에 밀려 사라진다.
+    """
+    n, v = X.shape
+    if init is not None:
+        H = np.maximum(np.asarray(init, dtype=np.float32), EPS)
+    else:
+        rng = np.random.default_rng(seed)
+        H   = (rng.random((n_topics, v)) * np.sqrt(X.mean() / n_topics)).astype(np.float32) + EPS
+    if epochs is None:
+        epochs = WARM_EPOCHS if init is not None else COLD_EPOCHS
+    months = np.zeros(n, dtype=np.int64) if months is None else np.asarray(months)
+    order  = np.argsort(months, kind="stable")
+
+    k = H.shape[0]
+    for _ in range(epochs):
+        A = np.zeros((k, k), dtype=np.float32)
+        B = np.zeros((k, v), dtype=np.float32)
+        for rows in _batches(order, months, batch_size):
+            Xb  = X[rows]
+            W   = _solve_w(Xb, H, H @ H.T)
+            A   = FORGET * A + W.T @ W
+            B   = FORGET * B + np.asarray((Xb.T @ W).T)
+            for _ in range(H_ITERATIONS):
+                H *= B / (A @ H + EPS)
+
+    for p in range(POLISH_PASSES):
+        if p == 0:
+            reseed_topic(X, H)
+        HHt = H @ H.T
+        A   = np.zeros((k, k), dtype=np.float32)
+        B   = np.zeros((k, v), dtype=np.float32)
+        for i in range(0, n, batch_size):
+            Xb = X[i:i + batch_size]
+            W  = _solve_w(Xb, H, HHt)
+            A += W.T @ W
+            B += np.asarray((Xb.T @ W).T)
+        for _ in range(H_ITERATIONS):
+            H *= B / (A @ H + EPS)
+    return H
+
+
+def transform(X: sparse.csr_matrix, H: np.ndarray, batch_size: int = BATCH_SIZE) -> np.ndarray:
+    """전체 문서의 W (배치 단위)"""
+    HHt = H @ H.T
+    W   = np.empty((X.shape[0], H.shape[0]), dtype=np.float32)
+    for i in range(0, X.shape[0], batch_size):
+        W[i:i + batch_size] = _solve_w(X[i:i + batch_size], H, HHt)
+    return W
+
+
+def align_topics(prev_H: np.ndarray, prev_terms: Sequence[str], terms: Sequence[str]) -> np.ndarray:
+    """직전 분해의 H 를 새 어휘 순서로 옮김 — 새 단어는 해당 토픽의 평균 가중치로 채움"""
+    pos   = {t: i for i, t in enumerate(prev_terms)}
+    cols  = np.array([pos.get(t, -1) for t in terms])
+    H     = np.repeat(prev_H.mean(axis=1, keepdims=True), len(terms), axis=1)
+    found = cols >= 0
+    H[:, found] = prev_H[:, cols[found]]
+    return H
+
+
+# ─────────────────────────────────────────────
+# 토픽 모델 (캐시 단위)
+# ─────────────────────────────────────────────
+class TopicModel:
+    """
+    H (토픽 × 단어, 행 L2 정규화) + 단어 목록. W 는 이 분해를 만든 데이터의 문서-토픽 가중치(선택).
+    to_bytes/from_bytes 는 npz + JSON 메타 (pickle 미사용).
+    """
+
+    def __init__(self, H: np.ndarray, terms: List[str], W: Optional[np.ndarray] = None, meta: Optional[Dict] = None):
+        self.H     = H
+        self.terms = terms
+        self.W     = W
+        self.meta  = meta or {}
+
+    @property
+    def n_topics(self) -> int:
+        return self.H.shape[0]
+
+    def top_terms(self, n: int = TOP_TERMS) -> List[List[str]]:
+        order = np.argsort(-self.H, axis=1)[:, :n]
+        return [[self.terms[j] for j in row] for row in order]
+
+    def labels(self, n: int = 3) -> List[str]:
+        return [f"T{i + 1} " + "·".join(words) for i, words in enumerate(self.top_terms(n))]
+
+    def to_bytes(self, with_w: bool = True) -> bytes:
+        arrays = {"H": self.H.astype(np.float32)}
+        if with_w and self.W is not None:
+            arrays["W"] = self.W.astype(np.float32)
+        return pack_npz({"terms": self.terms, **self.meta}, **arrays)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TopicModel":
+        meta, z = unpack_npz(data)
+        terms   = meta.pop("terms")
+        return cls(z["H"], terms, z.get("W"), meta)
+
+    @classmethod
+    def fit(
+        cls,
+        texts: Sequence[str],
+        months: np.ndarray,
+        n_topics: int = N_TOPICS,
+        previous: Optional["TopicModel"] = None,
+    ) -> "TopicModel":
+        """토큰화 → TF-IDF → NMF → 전체 문서 W. previous 가 같은 토픽 수면 웜스타트"""
+        t0    = time.time()
+        dtm   = DocumentTermMatrix.from_texts(texts, Vocabulary())
+        X, terms = tfidf(dtm)
+        if not terms:
+            raise ValueError(
+                f"토픽을 찾을 텍스트가 부족합니다: 문서 {X.shape[0]:,}건에서 "
+                f"{MIN_DF}건 이상 · 전체의 {MAX_DF:.0%} 이하 문서에 나오는 단어가 없습니다."
+            )
+        warm  = previous is not None and previous.n_topics == n_topics and len(terms) > 0
+        init  = align_topics(previous.H, previous.terms, terms) if warm else None
+        H     = fit_nmf(X, n_topics, months, init)
+        H    /= np.maximum(np.linalg.norm(H, axis=1, keepdims=True), EPS)
+        W     = transform(X, H)
+        meta  = {"n_docs": int(X.shape[0]), "n_terms": len(terms), "warm": bool(warm),
+                 "fit_seconds": round(time.time() - t0, 2)}
+        return cls(H.astype(np.float32), terms, W, meta)
+
+
+def _month_codes(open_day: np.ndarray) -> Tuple[np.ndarray, pd.DatetimeIndex]:
+    """datetime64[D] → 월 정수 코드(NaT 는 -1) + 월 목록"""
+    codes, months = pd.factorize(pd.DatetimeIndex(open_day).to_period("M"), sort=True)
+    return codes, months
+
+
+def fitted_model(
+    texts: Sequence[str],
+    open_day: np.ndarray,
+    n_topics: int = N_TOPICS,
+    cache_path: Optional[str] = None,
+    fingerprint: Optional[str] = None,
+) -> Tuple[TopicModel, bool]:
+    """
+    (모델, 캐시 적중 여부). cache_path(공유 아티팩트 SQLite)가 있으면
+    topics:{지문}:{k} 를 그대로 쓰고, 없으면 topics:latest:{k} 에서 웜스타트해 만든 뒤 둘 다 저장.
+    """
+    codes, _ = _month_codes(open_day)
+    if not cache_path or not fingerprint:
+        return TopicModel.fit(texts, codes, n_topics), False
+
+    from patent_store import SharedArtifactCache
+
+    cache  = SharedArtifactCache(cache_path)
+    key    = f"topics:{fingerprint}:{n_topics}"
+    latest = f"topics:latest:{n_topics}"
+    built  = []
+
+    def _build() -> bytes:
+        data     = cache.get(latest)
+        previous = TopicModel.from_bytes(data) if data is not None else None
+        model    = TopicModel.fit(texts, codes, n_topics, previous)
+        cache.put(latest, model.to_bytes(with_w=False))
+        built.append(model)
+        return model.to_bytes()
+
+    data = cache.get_or_build(key, _build)
+    return (built[0], False) if built else (TopicModel.from_bytes(data), True)
+
+
+# ─────────────────────────────────────────────
+# 기업별 토픽 성장 리포트
+# ─────────────────────────────────────────────
+def topic_report(
+    texts: Sequence[str],
+    company_idx: np.ndarray,
+    open_day: np.ndarray,
+    companies: List[str],
+    n_topics: int = N_TOPICS,
+    cache_path: Optional[str] = None,
+    fingerprint: Optional[str] = None,
+    growth_months: int = GROWTH_MONTHS,
+    now: Optional[datetime] = None,
+) -> Dict:
+    """
+    texts[i] 는 company_idx[i] · open_day[i] 특허의 제목 + 요약.
+    반환: topics(토픽 · 상위 단어), monthly(기업 × 월 × 토픽 가중치, 긴 형식),
+          growth(기업 × 토픽 최근/직전 구간 가중치 · 성장률), meta
+    문서 가중치는 W 행 합 1 로 정규화 — 특허 한 건이 토픽들에 나눠 기여 (건수 단위).
+    성장률 구간은 마지막 완결 월(now 의 전월, 데이터가 그 전에 끝나면 데이터 마지막 월)에서 끝난다.
+    텍스트가 부족해 어휘가 비면 ValueError.
+    """
+    t0 = time.time()
+    model, cached = fitted_model(texts, open_day, n_topics, cache_path, fingerprint)
+    labels = model.labels()
+    topics = pd.DataFrame({
+        "topic": labels,
+        "terms": [", ".join(words) for words in model.top_terms()],
+    })
+
+    W = model.W / np.maximum(model.W.sum(axis=1, keepdims=True), EPS)
+    codes, months = _month_codes(open_day)
+    n_comp, n_month = len(companies), len(months)
+    keep  = codes >= 0
+    group = np.asarray(company_idx)[keep] * n_month + codes[keep]
+    G     = sparse.csr_matrix(
+        (np.ones(len(group), dtype=np.float32), (group, np.flatnonzero(keep))),
+        shape=(n_comp * n_month, len(W)),
+    )
+    cube = np.asarray(G @ W).reshape(n_comp, n_month, model.n_topics)       # 기업 × 월 × 토픽
+
+    c, m, t = np.nonzero(cube)
+    monthly = pd.DataFrame({
+        "company": np.asarray(companies, dtype=object)[c],
+        "month":   months[m].to_timestamp() if n_month else [],
+        "topic":   np.asarray(labels, dtype=object)[t],
+        "weight":  cube[c, m, t].round(3),
+    })
+
+    # 마지막 완결 월 기준 달력 구간 (빈 달 포함) — 진행 중인 달은 덜 찬 건수라 비교에서 제외
+    if n_month:
+        last     = min(months[-1], pd.Period(now or datetime.now(), "M") - 1)
+        age      = last.ordinal - months.asi8
+        recent   = cube[:, (age >= 0) & (age < growth_months)].sum(axis=1)
+        previous = cube[:, (age >= growth_months) & (age < 2 * growth_months)].sum(axis=1)
+    else:
+        recent = previous = np.zeros((n_comp, model.n_topics), dtype=np.float32)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct = np.where(previous > 0, (recent - previous) / previous * 100.0, np.nan)
+    growth = pd.DataFrame({
+        "company":    np.repeat(np.asarray(companies, dtype=object), model.n_topics),
+        "topic":      np.tile(np.asarray(labels, dtype=object), n_comp),
+        "recent":     recent.ravel().round(2),
+        "previous":   previous.ravel().round(2),
+        "growth_pct": pct.ravel().round(1),
+        "new":        ((previous <= 0) & (recent > 0)).ravel(),
+    })
+
+    meta = {**model.meta, "cached": cached, "seconds": round(time.time() - t0, 2)}
+    return {"topics": topics, "monthly": monthly, "growth": growth, "meta": meta}